@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import time of the package and of the clients.
+
+Each measurement runs in a fresh interpreter, so module caches of this
+process do not hide the cost. The median over --repeat runs is compared
+with the budgets; the exit code is 1 if a budget is exceeded.
+
+Usage:
+    python scripts/benchmark_import_time.py --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Statement -> budget in seconds (interpreter startup excluded)
+IMPORTS = {
+    # Lazy package import: no grpc, pydantic or models
+    "import simulation_client": 0.1,
+    # Clients together with grpc, protobuf and models
+    "from simulation_client import AsyncUnifiedClient": 2.0,
+}
+
+
+def measure(statement: str) -> float:
+    """Import time of statement in a fresh interpreter, seconds."""
+    code = (
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(json.dumps(time.perf_counter() - start))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(SRC_DIR), "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    exceeded = False
+    for statement, budget in IMPORTS.items():
+        median = statistics.median(measure(statement) for _ in range(args.repeat))
+        status = "ok" if median < budget else "OVER BUDGET"
+        exceeded |= median >= budget
+        print(
+            f"{statement:<52} median={median * 1000:7.1f}ms "
+            f"budget={budget * 1000:.0f}ms {status}"
+        )
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: proto_to_dict / dict_to_proto on large Simulation messages.
+
+Builds a SimulationResponse with many parameter/result steps, suppliers
+and workplaces and compares the compiled converters from
+simulation_client.utils with google.protobuf.json_format.
+
+Usage:
+    python scripts/benchmark_proto_convert.py --steps 200 --iterations 50
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from google.protobuf import json_format  # noqa: E402
+
+from simulation_client.proto import simulator_pb2  # noqa: E402
+from simulation_client.proto_convert import clear_plans  # noqa: E402
+from simulation_client.utils import dict_to_proto, proto_to_dict  # noqa: E402
+
+
+def build_simulation(steps: int) -> simulator_pb2.SimulationResponse:
+    """SimulationResponse with `steps` parameters and results entries."""
+    response = simulator_pb2.SimulationResponse(timestamp="2024-01-01T00:00:00")
+    simulation = response.simulations
+    simulation.simulation_id = "benchmark"
+    simulation.capital = 10_000_000
+
+    for step in range(1, steps + 1):
+        parameters = simulation.parameters.add(step=step)
+        for index in range(10):
+            parameters.suppliers.add(
+                supplier_id=f"supplier-{index}",
+                name=f"Supplier {index}",
+                product_name="steel",
+                material_type="steel",
+                delivery_period=index + 1,
+                cost=100 + index,
+                product_quality=0.9,
+                reliability=0.95,
+            )
+        for index in range(20):
+            workplace = parameters.processes.workplaces.add(
+                workplace_id=f"wp-{index}",
+                workplace_name=f"Workplace {index}",
+                required_speciality="welder",
+                required_qualification=3,
+                is_start_node=index == 0,
+                is_end_node=index == 19,
+                next_workplace_ids=[f"wp-{index + 1}"] if index < 19 else [],
+            )
+            workplace.x = index % 7
+            workplace.y = index // 7
+        parameters.materials_warehouse.materials.update(
+            {f"material-{index}": index * 10 for index in range(10)}
+        )
+
+        simulation.results.add(
+            step=step,
+            profit=step * 1000,
+            cost=step * 500,
+            profitability=0.5,
+            factory_metrics=simulator_pb2.FactoryMetrics(
+                profitability=0.5, oee=0.8, defect_rate=0.01
+            ),
+        )
+    return response
+
+
+def measure(func, iterations: int):
+    """Per-call timings in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    message = build_simulation(args.steps)
+    data = proto_to_dict(message)
+    json_data = json_format.MessageToDict(message, preserving_proto_field_name=True)
+    print(f"message size: {message.ByteSize() / 1024:.0f} KiB, steps: {args.steps}")
+
+    clear_plans()
+    start = time.perf_counter()
+    proto_to_dict(message)
+    dict_to_proto(data, simulator_pb2.SimulationResponse)
+    cold = (time.perf_counter() - start) * 1000
+    print(f"cold call incl. plan compilation: {cold:.1f} ms")
+
+    cases = [
+        ("proto_to_dict", lambda: proto_to_dict(message)),
+        (
+            "json_format.MessageToDict",
+            lambda: json_format.MessageToDict(
+                message, preserving_proto_field_name=True
+            ),
+        ),
+        (
+            "dict_to_proto",
+            lambda: dict_to_proto(data, simulator_pb2.SimulationResponse),
+        ),
+        (
+            "json_format.ParseDict",
+            lambda: json_format.ParseDict(
+                json_data, simulator_pb2.SimulationResponse()
+            ),
+        ),
+    ]
+    for name, func in cases:
+        median, best = measure(func, args.iterations)
+        print(f"{name:<28} median={median:8.2f}ms min={best:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: TCP loopback vs Unix domain socket latency for small RPCs.
+
+Measures ping and set_logist round-trips against the same SimulationService
+exposed both on a TCP port and on a Unix domain socket.
+
+Usage:
+    python scripts/benchmark_transport.py \
+        --tcp localhost:50051 --uds unix:/run/simulator.sock \
+        --logist-id <worker_id> --iterations 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from simulation_client import AsyncDatabaseClient, AsyncSimulationClient  # noqa: E402
+
+
+def parse_target(target: str):
+    """Split "host:port" into (host, port); unix: targets are kept as is."""
+    if target.startswith(("unix:", "unix-abstract:")):
+        return target, 0
+    host, _, port = target.rpartition(":")
+    return host, int(port)
+
+
+def summarize(samples):
+    """Latency summary in microseconds."""
+    ordered = sorted(samples)
+    return {
+        "mean": statistics.fmean(ordered) * 1e6,
+        "p50": ordered[len(ordered) // 2] * 1e6,
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6,
+    }
+
+
+async def measure(call, iterations: int, warmup: int):
+    """Run call() sequentially and collect per-call latency."""
+    for _ in range(warmup):
+        await call()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_target(name: str, target: str, logist_id, iterations: int, warmup: int):
+    """Benchmark ping and set_logist on one transport."""
+    host, port = parse_target(target)
+    results = {}
+
+    async with AsyncSimulationClient(host, port, enable_logging=False) as client:
+        results["ping"] = summarize(await measure(client.ping, iterations, warmup))
+
+        if logist_id:
+            simulation = await client.create_simulation()
+            results["set_logist"] = summarize(
+                await measure(
+                    lambda: client.set_logist(simulation.simulation_id, logist_id),
+                    iterations,
+                    warmup,
+                )
+            )
+
+    for rpc, stats in results.items():
+        print(
+            f"{name:>4} {rpc:<11} mean={stats['mean']:8.1f}us "
+            f"p50={stats['p50']:8.1f}us p99={stats['p99']:8.1f}us"
+        )
+    return results
+
+
+async def resolve_logist_id(db_target: str):
+    """Take the first logist from DatabaseManager for the set_logist benchmark."""
+    host, port = parse_target(db_target)
+    async with AsyncDatabaseClient(host, port, enable_logging=False) as client:
+        response = await client.get_all_logists()
+        return response.logists[0].worker_id if response.logists else None
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tcp", default="localhost:50051", help="TCP target")
+    parser.add_argument("--uds", required=True, help="Unix socket target (unix:/path)")
+    parser.add_argument("--db", default="localhost:50052", help="DatabaseManager target")
+    parser.add_argument("--logist-id", help="Worker id for set_logist")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    args = parser.parse_args()
+
+    logist_id = args.logist_id or await resolve_logist_id(args.db)
+    if not logist_id:
+        print("No logist available, set_logist is skipped")
+
+    tcp = await bench_target("tcp", args.tcp, logist_id, args.iterations, args.warmup)
+    uds = await bench_target("uds", args.uds, logist_id, args.iterations, args.warmup)
+
+    for rpc in tcp:
+        speedup = tcp[rpc]["p50"] / uds[rpc]["p50"]
+        print(f"{rpc}: UDS p50 speedup over TCP loopback: {speedup:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,11 +1,133 @@
-from .base_client import AsyncBaseClient
-from .simulation_client import AsyncSimulationClient
-from .database_client import AsyncDatabaseClient
-from .unified_client import AsyncUnifiedClient
+"""
+Асинхронный клиент для Industrial Digital Polygon Simulator.
+
+Пакет импортируется лениво: protobuf/gRPC код, Pydantic модели и клиенты
+загружаются только при первом обращении к соответствующему атрибуту
+(через module-level ``__getattr__``). Поэтому ``import simulation_client``
+не тянет за собой grpc и pydantic, что важно для короткоживущих CLI и
+serverless процессов.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_client import AsyncBaseClient
+    from .simulation_client import AsyncSimulationClient
+    from .database_client import AsyncDatabaseClient
+    from .unified_client import AsyncUnifiedClient
+    from .process_graph import IndexedProcessGraph, ProcessGraphEditor
+    from .validation import validate_parameters
+    from .schedule_sync import ProductionScheduleSync
+    from .result_cache import ResultCache
+    from .decode_executor import DecodeExecutor
+    from .hedging import HedgingPolicy
+    from .priority import PriorityScheduler, call_priority
+    from .reconcile import ApplyResult, SimulationReconciler
+    from .pool import SimulationPool
+    from .replications import ReplicationRunner, ReplicationSummary
+    from .optimizer import SuccessiveHalvingOptimizer
+    from .surrogate import SurrogateScreen
+    from .staffing import solve_staffing
+    from .supplier_index import SupplierIndex
+
+# Публичное имя -> модуль, в котором оно определено
+_LAZY_ATTRIBUTES = {
+    "AsyncBaseClient": ".base_client",
+    "AsyncSimulationClient": ".simulation_client",
+    "AsyncDatabaseClient": ".database_client",
+    "AsyncUnifiedClient": ".unified_client",
+    "IndexedProcessGraph": ".process_graph",
+    "ProcessGraphEditor": ".process_graph",
+    "validate_parameters": ".validation",
+    "ProductionScheduleSync": ".schedule_sync",
+    "ResultCache": ".result_cache",
+    "DecodeExecutor": ".decode_executor",
+    "HedgingPolicy": ".hedging",
+    "PriorityScheduler": ".priority",
+    "call_priority": ".priority",
+    "SimulationReconciler": ".reconcile",
+    "ApplyResult": ".reconcile",
+    "SimulationPool": ".pool",
+    "ReplicationRunner": ".replications",
+    "ReplicationSummary": ".replications",
+    "SuccessiveHalvingOptimizer": ".optimizer",
+    "SurrogateScreen": ".surrogate",
+    "solve_staffing": ".staffing",
+    "SupplierIndex": ".supplier_index",
+}
+
+# Подмодули, доступные как атрибуты пакета (simulation_client.models и т.д.)
+_LAZY_SUBMODULES = {
+    "arrays",
+    "base_client",
+    "database_client",
+    "decode_executor",
+    "exceptions",
+    "hedging",
+    "metrics_history",
+    "metrics_watch",
+    "models",
+    "optimizer",
+    "pool",
+    "priority",
+    "process_graph",
+    "proto",
+    "proto_convert",
+    "reconcile",
+    "replications",
+    "result_cache",
+    "schedule_sync",
+    "simulation_client",
+    "staffing",
+    "state_mirror",
+    "supplier_index",
+    "surrogate",
+    "unified_client",
+    "utils",
+    "validation",
+}
 
 __all__ = [
     "AsyncBaseClient",
     "AsyncSimulationClient",
     "AsyncDatabaseClient",
-    "AsyncSimulationClient",
+    "AsyncUnifiedClient",
+    "IndexedProcessGraph",
+    "ProcessGraphEditor",
+    "validate_parameters",
+    "ProductionScheduleSync",
+    "ResultCache",
+    "DecodeExecutor",
+    "HedgingPolicy",
+    "PriorityScheduler",
+    "call_priority",
+    "SimulationReconciler",
+    "ApplyResult",
+    "SimulationPool",
+    "ReplicationRunner",
+    "ReplicationSummary",
+    "SuccessiveHalvingOptimizer",
+    "SurrogateScreen",
+    "solve_staffing",
+    "SupplierIndex",
 ]
+
+
+def __getattr__(name: str):
+    """Лениво импортировать публичные классы и подмодули пакета."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Кэшируем, чтобы следующие обращения не проходили через __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _LAZY_SUBMODULES)
@@ -0,0 +1,128 @@
+"""
+NumPy представления графиков и временных рядов.
+
+Повторяющиеся числовые поля (load_over_time и т.п.) превращаются в
+одномерные массивы, а строки графиков (точки загрузки склада, данные
+времени операций и простоев, месячная продуктивность) - в структурированные
+массивы с именованными столбцами. Функции принимают как Pydantic модели,
+так и protobuf сообщения (имена полей совпадают), поэтому большой график
+можно разобрать из сырого ответа без создания объекта на каждую точку:
+
+```python
+raw = await client.get_warehouse_load_chart(sim_id, wh_id, decode=False)
+points = load_chart_array(raw.chart)
+peak = points["load"].max()
+```
+
+Модели предоставляют то же самое через to_numpy(). Требуется numpy
+(extra "numpy").
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, Sequence, Tuple
+
+from .utils import require_numpy
+
+if TYPE_CHECKING:
+    import numpy
+
+# Описание строки графика: (поле, тип Python)
+RowFields = Sequence[Tuple[str, type]]
+
+LOAD_POINT_FIELDS: RowFields = (
+    ("timestamp", str),
+    ("load", int),
+    ("max_capacity", int),
+)
+TIMING_DATA_FIELDS: RowFields = (
+    ("process_name", str),
+    ("cycle_time", int),
+    ("takt_time", int),
+    ("timing_cost", int),
+)
+DOWNTIME_DATA_FIELDS: RowFields = (
+    ("process_name", str),
+    ("cause", str),
+    ("downtime_minutes", int),
+)
+MONTHLY_PRODUCTIVITY_FIELDS: RowFields = (
+    ("month", str),
+    ("units_produced", int),
+)
+
+
+def series_array(values: Iterable[int], dtype: str = "int64"):
+    """
+    Одномерный массив из повторяющегося числового поля.
+
+    Args:
+        values: list или protobuf RepeatedScalarContainer
+        dtype: Тип элементов
+
+    Returns:
+        numpy.ndarray: Массив значений
+    """
+    np = require_numpy()
+    if not hasattr(values, "__len__"):
+        values = list(values)
+    return np.fromiter(values, dtype=dtype, count=len(values))
+
+
+def records_array(rows: Sequence, fields: RowFields):
+    """
+    Структурированный массив из строк графика.
+
+    Заполняется по столбцам; ширина строковых столбцов равна длине самой
+    длинной строки.
+
+    Args:
+        rows: Pydantic модели или protobuf сообщения строк
+        fields: Поля строки и их типы
+
+    Returns:
+        numpy.ndarray: Структурированный массив (по элементу на строку)
+    """
+    np = require_numpy()
+    columns = {name: [getattr(row, name) for row in rows] for name, _ in fields}
+
+    dtype = []
+    for name, kind in fields:
+        if kind is str:
+            width = max((len(value) for value in columns[name]), default=0)
+            dtype.append((name, f"U{max(width, 1)}"))
+        elif kind is float:
+            dtype.append((name, "float64"))
+        else:
+            dtype.append((name, "int64"))
+
+    array = np.empty(len(rows), dtype=dtype)
+    for name, _ in fields:
+        array[name] = columns[name]
+    return array
+
+
+def warehouse_series(metrics) -> Dict[str, "numpy.ndarray"]:
+    """Ряды load_over_time и max_capacity_over_time метрик склада."""
+    return {
+        "load_over_time": series_array(metrics.load_over_time),
+        "max_capacity_over_time": series_array(metrics.max_capacity_over_time),
+    }
+
+
+def load_chart_array(chart):
+    """Точки графика загрузки склада (timestamp, load, max_capacity)."""
+    return records_array(chart.data_points, LOAD_POINT_FIELDS)
+
+
+def timing_chart_array(chart):
+    """Строки графика времени операций."""
+    return records_array(chart.timing_data, TIMING_DATA_FIELDS)
+
+
+def downtime_chart_array(chart):
+    """Строки графика простоев."""
+    return records_array(chart.downtime_data, DOWNTIME_DATA_FIELDS)
+
+
+def monthly_productivity_array(metrics):
+    """Месячная продуктивность метрик производства (month, units_produced)."""
+    return records_array(metrics.monthly_productivity, MONTHLY_PRODUCTIVITY_FIELDS)
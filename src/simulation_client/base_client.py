@@ -1,15 +1,89 @@
 import asyncio
+import functools
+import time
 import grpc
 from abc import ABC, abstractmethod
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Callable, Dict, List, Union
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 
 from .exceptions import ConnectionError, TimeoutError
-from .utils import ExponentialBackoff, AsyncRateLimiter, retry_async
+from .hedging import HedgingPolicy, hedged_call
+from .priority import PriorityScheduler, call_priority
+from .utils import ExponentialBackoff, AsyncRateLimiter, retry_async, setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Режимы подключения:
+# "ping" - создать канал и проверить соединение через ping (по умолчанию)
+# "eager" - дополнительно прогреть канал, stub и схемы моделей
+# "lazy" - не ходить в сеть в connect(), соединение устанавливается первым вызовом
+CONNECT_MODES = ("ping", "eager", "lazy")
+
+# Обработчик событий клиента: hook(event, data)
+EventHook = Callable[[str, Dict[str, Any]], None]
+
+# Префиксы адресов gRPC для Unix domain socket
+UNIX_SOCKET_PREFIXES = ("unix:", "unix-abstract:")
+
+# Лимит размера сообщения gRPC по умолчанию (4 МБ)
+DEFAULT_MAX_MESSAGE_LENGTH = 4 * 1024 * 1024
+
+_COMPRESSION_ALIASES = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+# Сжатие, заданное для текущего вызова через AsyncBaseClient.call_compression()
+_call_compression: ContextVar[Optional[grpc.Compression]] = ContextVar(
+    "simulation_client_call_compression", default=None
+)
+
+
+def _is_message_size_error(e: Exception) -> bool:
+    """Проверить, что ошибка вызвана превышением лимита размера сообщения."""
+    if not isinstance(e, grpc.RpcError):
+        return False
+    try:
+        code = e.code()
+        details = e.details() or ""
+    except Exception:
+        return False
+    return (
+        code == grpc.StatusCode.RESOURCE_EXHAUSTED
+        and "larger than max" in details.lower()
+    )
+
+
+def _parse_compression(
+    compression: Optional[Union[str, grpc.Compression]],
+) -> Optional[grpc.Compression]:
+    """
+    Привести настройку сжатия к grpc.Compression.
+
+    Args:
+        compression: None, grpc.Compression или строка "none"/"gzip"/"deflate"
+
+    Returns:
+        Optional[grpc.Compression]: Алгоритм сжатия или None
+    """
+    if compression is None or isinstance(compression, grpc.Compression):
+        return compression
+    try:
+        return _COMPRESSION_ALIASES[compression.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(
+            f"Unknown compression {compression!r}, "
+            f"expected one of {sorted(_COMPRESSION_ALIASES)} or grpc.Compression"
+        ) from None
+
+
+def is_unix_socket_target(host: str) -> bool:
+    """Проверить, что хост задан как адрес Unix domain socket."""
+    return host.startswith(UNIX_SOCKET_PREFIXES)
+
 
 class AsyncBaseClient(ABC):
     """
@@ -24,32 +98,116 @@ class AsyncBaseClient(ABC):
         timeout: float = 30.0,
         rate_limit: Optional[float] = None,
         enable_logging: bool = True,
+        compression: Optional[Union[str, grpc.Compression]] = None,
+        max_receive_message_length: Optional[int] = None,
+        max_send_message_length: Optional[int] = None,
+        large_response_warning_ratio: float = 0.8,
+        channel: Optional[grpc.aio.Channel] = None,
+        connect_mode: str = "ping",
+        hedging: Optional[HedgingPolicy] = None,
+        priority_scheduler: Optional[PriorityScheduler] = None,
     ):
         """
         Инициализация базового клиента.
 
         Args:
-            host: Хост сервера
-            port: Порт сервера
+            host: Хост сервера или адрес Unix domain socket
+                ("unix:/run/simulator.sock", "unix-abstract:simulator")
+            port: Порт сервера (игнорируется для unix: адресов)
             max_retries: Максимальное количество повторных попыток
             timeout: Таймаут операций в секундах
             rate_limit: Ограничение запросов в секунду
             enable_logging: Включить логирование
+            compression: Сжатие исходящих запросов: None, "gzip",
+                "deflate" или grpc.Compression. Сжатие ответов выбирает
+                сервер: канал объявляет поддерживаемые алгоритмы в
+                grpc-accept-encoding, и на размер ответов get_* эта
+                настройка не влияет
+            max_receive_message_length: Максимальный размер входящего
+                сообщения в байтах (по умолчанию 4 МБ, -1 - без лимита)
+            max_send_message_length: Максимальный размер исходящего
+                сообщения в байтах (по умолчанию без лимита gRPC)
+            large_response_warning_ratio: Доля от max_receive_message_length,
+                при превышении которой в лог пишется предупреждение
+            channel: Готовый gRPC канал (например, общий с другим клиентом).
+                Такой канал не закрывается в close()
+            connect_mode: Режим подключения: "ping" (канал + ping),
+                "eager" (прогрев канала, stub'а и схем моделей) или
+                "lazy" (без сетевых вызовов, подключение при первом запросе)
+            hedging: Хеджирование идемпотентных запросов чтения get_*
+                (HedgingPolicy); None - выключено. Без HedgingPolicy.targets
+                повторный запрос идет в тот же канал и на тот же сервер:
+                независимой реплики, срезающей хвост задержек медленного
+                сервера, это не дает
+            priority_scheduler: Очереди вызовов по классам приоритета
+                ("interactive"/"batch") перед лимитером и каналом
+                (PriorityScheduler); None - без приоритетов
         """
+        if connect_mode not in CONNECT_MODES:
+            raise ValueError(
+                f"Unknown connect_mode {connect_mode!r}, expected one of {CONNECT_MODES}"
+            )
+
         self.host = host
         self.port = port
         self.max_retries = max_retries
         self.timeout = timeout
         self.channel = None
         self.stub = None
+        # Внешний канал, которым клиент не владеет (см. use_channel())
+        self._external_channel = channel
         self.backoff = ExponentialBackoff(max_retries=max_retries)
         self.rate_limiter = AsyncRateLimiter(rate_limit, 1.0) if rate_limit else None
+        # Логирование настраивается в connect(), а не при создании клиента:
+        # конструктор остается дешевым и без побочных эффектов
+        self.enable_logging = enable_logging
+
+        self.compression = _parse_compression(compression)
+
+        self.max_receive_message_length = max_receive_message_length
+        self.max_send_message_length = max_send_message_length
+        self.large_response_warning_ratio = large_response_warning_ratio
+        # Последний наблюдаемый размер ответа по имени метода stub'а
+        self._response_sizes: Dict[str, int] = {}
+        self._stub_methods: Dict[int, str] = {}
+        self._stub_methods_owner = None
+
+        self.connect_mode = connect_mode
+        self._event_hooks: List[EventHook] = []
+        # Время начала подключения в режиме "lazy" до первого успешного вызова
+        self._lazy_connect_started: Optional[float] = None
+
+        self.hedging = hedging
+        # Каналы и stub'ы реплик из hedging.targets
+        self._hedge_channels: List[grpc.aio.Channel] = []
+        self._hedge_stubs: List[Any] = []
+
+        self.priority_scheduler = priority_scheduler
+
+    @property
+    def target(self) -> str:
+        """Адрес сервера в формате gRPC: "host:port" или "unix:/path"."""
+        if is_unix_socket_target(self.host):
+            return self.host
+        return f"{self.host}:{self.port}"
+
+    def use_channel(self, channel: Optional[grpc.aio.Channel]) -> None:
+        """
+        Использовать внешний канал вместо создания собственного.
 
-        if enable_logging:
-            logging.basicConfig(
-                level=logging.INFO,
-                format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            )
+        Канал будет использован при следующем connect() и не будет
+        закрыт в close(): им управляет владелец. None возвращает клиенту
+        собственный канал.
+
+        Args:
+            channel: gRPC канал или None
+        """
+        self._external_channel = channel
+
+    @property
+    def owns_channel(self) -> bool:
+        """True, если клиент сам создает и закрывает свой канал."""
+        return self._external_channel is None
 
     @abstractmethod
     def _create_stub(self, channel: grpc.aio.Channel):
@@ -93,14 +251,43 @@ class AsyncBaseClient(ABC):
 
         Создает канал, stub и проверяет соединение через ping.
         Использует wait_for_ready=True для ожидания готовности сервера.
+
+        В режиме "eager" дополнительно дожидается готовности канала,
+        заранее строит таблицу методов stub'а и схемы моделей. В режиме
+        "lazy" только создает канал и stub: соединение устанавливается
+        первым вызовом. Время установки соединения сообщается событием
+        "connect" (см. add_event_hook()).
         """
+        if self.enable_logging:
+            setup_logging()
+
+        started = time.perf_counter()
         try:
             # Создаем канал
-            logger.info(
-                f"Creating channel to {self._get_service_name()} at {self.host}:{self.port}..."
-            )
-            self.channel = await self._create_channel()
+            if self._external_channel is not None:
+                logger.info(
+                    f"Using shared channel to {self._get_service_name()} at {self.target}"
+                )
+                self.channel = self._external_channel
+            else:
+                logger.info(
+                    f"Creating channel to {self._get_service_name()} at {self.target}..."
+                )
+                self.channel = await self._create_channel()
             self.stub = self._create_stub(self.channel)
+            await self._connect_hedge_targets()
+
+            if self.connect_mode == "lazy":
+                # Сетевых вызовов нет: время соединения измерит первый запрос
+                self._lazy_connect_started = started
+                logger.info(
+                    f"{self._get_service_name()} client at {self.target} "
+                    f"will connect on first call"
+                )
+                return
+
+            if self.connect_mode == "eager":
+                await self._warm_up()
 
             # Проверяем соединение через ping с wait_for_ready
             # wait_for_ready=True позволяет клиенту ждать готовности сервера
@@ -109,11 +296,12 @@ class AsyncBaseClient(ABC):
             )
             if await self.ping():
                 logger.info(
-                    f"✅ Connected to {self._get_service_name()} at {self.host}:{self.port}"
+                    f"✅ Connected to {self._get_service_name()} at {self.target}"
                 )
+                self._emit_connect(time.perf_counter() - started)
             else:
                 raise ConnectionError(
-                    f"Cannot connect to {self._get_service_name()} at {self.host}:{self.port}"
+                    f"Cannot connect to {self._get_service_name()} at {self.target}"
                 )
 
         except grpc.RpcError as e:
@@ -121,7 +309,7 @@ class AsyncBaseClient(ABC):
             logger.error(error_msg)
             raise ConnectionError(error_msg) from e
         except asyncio.TimeoutError as e:
-            error_msg = f"Timeout connecting to {self._get_service_name()} at {self.host}:{self.port}"
+            error_msg = f"Timeout connecting to {self._get_service_name()} at {self.target}"
             logger.error(error_msg)
             raise ConnectionError(error_msg) from e
         except ConnectionError:
@@ -132,10 +320,47 @@ class AsyncBaseClient(ABC):
             logger.error(error_msg)
             raise ConnectionError(error_msg) from e
 
+    async def _warm_up(self):
+        """
+        Прогреть соединение перед первым запросом.
+
+        Пока канал устанавливает соединение (TCP/UDS + обмен HTTP/2 SETTINGS),
+        строит таблицу методов stub'а и схемы Pydantic моделей.
+        """
+        from . import models
+
+        ready = asyncio.ensure_future(self.channel.channel_ready())
+        try:
+            self._resolve_stub_methods()
+            built = models.build_models()
+            await asyncio.wait_for(ready, timeout=self.timeout)
+        finally:
+            if not ready.done():
+                ready.cancel()
+        logger.debug(
+            f"{self._get_service_name()} warmed up: channel ready, "
+            f"{len(self._stub_methods)} stub methods, {built} models built"
+        )
+
+    async def _connect_hedge_targets(self) -> None:
+        """Создать каналы к репликам для повторных запросов хеджирования."""
+        if self.hedging is None or self._hedge_channels:
+            return
+        for target in self.hedging.targets:
+            channel = await self._create_channel(target=target)
+            self._hedge_channels.append(channel)
+            self._hedge_stubs.append(self._create_stub(channel))
+
     async def close(self):
         """Закрыть соединение."""
+        for channel in self._hedge_channels:
+            await channel.close()
+        self._hedge_channels = []
+        self._hedge_stubs = []
         if self.channel:
-            await self.channel.close()
+            # Общий канал закрывает его владелец
+            if self.owns_channel:
+                await self.channel.close()
             self.stub = None
             logger.info(f"Disconnected from {self._get_service_name()}")
 
@@ -160,7 +385,8 @@ class AsyncBaseClient(ABC):
 
             # Используем wait_for_ready=True и timeout согласно best practices
             # Это позволяет клиенту ждать готовности сервера вместо немедленного отказа
-            response = await self.stub.ping(
+            response = await self._call_in_slot(
+                self.stub.ping,
                 simulator_pb2.PingRequest(),
                 wait_for_ready=True,
                 timeout=10.0,  # Таймаут для ping запроса
@@ -187,7 +413,7 @@ class AsyncBaseClient(ABC):
         """Проверить, что клиент подключен."""
         if self.stub is None:
             raise ConnectionError(
-                f"Client not connected to {self.host}:{self.port}. Call connect() first."
+                f"Client not connected to {self.target}. Call connect() first."
             )
 
     async def __aenter__(self):
@@ -199,26 +425,279 @@ class AsyncBaseClient(ABC):
 
     async def _rate_limit(self):
         """Применить ограничение скорости."""
+        if self.priority_scheduler is not None:
+            # Токен лимитера берет планировщик в порядке приоритетов (_with_retry)
+            return
+        await self._wait_rate_limiter()
+
+    async def _wait_rate_limiter(self):
+        """Дождаться токена лимитера."""
         if self.rate_limiter:
             await self.rate_limiter.wait()
 
+    async def _call_in_slot(self, func, *args, **kwargs):
+        """
+        Выполнить одну попытку RPC в слоте планировщика приоритетов.
+
+        Без планировщика вызов выполняется сразу (лимитер применяет
+        _rate_limit); с планировщиком токен лимитера берется при выпуске
+        из очереди.
+        """
+        if self.priority_scheduler is None:
+            return await func(*args, **kwargs)
+        async with self.priority_scheduler.slot(before=self._wait_rate_limiter):
+            return await func(*args, **kwargs)
+
     async def _with_retry(self, func, *args, **kwargs):
         """Выполнить функцию с повторными попытками."""
-        return await retry_async(
-            func,
+        method = self._method_name(func)
+        lazy_connect = self._lazy_connect_started is not None
+        if lazy_connect:
+            call_started = time.perf_counter()
+
+        # Сжатие запроса из call_compression(); без него - настройка канала.
+        # Ответ сервер сжимает по своей настройке, выбирая из алгоритмов,
+        # которые канал объявляет в grpc-accept-encoding
+        compression = _call_compression.get()
+        if compression is not None and "compression" not in kwargs:
+            kwargs["compression"] = compression
+
+        call = func
+        if self.hedging is not None and self.hedging.is_hedged(method):
+            call = functools.partial(
+                hedged_call,
+                self.hedging,
+                method,
+                func,
+                self._hedge_alternate(method, func),
+                on_hedge=lambda delay: self._emit("hedge", method=method, delay=delay),
+            )
+
+        if self.priority_scheduler is not None:
+            # Слот занимается на каждую попытку: паузы между повторами
+            # не держат слот планировщика
+            call = functools.partial(self._call_in_slot, call)
+        response = await retry_async(
+            call,
             *args,
             max_retries=self.max_retries,
             base_delay=1.0,
             retry_exceptions=(grpc.RpcError, ConnectionError, TimeoutError),
+            retry_if=self._is_retryable,
             **kwargs,
         )
 
-    async def _create_channel(self, options: Optional[list] = None) -> grpc.aio.Channel:
+        self._record_response_size(method, response)
+
+        if lazy_connect and self._lazy_connect_started is not None:
+            # Первый успешный вызов в режиме "lazy" включает установку соединения
+            self._lazy_connect_started = None
+            self._emit_connect(time.perf_counter() - call_started)
+        return response
+
+    def _hedge_alternate(self, method: str, func) -> Callable:
+        """
+        Вызов для повторного запроса хеджирования.
+
+        Реплика выбирается по кругу в момент отправки; без реплик
+        повторный запрос идет в тот же канал.
+        """
+        if not self._hedge_stubs:
+            return func
+
+        def alternate(*args, **kwargs):
+            stub = self._hedge_stubs[
+                self.hedging.next_target_index(len(self._hedge_stubs))
+            ]
+            return getattr(stub, method)(*args, **kwargs)
+
+        return alternate
+
+    def _is_retryable(self, e: Exception) -> bool:
+        """
+        Проверить, имеет ли смысл повторять вызов после ошибки.
+
+        Превышение лимита размера сообщения детерминировано: повтор
+        вернет тот же слишком большой ответ.
+        """
+        return not _is_message_size_error(e)
+
+    # ==================== События ====================
+
+    def add_event_hook(self, hook: EventHook) -> None:
+        """
+        Подписаться на события клиента.
+
+        hook(event, data) вызывается синхронно; исключения в hook
+        логируются и не влияют на работу клиента.
+
+        События:
+            "connect": соединение установлено; data: service, target,
+                mode, duration (секунды)
+            "decode_offloaded": ответ конвертирован вне event loop
+                (DecodeExecutor); data: service, size (байты), mode,
+                duration (секунды, на столько не был заблокирован loop)
+            "hedge": отправлен повторный запрос чтения (HedgingPolicy);
+                data: service, method, delay (секунды ожидания до него)
+            "simulation_lease": выдана симуляция (SimulationPool); data:
+                service, simulation_id, from_pool, wait (секунды)
+
+        Args:
+            hook: Обработчик событий
+        """
+        self._event_hooks.append(hook)
+
+    def remove_event_hook(self, hook: EventHook) -> None:
+        """Отписать обработчик событий."""
+        if hook in self._event_hooks:
+            self._event_hooks.remove(hook)
+
+    def _emit(self, event: str, **data: Any) -> None:
+        """Передать событие всем обработчикам."""
+        if not self._event_hooks:
+            return
+        data.setdefault("service", self._get_service_name())
+        for hook in list(self._event_hooks):
+            try:
+                hook(event, data)
+            except Exception as e:
+                logger.warning(f"Event hook {hook!r} failed on {event!r}: {e}")
+
+    def _emit_connect(self, duration: float) -> None:
+        """Сообщить о времени установки соединения."""
+        logger.debug(
+            f"{self._get_service_name()} connected in {duration * 1000:.1f} ms "
+            f"({self.connect_mode})"
+        )
+        self._emit(
+            "connect", target=self.target, mode=self.connect_mode, duration=duration
+        )
+
+    # ==================== Приоритеты ====================
+
+    def call_priority(self, priority: str):
+        """
+        Задать класс приоритета для вызовов внутри блока.
+
+        Действует на текущую задачу (контекстная переменная), то есть на
+        вызовы всех клиентов с PriorityScheduler.
+
+        Пример:
+        ```python
+        with client.call_priority("batch"):
+            await client.run_simulation(simulation_id)
+        ```
+
+        Args:
+            priority: "interactive" или "batch"
+        """
+        return call_priority(priority)
+
+    # ==================== Сжатие ====================
+
+    @contextmanager
+    def call_compression(self, compression: Optional[Union[str, grpc.Compression]]):
+        """
+        Задать сжатие для вызовов внутри блока.
+
+        Переопределяет настройку канала. Сжимается только исходящий
+        запрос вызова.
+
+        Пример:
+        ```python
+        with client.call_compression("gzip"):
+            response = await client.get_simulation(simulation_id)
+        ```
+
+        Args:
+            compression: "none", "gzip", "deflate" или grpc.Compression
+        """
+        token = _call_compression.set(_parse_compression(compression))
+        try:
+            yield
+        finally:
+            _call_compression.reset(token)
+
+    @property
+    def observed_response_sizes(self) -> Dict[str, int]:
+        """Последние наблюдаемые размеры ответов (байты) по методам."""
+        return dict(self._response_sizes)
+
+    @staticmethod
+    def _message_size(message) -> Optional[int]:
+        """Размер protobuf сообщения в байтах (None, если не определить)."""
+        byte_size = getattr(message, "ByteSize", None)
+        if not callable(byte_size):
+            return None
+        try:
+            size = byte_size()
+        except Exception:
+            return None
+        return size if isinstance(size, int) else None
+
+    def _record_response_size(self, method: Optional[str], response) -> None:
+        """
+        Запомнить размер ответа метода.
+
+        Размер используется для предупреждения о приближении к
+        max_receive_message_length.
+        """
+        if method is None:
+            return
+        size = self._message_size(response)
+        if size is None:
+            return
+
+        previous = self._response_sizes.get(method, 0)
+        self._response_sizes[method] = size
+
+        limit = self.receive_message_limit
+        if limit > 0:
+            threshold = int(limit * self.large_response_warning_ratio)
+            if size >= threshold > previous:
+                logger.warning(
+                    f"{self._get_service_name()}.{method} response is {size} bytes, "
+                    f"{size / limit:.0%} of max_receive_message_length ({limit}). "
+                    f"Increase max_receive_message_length or fetch per-step metrics"
+                )
+
+    @property
+    def receive_message_limit(self) -> int:
+        """Действующий лимит размера входящего сообщения (байты, -1 - без лимита)."""
+        if self.max_receive_message_length is None:
+            return DEFAULT_MAX_MESSAGE_LENGTH
+        return self.max_receive_message_length
+
+    def _method_name(self, func) -> Optional[str]:
+        """
+        Получить имя метода stub'а по вызываемому объекту.
+
+        Таблица {id(multicallable): имя} строится один раз на каждый stub.
+        """
+        if self.stub is None:
+            return None
+        if self._stub_methods_owner is not self.stub:
+            self._resolve_stub_methods()
+        return self._stub_methods.get(id(func))
+
+    def _resolve_stub_methods(self) -> None:
+        """Построить таблицу методов текущего stub'а."""
+        self._stub_methods = {
+            id(value): name
+            for name, value in vars(self.stub).items()
+            if callable(value)
+        }
+        self._stub_methods_owner = self.stub
+
+    async def _create_channel(
+        self, options: Optional[list] = None, target: Optional[str] = None
+    ) -> grpc.aio.Channel:
         """
         Создать асинхронный канал.
 
         Args:
             options: Дополнительные опции канала
+            target: Адрес (по умолчанию self.target)
 
         Returns:
             grpc.aio.Channel: Асинхронный канал
@@ -230,11 +709,22 @@ class AsyncBaseClient(ABC):
             ("grpc.max_reconnect_backoff_ms", 10000),
         ]
 
+        if self.max_receive_message_length is not None:
+            default_options.append(
+                ("grpc.max_receive_message_length", self.max_receive_message_length)
+            )
+        if self.max_send_message_length is not None:
+            default_options.append(
+                ("grpc.max_send_message_length", self.max_send_message_length)
+            )
+
         if options:
             default_options.extend(options)
 
         return grpc.aio.insecure_channel(
-            f"{self.host}:{self.port}", options=default_options
+            target or self.target,
+            options=default_options,
+            compression=self.compression,
         )
 
     @asynccontextmanager
@@ -265,9 +755,18 @@ class AsyncBaseClient(ABC):
             NotFoundError,
             AuthenticationError,
             ResourceExhaustedError,
+            MessageTooLargeError,
             ValidationError,
         )
 
+        if _is_message_size_error(e):
+            raise MessageTooLargeError(
+                f"{operation} failed: {e.details()}. "
+                f"Increase max_receive_message_length "
+                f"(current: {self.receive_message_limit}) or fetch results "
+                f"per step (get_simulation_results_by_steps)"
+            )
+
         error_map = {
             grpc.StatusCode.NOT_FOUND: NotFoundError,
             grpc.StatusCode.UNAUTHENTICATED: AuthenticationError,
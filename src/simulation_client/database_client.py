@@ -1,9 +1,11 @@
 import asyncio
 import grpc
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import logging
 
 from .base_client import AsyncBaseClient
+from .hedging import HedgingPolicy
+from .priority import PriorityScheduler
 from .proto import simulator_pb2
 from .proto import simulator_pb2_grpc
 from .models import *
@@ -35,8 +37,31 @@ class AsyncDatabaseClient(AsyncBaseClient):
         timeout: float = 30.0,
         rate_limit: Optional[float] = None,
         enable_logging: bool = True,
+        compression: Optional[Union[str, grpc.Compression]] = None,
+        max_receive_message_length: Optional[int] = None,
+        max_send_message_length: Optional[int] = None,
+        large_response_warning_ratio: float = 0.8,
+        channel: Optional[grpc.aio.Channel] = None,
+        connect_mode: str = "ping",
+        hedging: Optional[HedgingPolicy] = None,
+        priority_scheduler: Optional[PriorityScheduler] = None,
     ):
-        super().__init__(host, port, max_retries, timeout, rate_limit, enable_logging)
+        super().__init__(
+            host,
+            port,
+            max_retries,
+            timeout,
+            rate_limit,
+            enable_logging,
+            compression=compression,
+            max_receive_message_length=max_receive_message_length,
+            max_send_message_length=max_send_message_length,
+            large_response_warning_ratio=large_response_warning_ratio,
+            channel=channel,
+            connect_mode=connect_mode,
+            hedging=hedging,
+            priority_scheduler=priority_scheduler,
+        )
 
     def _create_stub(self, channel: grpc.aio.Channel):
         """Создать stub для SimulationDatabaseManager."""
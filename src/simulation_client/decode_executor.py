@@ -0,0 +1,183 @@
+"""
+Декодирование больших ответов вне event loop.
+
+Конвертация большого SimulationResponse в Pydantic модель - синхронная
+работа CPU. Пока она выполняется в event loop, остальные RPC (включая
+маленькие вроде ping) ждут. DecodeExecutor выполняет конвертацию ответов
+больше порога в пуле потоков или процессов:
+
+- "thread": конвертация в потоке. Event loop продолжает работать, но
+  делит GIL с декодированием (переключение каждые sys.getswitchinterval()),
+  поэтому задержки ограничены, но не исчезают полностью.
+- "process": в процесс передаются сериализованные байты ответа, разбор
+  и конвертация выполняются там, обратно возвращается модель одним
+  pickle-блоком. В event loop остаются SerializeToString() и распаковка
+  результата; их время вычитается из stall_prevented. Подходит для очень
+  больших симуляций.
+
+```python
+client = AsyncSimulationClient(
+    decode_executor=DecodeExecutor(threshold=256 * 1024, mode="process")
+)
+```
+"""
+
+import asyncio
+import logging
+import pickle
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .models import SimulationResponse
+
+logger = logging.getLogger(__name__)
+
+DECODE_MODES = ("thread", "process")
+
+# Клиент для конвертации в процессах пула (создается один раз на процесс)
+_process_client = None
+
+
+def _decode_in_process(payload: bytes) -> Tuple[bytes, float]:
+    """
+    Разобрать SimulationResponse из байтов и конвертировать в модель.
+
+    Модель возвращается сериализованной (pickle) в процессе пула: пул
+    передает один блок байтов, а распаковку вызывающая сторона измеряет.
+    """
+    global _process_client
+    from .proto import simulator_pb2
+    from .simulation_client import AsyncSimulationClient
+
+    start = time.perf_counter()
+    if _process_client is None:
+        _process_client = AsyncSimulationClient(enable_logging=False)
+    response = simulator_pb2.SimulationResponse.FromString(payload)
+    decoded = _process_client._build_simulation_response(response)
+    packed = pickle.dumps(decoded, protocol=pickle.HIGHEST_PROTOCOL)
+    return packed, time.perf_counter() - start
+
+
+def _decode_in_thread(client, response) -> Tuple["SimulationResponse", float]:
+    """Конвертировать ответ в модель, измеряя время."""
+    start = time.perf_counter()
+    decoded = client._build_simulation_response(response)
+    return decoded, time.perf_counter() - start
+
+
+class DecodeExecutor:
+    """
+    Адаптивный исполнитель конвертации ответов.
+
+    Ответы меньше threshold байт конвертируются сразу в event loop
+    (перенос в пул стоит дороже), большие - в пуле. Время конвертации
+    в пуле за вычетом работы, оставшейся в event loop (сериализация
+    запроса в пул и распаковка результата), учитывается как
+    предотвращенная блокировка event loop.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 256 * 1024,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            threshold: Размер сериализованного ответа (байты), начиная
+                с которого конвертация выполняется в пуле
+            mode: "thread" или "process"
+            max_workers: Размер пула (по умолчанию - значение пула)
+            executor: Готовый пул вместо создаваемого (не закрывается
+                в shutdown)
+        """
+        if mode not in DECODE_MODES:
+            raise ValueError(f"mode must be one of {DECODE_MODES}, got {mode!r}")
+        self.threshold = threshold
+        self.mode = mode
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.inline = 0
+        self.offloaded = 0
+        self.stall_prevented = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        """Пул (создается при первом переносе)."""
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="simulation-decode",
+                )
+        return self._executor
+
+    async def decode_simulation_response(self, client, response):
+        """
+        Конвертировать protobuf SimulationResponse в модель.
+
+        Args:
+            client: AsyncSimulationClient (конвертер и обработчики событий)
+            response: Protobuf ответ
+
+        Returns:
+            SimulationResponse: Модель ответа (еще не записанная в зеркало)
+        """
+        size = response.ByteSize()
+        if size < self.threshold:
+            self.inline += 1
+            return client._build_simulation_response(response)
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        if self.mode == "process":
+            payload = response.SerializeToString()
+            on_loop = time.perf_counter() - start
+            packed, duration = await loop.run_in_executor(
+                self.executor, _decode_in_process, payload
+            )
+            unpack_start = time.perf_counter()
+            decoded = pickle.loads(packed)
+            on_loop += time.perf_counter() - unpack_start
+        else:
+            on_loop = 0.0
+            decoded, duration = await loop.run_in_executor(
+                self.executor, _decode_in_thread, client, response
+            )
+
+        self.offloaded += 1
+        self.stall_prevented += max(duration - on_loop, 0.0)
+        logger.debug(
+            f"Decoded {size} byte SimulationResponse in {self.mode} pool: "
+            f"{duration * 1000:.1f} ms in pool, {on_loop * 1000:.1f} ms on the "
+            f"event loop, {(time.perf_counter() - start) * 1000:.1f} ms total"
+        )
+        client._emit(
+            "decode_offloaded",
+            size=size,
+            mode=self.mode,
+            duration=duration,
+            loop_duration=on_loop,
+        )
+        return decoded
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Остановить собственный пул."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Число конвертаций в loop/пуле и предотвращенная блокировка (секунды)."""
+        return {
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "stall_prevented": self.stall_prevented,
+        }
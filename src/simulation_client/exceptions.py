@@ -52,6 +52,12 @@ class ResourceExhaustedError(SimulationError):
     pass
 
 
+class MessageTooLargeError(ResourceExhaustedError):
+    """Сообщение превышает max_receive/max_send_message_length."""
+
+    pass
+
+
 class TimeoutError(SimulationError):
     """Таймаут операции."""
 
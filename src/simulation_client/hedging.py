@@ -0,0 +1,220 @@
+"""
+Хеджирование идемпотентных запросов чтения.
+
+Если ответ на запрос чтения не пришел за время, большее наблюдаемого
+перцентиля задержки метода (например, p95), отправляется второй такой же
+запрос - в другой канал (реплику) из targets или, если их нет, в тот же
+канал. Побеждает первый успешный ответ, второй запрос отменяется. Без
+targets повторный запрос идет на тот же сервер: он обходит только
+задержки отдельного вызова (потерянный пакет, очередь потока сервера),
+но не медленный или перегруженный сервер целиком.
+Число дополнительных запросов ограничено бюджетом: не больше budget
+от числа запросов (с небольшим запасом на всплески).
+
+```python
+client = AsyncSimulationClient(
+    "sim-1", 50051,
+    hedging=HedgingPolicy(targets=["sim-2:50051"], percentile=95, budget=0.05),
+)
+```
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Optional, Sequence
+
+
+def is_read_method(method: str) -> bool:
+    """
+    Идемпотентные методы чтения по умолчанию: get_*.
+
+    ping не хеджируется: он проверяет доступность именно этого канала,
+    и ответ реплики скрыл бы недоступный основной сервер.
+    """
+    return method.startswith("get_")
+
+
+class HedgingPolicy:
+    """
+    Параметры и состояние хеджирования одного клиента.
+
+    Для каждого метода хранится окно последних задержек; пока в нем меньше
+    min_samples значений, запрос не хеджируется. Бюджет пополняется на
+    budget с каждым запросом и не превышает max_burst.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[str] = (),
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        max_burst: float = 10.0,
+        min_delay: float = 0.005,
+        min_samples: int = 20,
+        window: int = 256,
+        methods: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            targets: Адреса реплик ("host:port" или "unix:/path") для
+                повторного запроса; пустой список - тот же канал
+            percentile: Перцентиль задержки метода, после которого
+                отправляется повторный запрос
+            budget: Доля запросов, которые можно хеджировать
+            max_burst: Максимальный накопленный бюджет (запросов)
+            min_delay: Минимальная задержка перед повторным запросом (секунды)
+            min_samples: Минимум наблюдений метода для хеджирования
+            window: Число последних задержек метода для перцентиля
+            methods: Хеджируемые методы stub'а (по умолчанию get_*)
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if budget < 0:
+            raise ValueError("budget must be >= 0")
+        self.targets = list(targets)
+        self.percentile = percentile
+        self.budget = budget
+        self.max_burst = max_burst
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self._methods = frozenset(methods) if methods is not None else None
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._tokens = 0.0
+        self._next_target = 0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    def is_hedged(self, method: Optional[str]) -> bool:
+        """Хеджируется ли метод."""
+        if method is None:
+            return False
+        if self._methods is not None:
+            return method in self._methods
+        return is_read_method(method)
+
+    def record(self, method: str, latency: float) -> None:
+        """Запомнить задержку успешного ответа."""
+        samples = self._latencies.get(method)
+        if samples is None:
+            samples = self._latencies[method] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def delay_for(self, method: str) -> Optional[float]:
+        """Задержка перед повторным запросом (None - данных пока мало)."""
+        samples = self._latencies.get(method)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[index])
+
+    def on_request(self) -> None:
+        """Учесть запрос и пополнить бюджет."""
+        self.requests += 1
+        self._tokens = min(self.max_burst, self._tokens + self.budget)
+
+    def try_acquire(self) -> bool:
+        """Взять из бюджета один повторный запрос."""
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.hedged += 1
+            return True
+        self.budget_exhausted += 1
+        return False
+
+    def next_target_index(self, count: int) -> int:
+        """Индекс одной из count реплик для повторного запроса (по кругу)."""
+        index = self._next_target % count
+        self._next_target += 1
+        return index
+
+    def percentiles(self) -> Dict[str, float]:
+        """Текущая задержка хеджирования по методам (секунды)."""
+        return {
+            method: delay
+            for method in self._latencies
+            if (delay := self.delay_for(method)) is not None
+        }
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Число запросов, повторных запросов, их побед и отказов бюджета."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+async def hedged_call(
+    policy: HedgingPolicy,
+    method: str,
+    primary: Callable,
+    alternate: Callable,
+    *args,
+    on_hedge: Optional[Callable[[float], None]] = None,
+    **kwargs,
+):
+    """
+    Выполнить вызов с хеджированием.
+
+    Args:
+        policy: Политика хеджирования
+        method: Имя метода stub'а
+        primary: Основной вызов
+        alternate: Вызов того же метода в другом канале
+        on_hedge: Вызывается с задержкой при отправке повторного запроса
+
+    Returns:
+        Первый успешный ответ
+
+    Raises:
+        Исключение основного запроса, если оба завершились ошибкой
+    """
+    policy.on_request()
+    started = time.perf_counter()
+    delay = policy.delay_for(method)
+
+    first = asyncio.ensure_future(primary(*args, **kwargs))
+    if delay is None:
+        response = await first
+        policy.record(method, time.perf_counter() - started)
+        return response
+
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+    except asyncio.CancelledError:
+        first.cancel()
+        raise
+    if done or not policy.try_acquire():
+        response = await first
+        policy.record(method, time.perf_counter() - started)
+        return response
+
+    if on_hedge is not None:
+        on_hedge(delay)
+    second = asyncio.ensure_future(alternate(*args, **kwargs))
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                if task is second:
+                    policy.hedge_wins += 1
+                policy.record(method, time.perf_counter() - started)
+                return task.result()
+        # Оба запроса завершились ошибкой
+        return first.result()
+    finally:
+        for task in (first, second):
+            if not task.done():
+                task.cancel()
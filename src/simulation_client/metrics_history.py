@@ -0,0 +1,176 @@
+"""
+История метрик симуляции по шагам.
+
+Метрики доступны только для одного шага за вызов (get_*_metrics(step)).
+fetch_metrics_history запрашивает нужные шаги и виды метрик параллельно
+(не более max_concurrency запросов одновременно), использует result_cache
+клиента и собирает ответы в столбцы NumPy без конвертации в Pydantic модели.
+
+```python
+history = await client.fetch_metrics_history(
+    simulation_id, steps=range(1, 31), kinds=("factory", "quality")
+)
+plt.plot(history["step"], history["factory.profitability"])
+```
+
+Требуется numpy (extra "numpy").
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
+
+from google.protobuf.descriptor import FieldDescriptor
+
+from .exceptions import SimulationError, ValidationError
+from .proto import simulator_pb2
+from .utils import require_numpy
+
+if TYPE_CHECKING:
+    import numpy
+
+logger = logging.getLogger(__name__)
+
+# Вид метрик -> (метод stub, класс protobuf ответа)
+METRIC_KINDS: Dict[str, Tuple[str, type]] = {
+    "factory": ("get_factory_metrics", simulator_pb2.FactoryMetricsResponse),
+    "production": ("get_production_metrics", simulator_pb2.ProductionMetricsResponse),
+    "quality": ("get_quality_metrics", simulator_pb2.QualityMetricsResponse),
+    "engineering": (
+        "get_engineering_metrics",
+        simulator_pb2.EngineeringMetricsResponse,
+    ),
+    "commercial": ("get_commercial_metrics", simulator_pb2.CommercialMetricsResponse),
+    "procurement": (
+        "get_procurement_metrics",
+        simulator_pb2.ProcurementMetricsResponse,
+    ),
+}
+
+_NUMERIC_TYPES = {
+    FieldDescriptor.CPPTYPE_INT32,
+    FieldDescriptor.CPPTYPE_INT64,
+    FieldDescriptor.CPPTYPE_UINT32,
+    FieldDescriptor.CPPTYPE_UINT64,
+    FieldDescriptor.CPPTYPE_DOUBLE,
+    FieldDescriptor.CPPTYPE_FLOAT,
+    FieldDescriptor.CPPTYPE_BOOL,
+}
+
+
+def flatten_metrics(kind: str, metrics) -> Dict[str, float]:
+    """
+    Числовые значения protobuf сообщения метрик.
+
+    Скалярные числовые поля дают столбцы "<kind>.<field>", словари с
+    числовыми значениями (map<string, number>) - "<kind>.<field>.<key>".
+    Вложенные сообщения и списки пропускаются.
+
+    Args:
+        kind: Вид метрик (префикс имен)
+        metrics: Protobuf сообщение метрик (FactoryMetrics и т.д.)
+
+    Returns:
+        Dict[str, float]: Имя столбца -> значение
+    """
+    values: Dict[str, float] = {}
+    for field in metrics.DESCRIPTOR.fields:
+        value = getattr(metrics, field.name)
+        if field.message_type is not None and field.message_type.GetOptions().map_entry:
+            value_field = field.message_type.fields_by_name["value"]
+            if value_field.cpp_type in _NUMERIC_TYPES:
+                for key, item in value.items():
+                    values[f"{kind}.{field.name}.{key}"] = float(item)
+        elif not field.is_repeated and field.cpp_type in _NUMERIC_TYPES:
+            values[f"{kind}.{field.name}"] = float(value)
+    return values
+
+
+async def fetch_metrics_history(
+    client,
+    simulation_id: str,
+    steps: Iterable[int],
+    kinds: Sequence[str] = ("factory",),
+    max_concurrency: int = 8,
+) -> Dict[str, "numpy.ndarray"]:
+    """
+    Получить метрики нескольких шагов в виде временных рядов.
+
+    Args:
+        client: AsyncSimulationClient
+        simulation_id: ID симуляции
+        steps: Номера шагов
+        kinds: Виды метрик (ключи METRIC_KINDS)
+        max_concurrency: Максимум одновременных запросов
+
+    Returns:
+        Dict[str, numpy.ndarray]: Столбец "step" (int64) и столбцы метрик
+            (float64) в порядке шагов. Значение, которого нет в ответе
+            шага (например, ключа словаря), равно NaN.
+
+    Raises:
+        ValidationError: Неизвестный вид метрик
+        SimulationError: Часть запросов завершилась ошибкой; в details
+            перечислены failed ("<kind>@<step>" -> ошибка)
+    """
+    np = require_numpy()
+
+    unknown = [kind for kind in kinds if kind not in METRIC_KINDS]
+    if unknown:
+        raise ValidationError(
+            f"Unknown metric kinds: {unknown}. Expected one of {list(METRIC_KINDS)}"
+        )
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
+
+    steps = sorted(set(steps))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(kind: str, step: int):
+        method_name, response_type = METRIC_KINDS[kind]
+        async with semaphore:
+            async with client._timeout_context():
+                response = await client._fetch_step_result(
+                    f"{kind}_metrics",
+                    simulation_id,
+                    step,
+                    getattr(client.stub, method_name),
+                    simulator_pb2.GetMetricsRequest(
+                        simulation_id=simulation_id, step=step
+                    ),
+                    response_type,
+                )
+        return flatten_metrics(kind, response.metrics)
+
+    jobs = [(kind, step) for step in steps for kind in kinds]
+    outcomes = await asyncio.gather(
+        *(fetch(kind, step) for kind, step in jobs), return_exceptions=True
+    )
+
+    failed: Dict[str, str] = {}
+    rows: List[Dict[str, float]] = [{} for _ in steps]
+    index = {step: i for i, step in enumerate(steps)}
+    for (kind, step), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, BaseException):
+            failed[f"{kind}@{step}"] = str(outcome)
+        else:
+            rows[index[step]].update(outcome)
+
+    if failed:
+        raise SimulationError(
+            f"Failed to fetch {len(failed)} of {len(jobs)} metrics requests",
+            details={"failed": failed},
+        )
+
+    names = sorted({name for row in rows for name in row})
+    columns = {"step": np.asarray(steps, dtype=np.int64)}
+    for name in names:
+        columns[name] = np.fromiter(
+            (row.get(name, np.nan) for row in rows), dtype=np.float64, count=len(rows)
+        )
+
+    logger.debug(
+        f"Fetched metrics history of simulation {simulation_id}: "
+        f"{len(steps)} steps, {len(names)} columns"
+    )
+    return columns
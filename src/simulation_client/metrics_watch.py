@@ -0,0 +1,300 @@
+"""
+Подписка на метрики симуляции.
+
+Вместо того чтобы каждый потребитель опрашивал get_all_metrics, на каждую
+симуляцию (и шаг) запускается один общий опрос. Новый ответ сравнивается
+с предыдущим по сериализованным protobuf байтам (без timestamp), и
+подписчикам отправляются только изменившиеся метрики. Пока метрики не
+меняются, интервал опроса растет до max_interval; когда уходит последний
+подписчик, опрос останавливается. Временные ошибки (UNAVAILABLE,
+таймауты) не прерывают опрос: он повторяется с тем же удвоением
+интервала, и подписчики получают ошибку только после max_failures
+неудачных опросов подряд.
+
+```python
+async for metrics in client.watch_metrics(simulation_id, interval=1.0):
+    dashboard.update(metrics)
+```
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import grpc
+
+from .exceptions import ConnectionError, RetryableError, TimeoutError
+from .models import AllMetricsResponse
+from .proto import simulator_pb2
+
+logger = logging.getLogger(__name__)
+
+# (simulation_id, step); step None - текущий шаг симуляции
+PollerKey = Tuple[str, Optional[int]]
+
+_CLOSED = object()
+
+# Коды gRPC, после которых опрос продолжается
+_TRANSIENT_CODES = frozenset(
+    {
+        grpc.StatusCode.UNAVAILABLE,
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+        grpc.StatusCode.ABORTED,
+    }
+)
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Временная ли ошибка опроса (сеть, таймаут, перегрузка сервера)."""
+    if isinstance(error, grpc.RpcError) and callable(getattr(error, "code", None)):
+        return error.code() in _TRANSIENT_CODES
+    return isinstance(
+        error, (ConnectionError, TimeoutError, RetryableError, asyncio.TimeoutError)
+    )
+
+
+def metrics_fingerprint(response) -> bytes:
+    """Сериализованный AllMetricsResponse без timestamp."""
+    timestamp = response.timestamp
+    response.ClearField("timestamp")
+    try:
+        return response.SerializeToString(deterministic=True)
+    finally:
+        response.timestamp = timestamp
+
+
+class _MetricsPoller:
+    """Общий опрос метрик одной симуляции."""
+
+    def __init__(
+        self,
+        client,
+        simulation_id: str,
+        step: Optional[int],
+        max_interval: float,
+        max_failures: int = 5,
+    ):
+        self.client = client
+        self.simulation_id = simulation_id
+        self.step = step
+        self.max_interval = max_interval
+        self.max_failures = max_failures
+        # Очередь подписчика -> запрошенный им интервал
+        self.subscribers: Dict[asyncio.Queue, float] = {}
+        self.latest: Optional[AllMetricsResponse] = None
+        self.polls = 0
+        self.changes = 0
+        self._fingerprint: Optional[bytes] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def interval(self) -> float:
+        """Минимальный интервал среди подписчиков."""
+        return min(self.subscribers.values())
+
+    def subscribe(self, interval: float) -> asyncio.Queue:
+        """Добавить подписчика и запустить опрос, если он не запущен."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        faster = bool(self.subscribers) and interval < self.interval
+        self.subscribers[queue] = interval
+        if self.latest is not None:
+            queue.put_nowait(self.latest)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        elif faster:
+            # Новый подписчик запросил меньший интервал
+            self._wakeup.set()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> bool:
+        """
+        Удалить подписчика.
+
+        Returns:
+            bool: True, если подписчиков не осталось и опрос остановлен
+        """
+        self.subscribers.pop(queue, None)
+        if self.subscribers:
+            return False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        return True
+
+    async def close(self) -> None:
+        """Остановить опрос и завершить итераторы подписчиков."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._publish(_CLOSED)
+
+    def _publish(self, item) -> None:
+        """Отправить элемент подписчикам (в очереди остается только последний)."""
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(item)
+
+    async def _poll(self):
+        """Один запрос get_all_metrics (protobuf ответ)."""
+        step = self.step
+        if step is None:
+            # В AllMetricsResponse нет шага, а step=0 сервер не принимает.
+            # Шаг берется из зеркала состояния, если оно не старше интервала
+            # опроса (его обновляет любой ответ с симуляцией, например
+            # run_simulation этого процесса); иначе - get_simulation. Более
+            # старый шаг мог уже завершиться: его метрики отдал бы
+            # ResultCache, и новые шаги были бы не видны
+            simulation = await self.client.get_current_simulation(
+                self.simulation_id, max_age=self.interval
+            )
+            step = simulation.step
+        async with self.client._timeout_context():
+            return await self.client._fetch_step_result(
+                "all_metrics",
+                self.simulation_id,
+                step,
+                self.client.stub.get_all_metrics,
+                simulator_pb2.GetAllMetricsRequest(
+                    simulation_id=self.simulation_id, step=step
+                ),
+                simulator_pb2.AllMetricsResponse,
+            )
+
+    async def _run(self) -> None:
+        delay = None
+        failures = 0
+        while self.subscribers:
+            # Сбрасывается до опроса: подписчик, пришедший во время опроса,
+            # не ждет полного интервала
+            self._wakeup.clear()
+            try:
+                raw = await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                if not _is_transient_error(e) or failures >= self.max_failures:
+                    logger.error(
+                        f"Metrics watch of simulation {self.simulation_id} "
+                        f"failed: {e}"
+                    )
+                    self._task = None
+                    self._publish(e)
+                    return
+                logger.warning(
+                    f"Metrics poll of simulation {self.simulation_id} failed "
+                    f"({failures}/{self.max_failures}), retrying: {e}"
+                )
+                delay = min((delay or self.interval) * 2, self.max_interval)
+            else:
+                failures = 0
+                self.polls += 1
+                fingerprint = metrics_fingerprint(raw)
+                if fingerprint != self._fingerprint:
+                    self._fingerprint = fingerprint
+                    self.latest = self.client._proto_to_all_metrics_response(raw)
+                    self.changes += 1
+                    self._publish(self.latest)
+                    delay = self.interval
+                else:
+                    # Метрики не изменились - опрашиваем реже
+                    delay = min((delay or self.interval) * 2, self.max_interval)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                delay = self.interval
+            except asyncio.TimeoutError:
+                pass
+
+
+class MetricsWatcher:
+    """
+    Реестр общих опросов метрик клиента.
+
+    На каждую пару (simulation_id, step) работает не более одного опроса,
+    независимо от числа подписчиков.
+    """
+
+    def __init__(self, client, max_interval: float = 30.0, max_failures: int = 5):
+        """
+        Args:
+            client: AsyncSimulationClient
+            max_interval: Максимальный интервал опроса при неизменных метриках
+            max_failures: Число временных ошибок опроса подряд, после
+                которого ошибка передается подписчикам
+        """
+        self.client = client
+        self.max_interval = max_interval
+        self.max_failures = max_failures
+        self._pollers: Dict[PollerKey, _MetricsPoller] = {}
+
+    def __len__(self) -> int:
+        return len(self._pollers)
+
+    async def watch(
+        self,
+        simulation_id: str,
+        interval: float = 1.0,
+        step: Optional[int] = None,
+    ) -> AsyncIterator[AllMetricsResponse]:
+        """
+        Подписаться на изменения метрик.
+
+        Args:
+            simulation_id: ID симуляции
+            interval: Интервал опроса, пока метрики меняются
+            step: Шаг (None - текущий шаг симуляции)
+
+        Yields:
+            AllMetricsResponse: Метрики при каждом изменении; первым
+                приходит последнее известное значение, если оно есть
+        """
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+
+        key = (simulation_id, step)
+        poller = self._pollers.get(key)
+        if poller is None:
+            poller = _MetricsPoller(
+                self.client,
+                simulation_id,
+                step,
+                max(self.max_interval, interval),
+                self.max_failures,
+            )
+            self._pollers[key] = poller
+        queue = poller.subscribe(interval)
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is _CLOSED:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if poller.unsubscribe(queue) and self._pollers.get(key) is poller:
+                del self._pollers[key]
+
+    async def close(self) -> None:
+        """Остановить все опросы."""
+        pollers = list(self._pollers.values())
+        self._pollers.clear()
+        for poller in pollers:
+            await poller.close()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Число опросов, подписчиков, запросов и изменений."""
+        pollers = list(self._pollers.values())
+        return {
+            "pollers": len(pollers),
+            "subscribers": sum(len(p.subscribers) for p in pollers),
+            "polls": sum(p.polls for p in pollers),
+            "changes": sum(p.changes for p in pollers),
+        }
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field, validator, ConfigDict
-from typing import Optional, List, Dict, Any, Union
+from pydantic import BaseModel as _PydanticBaseModel, Field, validator, ConfigDict
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Union
 from enum import Enum
 from datetime import datetime
 import uuid
 
+if TYPE_CHECKING:
+    import numpy
+
+
+class BaseModel(_PydanticBaseModel):
+    """
+    Базовая модель пакета.
+
+    Схема Pydantic строится при первом использовании модели (``defer_build``),
+    а не при импорте модуля: так импорт ~150 моделей стоит дешево, а
+    forward-ссылки разрешаются один раз, когда модуль уже полностью загружен.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
 
 # ==================== ENUMS ====================
 
@@ -1769,6 +1784,12 @@ class WarehouseMetrics(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    def to_numpy(self) -> Dict[str, Any]:
+        """Ряды load_over_time и max_capacity_over_time как numpy массивы."""
+        from .arrays import warehouse_series
+
+        return warehouse_series(self)
+
 
 class ProductionMetrics(BaseModel):
     """Метрики производства - точное соответствие protobuf ProductionMetrics."""
@@ -1781,6 +1802,12 @@ class ProductionMetrics(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    def to_numpy(self) -> numpy.ndarray:
+        """monthly_productivity как структурированный numpy массив."""
+        from .arrays import monthly_productivity_array
+
+        return monthly_productivity_array(self)
+
 
 class DefectCause(BaseModel):
     """Причина брака - точное соответствие protobuf."""
@@ -1966,6 +1993,12 @@ class WarehouseLoadChart(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    def to_numpy(self) -> numpy.ndarray:
+        """Точки графика как структурированный numpy массив."""
+        from .arrays import load_chart_array
+
+        return load_chart_array(self)
+
 
 class TimingData(BaseModel):
     """Данные по времени - точное соответствие protobuf."""
@@ -1986,6 +2019,12 @@ class OperationTimingChart(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    def to_numpy(self) -> numpy.ndarray:
+        """timing_data как структурированный numpy массив."""
+        from .arrays import timing_chart_array
+
+        return timing_chart_array(self)
+
 
 class DowntimeData(BaseModel):
     """Данные простоя - точное соответствие protobuf."""
@@ -2005,6 +2044,12 @@ class DowntimeChart(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    def to_numpy(self) -> numpy.ndarray:
+        """downtime_data как структурированный numpy массив."""
+        from .arrays import downtime_chart_array
+
+        return downtime_chart_array(self)
+
 
 class ModelPoint(BaseModel):
     """Точка модели - точное соответствие protobuf."""
@@ -2592,6 +2637,31 @@ ConsumerList = List[Consumer]
 WorkplaceList = List[Workplace]
 
 
+# ==================== BUILD ====================
+
+
+def build_models() -> int:
+    """
+    Построить схемы всех моделей заранее.
+
+    Используется режимом прогрева клиента ("eager"), чтобы первый запрос
+    не платил за отложенное построение схем Pydantic.
+
+    Returns:
+        int: Количество построенных моделей
+    """
+    built = 0
+    for value in list(globals().values()):
+        if (
+            isinstance(value, type)
+            and issubclass(value, BaseModel)
+            and not value.__pydantic_complete__
+        ):
+            value.model_rebuild()
+            built += 1
+    return built
+
+
 # ==================== EXPORTS ====================
 
 __all__ = [
@@ -0,0 +1,516 @@
+"""
+Параллельный подбор конфигурации методом последовательного деления.
+
+Прогонять каждую конфигурацию до конца дорого: большая часть бюджета
+уходит на заведомо слабые варианты. SuccessiveHalvingOptimizer оценивает
+все кандидаты малым числом прогонов (min_replications), оставляет лучшую
+1/eta часть, увеличивает число прогонов в eta раз и повторяет, пока не
+останется один кандидат или не будет достигнут max_replications.
+
+Кандидат - конфигурация run_complete_scenario (logist_id, supplier_ids,
+backup_supplier_ids, tender_ids, dealing_with_defects,
+production_improvements, sales_strategy, ...); стратегии распределения
+в API настройки нет, поэтому в пространство поиска она не входит. Оценки кэшируются по
+каноническому хэшу конфигурации и сохраняются в checkpoint: повторный
+запуск с тем же файлом продолжает с места остановки без повторных
+прогонов.
+
+```python
+candidates = grid({
+    "supplier_ids": [["s1", "s2"], ["s1", "s3"]],
+    "sales_strategy": ["low_price", "premium"],
+})
+optimizer = client.optimizer(candidates, checkpoint="search.json")
+best = await optimizer.run()
+optimizer.export_leaderboard("leaderboard.csv")
+```
+"""
+
+import asyncio
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from .exceptions import ValidationError
+from .models import BaseModel
+from .priority import BATCH, call_priority
+from .replications import MINIMIZED_METRICS, REPLICATION_METRICS, RunningStats
+
+if TYPE_CHECKING:
+    from .surrogate import SurrogateScreen
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+# Ключи конфигурации, значения которых - множества (порядок не важен)
+_SET_KEYS = frozenset(
+    {"supplier_ids", "backup_supplier_ids", "tender_ids", "production_improvements"}
+)
+
+
+def canonical_config(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """Конфигурация без пустых значений и с отсортированными множествами."""
+    canonical = {}
+    for key in sorted(config):
+        value = config[key]
+        if value is None or value == [] or value == {}:
+            continue
+        if key in _SET_KEYS:
+            value = sorted(set(value))
+        canonical[key] = value
+    return canonical
+
+
+def config_hash(config: Mapping[str, Any]) -> str:
+    """Канонический хэш конфигурации (sha256 от JSON с сортировкой ключей)."""
+    payload = json.dumps(
+        canonical_config(config), sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def grid(space: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Все сочетания вариантов пространства поиска.
+
+    Args:
+        space: Ключ конфигурации -> список вариантов значения
+
+    Returns:
+        List[Dict]: Конфигурации в порядке декартова произведения
+    """
+    keys = list(space)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(space[key] for key in keys))
+    ]
+
+
+class CandidateScore(BaseModel):
+    """Строка таблицы лидеров."""
+
+    config_hash: str
+    config: Dict[str, Any]
+    replications: int
+    failures: int = 0
+    mean: float
+    std: float
+    half_width: float
+    # Последний раунд, в котором кандидат оценивался
+    rung: int
+    # True - отсеян суррогатной моделью без прогонов
+    screened: bool = False
+    # Предсказание суррогатной модели
+    predicted: Optional[float] = None
+
+
+class _Evaluation:
+    """Накопленные прогоны одной конфигурации."""
+
+    def __init__(self, config: Dict[str, Any], values=(), failures: int = 0):
+        self.config = config
+        self.values: List[float] = list(values)
+        self.failures = failures
+        self.rung = 0
+        self.screened = False
+        self.predicted: Optional[float] = None
+        # Число результатов, до которого кандидат уже доводился
+        self.budget = 0
+        # Результаты из checkpoint: всего и уже учтенные в replications_cached
+        self.restored = 0
+        self.reused = 0
+
+    def stats(self) -> RunningStats:
+        stats = RunningStats()
+        for value in self.values:
+            stats.add(value)
+        return stats
+
+    @property
+    def mean(self) -> float:
+        """Среднее значение метрики (NaN без успешных прогонов)."""
+        return sum(self.values) / len(self.values) if self.values else math.nan
+
+
+class SuccessiveHalvingOptimizer:
+    """
+    Подбор конфигурации с лучшим значением метрики (по умолчанию
+    SimulationResults.profitability).
+
+    Метрики из MINIMIZED_METRICS (defect_rate) минимизируются, остальные
+    максимизируются. Прогоны выполняются параллельно (не более
+    max_concurrency) с классом приоритета "batch". Ошибки прогонов
+    учитываются у кандидата; кандидат без успешных прогонов занимает
+    последнее место.
+    """
+
+    def __init__(
+        self,
+        client,
+        candidates: Iterable[Mapping[str, Any]],
+        metric: str = "profitability",
+        min_replications: int = 1,
+        max_replications: int = 27,
+        eta: int = 3,
+        max_concurrency: int = 8,
+        checkpoint: Optional[Union[str, Path]] = None,
+        confidence: float = 0.95,
+        surrogate: Optional["SurrogateScreen"] = None,
+        checkpoint_interval: float = 1.0,
+    ):
+        """
+        Args:
+            client: AsyncUnifiedClient
+            candidates: Конфигурации run_complete_scenario
+            metric: Метрика (ключ REPLICATION_METRICS); направление
+                оптимизации - по MINIMIZED_METRICS
+            min_replications: Прогонов на кандидата в первом раунде
+            max_replications: Максимум прогонов на кандидата
+            eta: Во сколько раз сокращается число кандидатов за раунд
+            max_concurrency: Максимум одновременных прогонов
+            checkpoint: JSON файл для сохранения и продолжения поиска
+            confidence: Уровень доверия интервала в таблице лидеров
+            surrogate: Отсев кандидатов перед первым раундом
+            checkpoint_interval: Минимальный интервал (секунды) между
+                сохранениями checkpoint после отдельных прогонов; в конце
+                раунда checkpoint сохраняется всегда
+
+        Raises:
+            ValidationError: Неизвестная метрика, нет кандидатов или
+                некорректные параметры раундов
+        """
+        if metric not in REPLICATION_METRICS:
+            raise ValidationError(
+                f"Unknown metric {metric!r}, expected {list(REPLICATION_METRICS)}"
+            )
+        if eta < 2:
+            raise ValidationError("eta must be >= 2")
+        if not 1 <= min_replications <= max_replications:
+            raise ValidationError("Expected 1 <= min_replications <= max_replications")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+
+        self.client = client
+        self.metric = metric
+        self.maximize = metric not in MINIMIZED_METRICS
+        self._sign = 1.0 if self.maximize else -1.0
+        self.min_replications = min_replications
+        self.max_replications = max_replications
+        self.eta = eta
+        self.max_concurrency = max_concurrency
+        self.checkpoint = Path(checkpoint) if checkpoint is not None else None
+        self.confidence = confidence
+        self.surrogate = surrogate
+        self.checkpoint_interval = checkpoint_interval
+        self._checkpoint_saved = -math.inf
+
+        # Хэш -> оценка; одинаковые конфигурации оцениваются один раз
+        self._evaluations: Dict[str, _Evaluation] = {}
+        self.candidates: List[str] = []
+        # Хэш -> число повторов конфигурации среди кандидатов
+        self._duplicates: Dict[str, int] = {}
+        for config in candidates:
+            key = config_hash(config)
+            if key in self._evaluations:
+                self._duplicates[key] = self._duplicates.get(key, 0) + 1
+                continue
+            self._evaluations[key] = _Evaluation(canonical_config(config))
+            self.candidates.append(key)
+        if not self.candidates:
+            raise ValidationError("No candidates to evaluate")
+
+        self.replications_run = 0
+        self.replications_cached = 0
+        if self.checkpoint is not None and self.checkpoint.exists():
+            self._load_checkpoint()
+
+    # ==================== Раунды ====================
+
+    def rungs(self) -> List[int]:
+        """Число прогонов на кандидата в каждом раунде."""
+        budgets = []
+        budget = self.min_replications
+        while budget < self.max_replications:
+            budgets.append(budget)
+            budget *= self.eta
+        budgets.append(self.max_replications)
+        return budgets
+
+    async def run(self) -> CandidateScore:
+        """
+        Выполнить поиск.
+
+        Returns:
+            CandidateScore: Лучший кандидат
+        """
+        survivors = list(self.candidates)
+        audited: Dict[str, float] = {}
+        if self.surrogate is not None:
+            survivors, audited = self._screen(survivors)
+
+        for rung, budget in enumerate(self.rungs()):
+            await self._evaluate(survivors, budget, rung)
+            self._save_checkpoint()
+            if self.surrogate is not None:
+                self._observe(audited if rung == 0 else {})
+            logger.info(
+                f"Rung {rung}: {len(survivors)} candidates x {budget} replications, "
+                f"best {self._evaluations[survivors[0]].mean:.4f}"
+            )
+            if len(survivors) == 1:
+                break
+            survivors = survivors[: max(1, len(survivors) // self.eta)]
+
+        return self.leaderboard()[0]
+
+    def _score(self, evaluation: _Evaluation) -> float:
+        """Оценка для ранжирования: больше - лучше (-inf без успешных прогонов)."""
+        if not evaluation.values:
+            return -math.inf
+        return self._sign * evaluation.mean
+
+    async def _evaluate(self, keys: List[str], budget: int, rung: int) -> None:
+        """Довести число прогонов кандидатов до budget и отсортировать их."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def replicate(key: str) -> None:
+            evaluation = self._evaluations[key]
+            async with semaphore:
+                self.replications_run += 1
+                try:
+                    with call_priority(BATCH):
+                        response = await self.client.run_complete_scenario(
+                            dict(evaluation.config)
+                        )
+                    results = response.simulations.results[-1]
+                except Exception as e:
+                    evaluation.failures += 1
+                    logger.warning(f"Replication of candidate {key} failed: {e}")
+                    self._save_checkpoint(throttle=True)
+                    return
+            value = REPLICATION_METRICS[self.metric](results)
+            if math.isnan(value):
+                evaluation.failures += 1
+            else:
+                evaluation.values.append(value)
+            self._save_checkpoint(throttle=True)
+
+        tasks = []
+        for key in keys:
+            evaluation = self._evaluations[key]
+            evaluation.rung = rung
+            # Результаты из checkpoint и общие для повторяющихся
+            # конфигураций - прогоны, которые не пришлось выполнять
+            reused = min(evaluation.restored, budget)
+            self.replications_cached += reused - evaluation.reused
+            evaluation.reused = reused
+            self.replications_cached += self._duplicates.get(key, 0) * max(
+                budget - evaluation.budget, 0
+            )
+            evaluation.budget = max(evaluation.budget, budget)
+
+            done = len(evaluation.values) + evaluation.failures
+            tasks.extend(replicate(key) for _ in range(budget - done))
+        await asyncio.gather(*tasks)
+
+        keys.sort(key=lambda key: self._score(self._evaluations[key]), reverse=True)
+
+    # ==================== Суррогатный отсев ====================
+
+    def _screen(self, keys: List[str]):
+        """
+        Отсеять неоцененных кандидатов суррогатной моделью.
+
+        Returns:
+            Tuple[List[str], Dict[str, float]]: Оставшиеся кандидаты и
+                предсказания для прогоняемых ради аудита
+        """
+        self._observe({})
+        fresh = [
+            key
+            for key in keys
+            if not self._evaluations[key].values
+            and not self._evaluations[key].failures
+        ]
+        # Модель работает с оценками "больше - лучше" (см. _score)
+        best = max(
+            [self.surrogate.best]
+            + [self._score(self._evaluations[key]) for key in self.candidates]
+        )
+        decisions = self.surrogate.screen(
+            [self._evaluations[key].config for key in fresh], best=best
+        )
+
+        skipped = set()
+        audited = {}
+        for key, decision in zip(fresh, decisions):
+            if decision is None:
+                continue
+            evaluation = self._evaluations[key]
+            evaluation.predicted = self._sign * decision.predicted
+            if decision.skip:
+                skipped.add(key)
+            elif decision.audit:
+                audited[key] = decision.predicted
+
+        if skipped and len(skipped) == len(keys):
+            # Хотя бы один кандидат должен быть прогнан
+            skipped.remove(
+                max(keys, key=lambda key: self._sign * self._evaluations[key].predicted)
+            )
+        for key in skipped:
+            self._evaluations[key].screened = True
+        self.surrogate.record_saved(len(skipped) * self.min_replications)
+        if skipped:
+            logger.info(f"Surrogate skipped {len(skipped)} of {len(keys)} candidates")
+        return [key for key in keys if key not in skipped], audited
+
+    def _observe(self, audited: Dict[str, float]) -> None:
+        """Передать оценки суррогатной модели и учесть ошибки аудита."""
+        for key, evaluation in self._evaluations.items():
+            if evaluation.values:
+                self.surrogate.observe(evaluation.config, self._score(evaluation))
+        for key, predicted in audited.items():
+            evaluation = self._evaluations[key]
+            if evaluation.values:
+                self.surrogate.record_audit(predicted, self._score(evaluation))
+
+    # ==================== Таблица лидеров ====================
+
+    def leaderboard(self) -> List[CandidateScore]:
+        """Оцененные кандидаты от лучшего к худшему."""
+        rows = []
+        for key in self.candidates:
+            evaluation = self._evaluations[key]
+            stats = evaluation.stats()
+            rows.append(
+                CandidateScore(
+                    config_hash=key,
+                    config=evaluation.config,
+                    replications=len(evaluation.values),
+                    failures=evaluation.failures,
+                    # Без успешных прогонов - худшее значение в направлении
+                    mean=self._sign * self._score(evaluation),
+                    std=stats.std,
+                    half_width=stats.half_width(self.confidence),
+                    rung=evaluation.rung,
+                    screened=evaluation.screened,
+                    predicted=evaluation.predicted,
+                )
+            )
+        rows.sort(
+            key=lambda row: (self._sign * row.mean, row.replications), reverse=True
+        )
+        return rows
+
+    def export_leaderboard(self, path: Union[str, Path]) -> Path:
+        """
+        Сохранить таблицу лидеров в .csv или .json.
+
+        Args:
+            path: Путь к файлу; формат определяется расширением
+
+        Returns:
+            Path: Путь к файлу
+        """
+        path = Path(path)
+        rows = [row.model_dump() for row in self.leaderboard()]
+        if path.suffix == ".json":
+            path.write_text(json.dumps(rows, ensure_ascii=False, indent=2, default=str))
+            return path
+
+        with path.open("w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=list(CandidateScore.model_fields))
+            writer.writeheader()
+            for row in rows:
+                row["config"] = json.dumps(row["config"], ensure_ascii=False)
+                writer.writerow(row)
+        return path
+
+    # ==================== Checkpoint ====================
+
+    def _save_checkpoint(self, throttle: bool = False) -> None:
+        """
+        Атомарно записать оценки в checkpoint.
+
+        Args:
+            throttle: Не записывать, если с прошлой записи прошло меньше
+                checkpoint_interval
+        """
+        if self.checkpoint is None:
+            return
+        now = time.monotonic()
+        if throttle and now - self._checkpoint_saved < self.checkpoint_interval:
+            return
+        self._checkpoint_saved = now
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "metric": self.metric,
+            "evaluations": {
+                key: {
+                    "config": evaluation.config,
+                    "values": evaluation.values,
+                    "failures": evaluation.failures,
+                }
+                for key, evaluation in self._evaluations.items()
+            },
+        }
+        temporary = self.checkpoint.with_name(self.checkpoint.name + ".tmp")
+        temporary.write_text(json.dumps(state, ensure_ascii=False, default=str))
+        os.replace(temporary, self.checkpoint)
+
+    def _load_checkpoint(self) -> None:
+        """Загрузить оценки из checkpoint (только совпадающие метрика и версия)."""
+        state = json.loads(self.checkpoint.read_text())
+        if (
+            state.get("version") != CHECKPOINT_VERSION
+            or state.get("metric") != self.metric
+        ):
+            logger.warning(
+                f"Ignoring checkpoint {self.checkpoint}: version or metric mismatch"
+            )
+            return
+        for key, saved in state["evaluations"].items():
+            evaluation = self._evaluations.get(key)
+            if evaluation is None:
+                # Кандидат из прошлого поиска: остается в кэше
+                self._evaluations[key] = _Evaluation(
+                    saved["config"], saved["values"], saved["failures"]
+                )
+                continue
+            evaluation.values = list(saved["values"])
+            evaluation.failures = saved["failures"]
+            evaluation.restored = len(evaluation.values) + evaluation.failures
+        logger.info(f"Loaded {len(state['evaluations'])} evaluations from checkpoint")
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Выполненные и невыполненные благодаря кэшу прогоны.
+
+        replications_cached - результаты из checkpoint, использованные
+        в раундах, и прогоны, общие для повторяющихся конфигураций.
+        """
+        return {
+            "candidates": len(self.candidates),
+            "replications_run": self.replications_run,
+            "replications_cached": self.replications_cached,
+        }
@@ -0,0 +1,211 @@
+"""
+Пул заранее созданных симуляций.
+
+create_simulation стоит на критическом пути каждого сценария
+(run_complete_scenario, create_and_configure_simulation), и под нагрузкой
+его задержка заметна. SimulationPool держит size готовых симуляций,
+пополняет их в фоне не быстрее refill_rate созданий в секунду и выдает
+сразу. Если пул пуст, симуляция создается на месте (холодное создание).
+
+```python
+async with AsyncUnifiedClient() as client:
+    pool = client.simulation_pool(size=8, refill_rate=4.0)
+    await pool.start()
+    config = await client.create_simulation()  # из пула
+    print(pool.stats)
+```
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from .models import BaseModel, SimulationConfig
+from .priority import BATCH, call_priority
+from .utils import AsyncRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationLease(BaseModel):
+    """Выданная симуляция."""
+
+    simulation_id: str
+    config: SimulationConfig
+    # True - из пула, False - холодное создание
+    from_pool: bool
+    # Время ожидания выдачи (секунды)
+    wait: float
+    leased_at: float
+
+
+class SimulationPool:
+    """
+    Пул готовых симуляций одного клиента.
+
+    Пополнение выполняет одна фоновая задача: по одному create_simulation
+    с классом приоритета "batch" (см. PriorityScheduler), чтобы не
+    конкурировать с интерактивными вызовами. Ошибки пополнения логируются,
+    пополнение продолжается после паузы.
+    """
+
+    def __init__(
+        self,
+        client,
+        size: int = 4,
+        refill_rate: float = 2.0,
+        history: int = 1024,
+    ):
+        """
+        Args:
+            client: AsyncSimulationClient
+            size: Сколько готовых симуляций держать
+            refill_rate: Максимум созданий в секунду при пополнении
+            history: Сколько последних выдач хранить в leases
+        """
+        self.client = client
+        # Готовые симуляции в порядке создания
+        self._ready: Deque[SimulationConfig] = deque()
+        self._refill_needed = asyncio.Event()
+        self._refill_task: Optional[asyncio.Task] = None
+        self.leases: Deque[SimulationLease] = deque(maxlen=history)
+        self.hits = 0
+        self.cold_creates = 0
+        self.created = 0
+        self.refill_failures = 0
+        self.configure(size, refill_rate)
+
+    def configure(self, size: int, refill_rate: float) -> None:
+        """
+        Изменить размер пула и скорость пополнения.
+
+        Работающее пополнение подхватывает новые значения; лишние готовые
+        симуляции остаются в пуле до выдачи.
+
+        Args:
+            size: Сколько готовых симуляций держать
+            refill_rate: Максимум созданий в секунду при пополнении
+        """
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        if refill_rate <= 0:
+            raise ValueError("refill_rate must be > 0")
+        self.size = size
+        self.refill_rate = refill_rate
+        if self.running:
+            self._refill_needed.set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def running(self) -> bool:
+        """Идет ли фоновое пополнение."""
+        return self._refill_task is not None and not self._refill_task.done()
+
+    async def start(self, wait: bool = False) -> None:
+        """
+        Запустить фоновое пополнение.
+
+        Args:
+            wait: Дождаться заполнения пула
+        """
+        if not self.running:
+            self._refill_task = asyncio.ensure_future(self._refill())
+            self._refill_needed.set()
+        if wait:
+            while len(self._ready) < self.size and self.running:
+                await asyncio.sleep(1.0 / self.refill_rate)
+
+    async def close(self) -> None:
+        """
+        Остановить пополнение.
+
+        Невыданные симуляции остаются на сервере (удаления симуляций
+        в API нет) и больше не выдаются.
+        """
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+        if self._ready:
+            logger.info(f"Simulation pool closed with {len(self._ready)} unused")
+        self._ready.clear()
+
+    async def acquire(self) -> SimulationLease:
+        """
+        Выдать симуляцию: готовую из пула или созданную на месте.
+
+        Returns:
+            SimulationLease: Выданная симуляция
+        """
+        start = time.perf_counter()
+        if self._ready:
+            config = self._ready.popleft()
+            from_pool = True
+            self.hits += 1
+        else:
+            config = await self.client.create_simulation()
+            from_pool = False
+            self.cold_creates += 1
+        self._refill_needed.set()
+
+        lease = SimulationLease(
+            simulation_id=config.simulation_id,
+            config=config,
+            from_pool=from_pool,
+            wait=time.perf_counter() - start,
+            leased_at=time.time(),
+        )
+        self.leases.append(lease)
+        self.client._emit(
+            "simulation_lease",
+            simulation_id=lease.simulation_id,
+            from_pool=from_pool,
+            wait=lease.wait,
+        )
+        return lease
+
+    async def _refill(self) -> None:
+        limiter = AsyncRateLimiter(self.refill_rate, 1.0)
+        while True:
+            await self._refill_needed.wait()
+            if len(self._ready) >= self.size:
+                self._refill_needed.clear()
+                continue
+
+            if limiter.rate != self.refill_rate:
+                limiter = AsyncRateLimiter(self.refill_rate, 1.0)
+            await limiter.wait()
+            try:
+                with call_priority(BATCH):
+                    config = await self.client.create_simulation()
+            except Exception as e:
+                self.refill_failures += 1
+                logger.warning(f"Simulation pool refill failed: {e}")
+                await asyncio.sleep(1.0 / self.refill_rate)
+                continue
+            self._ready.append(config)
+            self.created += 1
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Выдачи из пула, холодные создания, созданные в фоне и готовые."""
+        leased = self.hits + self.cold_creates
+        return {
+            "ready": len(self._ready),
+            "hits": self.hits,
+            "cold_creates": self.cold_creates,
+            "hit_rate": self.hits / leased if leased else 0.0,
+            "created": self.created,
+            "refill_failures": self.refill_failures,
+        }
@@ -0,0 +1,231 @@
+"""
+Классы приоритета запросов: интерактивные и фоновые.
+
+Когда один клиент обслуживает и интерфейс, и фоновые прогоны, сотни
+фоновых run_simulation занимают лимитер и канал, а get_simulation из
+интерфейса ждет за ними. PriorityScheduler ставит вызовы в отдельные
+очереди по классам и выпускает их к лимитеру и каналу по весам:
+
+- пока ждут обе очереди, интерактивные вызовы выходят чаще (weights);
+- фоновые вызовы занимают не больше batch_share от max_in_flight
+  одновременных RPC, остальные слоты всегда свободны для интерактивных;
+- токен лимитера клиента берется в порядке выпуска из очередей.
+
+Класс вызова задается контекстной переменной (для текущей задачи и всех
+вызовов внутри блока):
+
+```python
+client = AsyncUnifiedClient(priority_scheduler=PriorityScheduler(max_in_flight=32))
+
+with call_priority("batch"):
+    await client.run_simulation(simulation_id)
+```
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Deque, Dict, Mapping, Optional, Tuple
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Класс приоритета, заданный для текущей задачи через call_priority()
+_call_priority: ContextVar[Optional[str]] = ContextVar(
+    "simulation_client_call_priority", default=None
+)
+
+
+def _check_priority(priority: str) -> str:
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r}, expected one of {PRIORITIES}")
+    return priority
+
+
+@contextmanager
+def call_priority(priority: str):
+    """
+    Задать класс приоритета для вызовов внутри блока.
+
+    Args:
+        priority: "interactive" или "batch"
+    """
+    token = _call_priority.set(_check_priority(priority))
+    try:
+        yield
+    finally:
+        _call_priority.reset(token)
+
+
+class PriorityScheduler:
+    """
+    Очереди вызовов по классам приоритета перед лимитером и каналом.
+
+    Один планировщик можно передать нескольким клиентам (например, обоим
+    клиентам AsyncUnifiedClient с общим каналом): ограничения действуют
+    на все их вызовы вместе. Очереди разбирает фоновая задача, которая
+    завершается, когда очереди пусты.
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Mapping[str, float]] = None,
+        max_in_flight: int = 64,
+        batch_share: float = 0.75,
+        default_priority: str = INTERACTIVE,
+    ):
+        """
+        Args:
+            weights: Доли выпуска из очередей, пока ждут обе
+                (по умолчанию interactive 4 : batch 1)
+            max_in_flight: Максимум одновременных RPC
+            batch_share: Доля max_in_flight, которую могут занять
+                фоновые вызовы
+            default_priority: Класс вызовов без call_priority()
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if not 0 < batch_share <= 1:
+            raise ValueError("batch_share must be in (0, 1]")
+        weights = dict(weights or {INTERACTIVE: 4.0, BATCH: 1.0})
+        for priority, weight in weights.items():
+            _check_priority(priority)
+            if weight <= 0:
+                raise ValueError("weights must be > 0")
+        self.weights = {priority: weights.get(priority, 1.0) for priority in PRIORITIES}
+        self.max_in_flight = max_in_flight
+        self.batch_share = batch_share
+        self.batch_limit = max(1, int(max_in_flight * batch_share))
+        self.default_priority = _check_priority(default_priority)
+
+        self._queues: Dict[str, Deque[Tuple[asyncio.Future, Optional[Callable]]]] = {
+            priority: deque() for priority in PRIORITIES
+        }
+        self._in_flight = {priority: 0 for priority in PRIORITIES}
+        # Текущие веса плавного взвешенного round-robin
+        self._current = {priority: 0.0 for priority in PRIORITIES}
+        self._changed = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._dispatched = {priority: 0 for priority in PRIORITIES}
+        self._wait_total = {priority: 0.0 for priority in PRIORITIES}
+        self._wait_max = {priority: 0.0 for priority in PRIORITIES}
+
+    def resolve(self, priority: Optional[str] = None) -> str:
+        """Класс вызова: явный, из call_priority() или по умолчанию."""
+        if priority is None:
+            priority = _call_priority.get() or self.default_priority
+        return _check_priority(priority)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[str] = None,
+        before: Optional[Callable[[], Awaitable[None]]] = None,
+    ):
+        """
+        Занять слот для одного RPC.
+
+        Args:
+            priority: Класс вызова (по умолчанию - resolve())
+            before: Вызывается при выпуске из очереди до занятия слота
+                (например, ожидание токена лимитера клиента)
+        """
+        priority = self.resolve(priority)
+        waiter = asyncio.get_running_loop().create_future()
+        queued = time.perf_counter()
+        self._queues[priority].append((waiter, before))
+        self._wake()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(priority)
+            raise
+
+        waited = time.perf_counter() - queued
+        self._wait_total[priority] += waited
+        self._wait_max[priority] = max(self._wait_max[priority], waited)
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def _release(self, priority: str) -> None:
+        self._in_flight[priority] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Сообщить об изменении очередей или слотов, запустить разбор очередей."""
+        self._changed.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    def _has_slot(self, priority: str) -> bool:
+        if sum(self._in_flight.values()) >= self.max_in_flight:
+            return False
+        return priority != BATCH or self._in_flight[BATCH] < self.batch_limit
+
+    def _next_priority(self) -> Optional[str]:
+        """Выбрать очередь плавным взвешенным round-robin среди готовых."""
+        ready = [
+            priority
+            for priority in PRIORITIES
+            if self._queues[priority] and self._has_slot(priority)
+        ]
+        if not ready:
+            return None
+        for priority in ready:
+            self._current[priority] += self.weights[priority]
+        chosen = max(ready, key=self._current.__getitem__)
+        self._current[chosen] -= sum(self.weights[priority] for priority in ready)
+        return chosen
+
+    async def _dispatch(self) -> None:
+        while True:
+            for queue in self._queues.values():
+                while queue and queue[0][0].done():
+                    queue.popleft()  # Отмененные ожидающие
+            if not any(self._queues.values()):
+                return
+
+            priority = self._next_priority()
+            if priority is None:
+                # Слотов для ожидающих нет: ждем освобождения или новых вызовов
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+
+            waiter, before = self._queues[priority].popleft()
+            if waiter.done():
+                continue
+            if before is not None:
+                try:
+                    await before()
+                except Exception as e:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                    continue
+                if waiter.done():
+                    continue
+            self._in_flight[priority] += 1
+            self._dispatched[priority] += 1
+            waiter.set_result(None)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """По классам: ожидающие, выполняемые, выпущенные и время ожидания."""
+        return {
+            priority: {
+                "queued": sum(
+                    1 for waiter, _ in self._queues[priority] if not waiter.done()
+                ),
+                "in_flight": self._in_flight[priority],
+                "dispatched": self._dispatched[priority],
+                "wait_total": self._wait_total[priority],
+                "wait_max": self._wait_max[priority],
+            }
+            for priority in PRIORITIES
+        }
@@ -0,0 +1,630 @@
+"""
+Индексированный граф процесса и его локальное редактирование.
+
+IndexedProcessGraph строится из ProcessGraph и дает поиск рабочих мест
+по ID и клетке сетки, смежность, топологический порядок, критический путь
+и поиск циклов без повторных проходов по спискам.
+
+Сервер принимает изменения графа только целиком (``update_process_graph``
+с полным ProcessGraph). ProcessGraphEditor загружает граф один раз,
+применяет правки к индексированной копии в памяти и отправляет один
+``update_process_graph`` при фиксации:
+
+```python
+async with client.edit_process_graph(simulation_id) as editor:
+    editor.configure_workplace("wp_1", is_start_node=True)
+    editor.add_route("wp_1", "wp_2", length=3)
+    editor.delete_route("wp_2", "wp_5")
+# здесь отправлен один update_process_graph
+```
+"""
+
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .exceptions import ValidationError
+from .models import ProcessGraph, Route, SimulationResponse, Workplace
+
+logger = logging.getLogger(__name__)
+
+# Источники исходного графа для ProcessGraphEditor
+GRAPH_SOURCES = ("workshop_plan", "parameters")
+
+# Размер сетки цеха (7x7 клеток)
+GRID_SIZE = 7
+
+RouteKey = Tuple[str, str]
+
+
+class IndexedProcessGraph:
+    """
+    Граф процесса с индексами для быстрых запросов.
+
+    - рабочие места: {workplace_id: Workplace}, маршруты:
+      {(from_workplace, to_workplace): Route}; порядок вставки сохраняется,
+      поэтому to_model() возвращает элементы в исходном порядке;
+    - списки смежности (последователи и предшественники) по маршрутам и
+      next_workplace_ids;
+    - занятость клеток сетки цеха (7x7 по умолчанию) по координатам x, y;
+    - кэш топологического порядка и критического пути, сбрасываемый
+      при изменении структуры графа.
+
+    Изменять граф нужно через методы класса. Если модели Workplace были
+    изменены напрямую, индексы перестраивает reindex().
+    """
+
+    def __init__(
+        self,
+        process_graph_id: str = "",
+        workplaces: Iterable[Workplace] = (),
+        routes: Iterable[Route] = (),
+        grid_size: int = GRID_SIZE,
+    ):
+        self.process_graph_id = process_graph_id
+        self.grid_size = grid_size
+        self.workplaces: Dict[str, Workplace] = {}
+        self.routes: Dict[RouteKey, Route] = {}
+
+        for workplace in workplaces:
+            self.workplaces[workplace.workplace_id] = workplace.model_copy(deep=True)
+        for route in routes:
+            self.routes[(route.from_workplace, route.to_workplace)] = route.model_copy()
+
+        self.reindex()
+
+    @classmethod
+    def from_model(
+        cls, graph: Optional[ProcessGraph], grid_size: int = GRID_SIZE
+    ) -> "IndexedProcessGraph":
+        """Построить индексированную копию ProcessGraph (None - пустой граф)."""
+        if graph is None:
+            return cls(grid_size=grid_size)
+        if isinstance(graph, dict):
+            graph = ProcessGraph.model_validate(graph)
+        return cls(graph.process_graph_id, graph.workplaces, graph.routes, grid_size)
+
+    @classmethod
+    def from_proto(cls, proto_graph, grid_size: int = GRID_SIZE) -> "IndexedProcessGraph":
+        """Построить граф из simulator_pb2.ProcessGraph."""
+        from .proto_convert import message_to_dict
+
+        # message_to_dict, в отличие от MessageToDict, сохраняет скаляры со
+        # значением по умолчанию (required_qualification=0, "")
+        data = message_to_dict(proto_graph)
+        return cls.from_model(ProcessGraph.model_validate(data), grid_size)
+
+    def to_model(self) -> ProcessGraph:
+        """Собрать ProcessGraph для отправки на сервер."""
+        return ProcessGraph(
+            process_graph_id=self.process_graph_id,
+            workplaces=[wp.model_copy(deep=True) for wp in self.workplaces.values()],
+            routes=[route.model_copy() for route in self.routes.values()],
+        )
+
+    def to_proto(self):
+        """Собрать simulator_pb2.ProcessGraph напрямую из индексов."""
+        from .proto import simulator_pb2
+
+        return simulator_pb2.ProcessGraph(
+            process_graph_id=self.process_graph_id,
+            workplaces=[
+                _workplace_to_proto(simulator_pb2, wp)
+                for wp in self.workplaces.values()
+            ],
+            routes=[
+                simulator_pb2.Route(
+                    length=route.length,
+                    from_workplace=route.from_workplace,
+                    to_workplace=route.to_workplace,
+                )
+                for route in self.routes.values()
+            ],
+        )
+
+    def __len__(self) -> int:
+        return len(self.workplaces)
+
+    def __contains__(self, workplace_id: str) -> bool:
+        return workplace_id in self.workplaces
+
+    # ==================== Индексы ====================
+
+    def reindex(self) -> None:
+        """Полностью перестроить смежность, сетку и кэши."""
+        self._route_targets: Dict[str, Dict[str, None]] = {}
+        for from_id, to_id in self.routes:
+            self._route_targets.setdefault(from_id, {})[to_id] = None
+
+        self._successors: Dict[str, Dict[str, None]] = {}
+        self._predecessors: Dict[str, Dict[str, None]] = {}
+        for workplace_id in list(self.workplaces) + list(self._route_targets):
+            self._relink(workplace_id)
+
+        self._grid: List[List[Optional[str]]] = [
+            [None] * self.grid_size for _ in range(self.grid_size)
+        ]
+        self._positions: Dict[str, Tuple[int, int]] = {}
+        for workplace in self.workplaces.values():
+            position = self._grid_position(workplace)
+            if position is None:
+                continue
+            occupant = self._grid[position[1]][position[0]]
+            if occupant is not None:
+                logger.warning(
+                    f"Workplaces {occupant} and {workplace.workplace_id} "
+                    f"share grid cell {position}"
+                )
+                continue
+            self._place(workplace.workplace_id, position)
+
+        self._invalidate()
+
+    def _relink(self, workplace_id: str) -> None:
+        """Пересчитать последователей одного узла (маршруты + next_workplace_ids)."""
+        workplace = self.workplaces.get(workplace_id)
+        new: Dict[str, None] = {}
+        if workplace is not None:
+            new.update(dict.fromkeys(workplace.next_workplace_ids))
+        new.update(self._route_targets.get(workplace_id, {}))
+
+        old = self._successors.get(workplace_id, {})
+        for target in old:
+            if target not in new:
+                self._predecessors.get(target, {}).pop(workplace_id, None)
+        for target in new:
+            self._predecessors.setdefault(target, {})[workplace_id] = None
+
+        if new:
+            self._successors[workplace_id] = new
+        else:
+            self._successors.pop(workplace_id, None)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Сбросить кэш топологических запросов."""
+        self._topology: Optional[Tuple[List[str], Optional[List[str]]]] = None
+        self._critical_path: Optional[Tuple[int, List[str]]] = None
+
+    def successors(self, workplace_id: str) -> List[str]:
+        """ID рабочих мест, в которые ведут маршруты из workplace_id."""
+        return [
+            wp_id
+            for wp_id in self._successors.get(workplace_id, ())
+            if wp_id in self.workplaces
+        ]
+
+    def predecessors(self, workplace_id: str) -> List[str]:
+        """ID рабочих мест, из которых ведут маршруты в workplace_id."""
+        return [
+            wp_id
+            for wp_id in self._predecessors.get(workplace_id, ())
+            if wp_id in self.workplaces
+        ]
+
+    # ==================== Сетка цеха ====================
+
+    def cell(self, x: int, y: int) -> Optional[Workplace]:
+        """Рабочее место в клетке (x, y) или None."""
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+            return None
+        workplace_id = self._grid[y][x]
+        return self.workplaces.get(workplace_id) if workplace_id else None
+
+    def occupancy(self) -> List[List[Optional[str]]]:
+        """Занятость сетки: строки по y, в клетке - ID рабочего места или None."""
+        return [list(row) for row in self._grid]
+
+    def free_cells(self) -> List[Tuple[int, int]]:
+        """Свободные клетки сетки (x, y)."""
+        return [
+            (x, y)
+            for y, row in enumerate(self._grid)
+            for x, workplace_id in enumerate(row)
+            if workplace_id is None
+        ]
+
+    def _grid_position(self, workplace: Workplace) -> Optional[Tuple[int, int]]:
+        """Координаты места на сетке или None, если оно не размещено."""
+        if workplace.x is None or workplace.y is None:
+            return None
+        if not (0 <= workplace.x < self.grid_size and 0 <= workplace.y < self.grid_size):
+            return None
+        return workplace.x, workplace.y
+
+    def _place(self, workplace_id: str, position: Optional[Tuple[int, int]]) -> None:
+        """Переместить рабочее место в клетку (None - убрать с сетки)."""
+        previous = self._positions.pop(workplace_id, None)
+        if previous is not None:
+            self._grid[previous[1]][previous[0]] = None
+        if position is not None:
+            self._grid[position[1]][position[0]] = workplace_id
+            self._positions[workplace_id] = position
+
+    # ==================== Топология ====================
+
+    def topological_order(self) -> List[str]:
+        """
+        Топологический порядок рабочих мест (кэшируется).
+
+        Raises:
+            ValidationError: В графе есть цикл
+        """
+        order, cycle = self._analyze()
+        if cycle is not None:
+            raise ValidationError(
+                f"Process graph has a cycle: {' -> '.join(cycle)}"
+            )
+        return list(order)
+
+    def has_cycle(self) -> bool:
+        """Есть ли в графе цикл."""
+        return self._analyze()[1] is not None
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """Один из циклов графа (первый узел повторяется в конце) или None."""
+        cycle = self._analyze()[1]
+        return list(cycle) if cycle is not None else None
+
+    def critical_path(self) -> Tuple[int, List[str]]:
+        """
+        Критический путь - самый длинный путь по сумме Route.length.
+
+        Переходы только по next_workplace_ids (без Route) имеют длину 0.
+
+        Returns:
+            Tuple[int, List[str]]: Длина пути и ID рабочих мест на нем
+
+        Raises:
+            ValidationError: В графе есть цикл
+        """
+        if self._critical_path is None:
+            order = self.topological_order()
+            distance: Dict[str, int] = {wp_id: 0 for wp_id in order}
+            previous: Dict[str, Optional[str]] = {wp_id: None for wp_id in order}
+
+            for wp_id in order:
+                for next_id in self.successors(wp_id):
+                    route = self.routes.get((wp_id, next_id))
+                    candidate = distance[wp_id] + (route.length if route else 0)
+                    if candidate > distance[next_id]:
+                        distance[next_id] = candidate
+                        previous[next_id] = wp_id
+
+            if not order:
+                self._critical_path = (0, [])
+            else:
+                end = max(order, key=lambda wp_id: distance[wp_id])
+                path = [end]
+                while previous[path[-1]] is not None:
+                    path.append(previous[path[-1]])
+                self._critical_path = (distance[end], path[::-1])
+
+        length, path = self._critical_path
+        return length, list(path)
+
+    def _analyze(self) -> Tuple[List[str], Optional[List[str]]]:
+        """Алгоритм Кана; если отсортированы не все узлы, ищется цикл."""
+        if self._topology is None:
+            in_degree = {wp_id: 0 for wp_id in self.workplaces}
+            for wp_id in self.workplaces:
+                for next_id in self.successors(wp_id):
+                    in_degree[next_id] += 1
+
+            queue = deque(wp_id for wp_id, degree in in_degree.items() if degree == 0)
+            order: List[str] = []
+            while queue:
+                wp_id = queue.popleft()
+                order.append(wp_id)
+                for next_id in self.successors(wp_id):
+                    in_degree[next_id] -= 1
+                    if in_degree[next_id] == 0:
+                        queue.append(next_id)
+
+            cycle = None
+            if len(order) < len(self.workplaces):
+                unsorted = [wp_id for wp_id, degree in in_degree.items() if degree > 0]
+                cycle = self._cycle_from(unsorted[0], set(unsorted))
+            self._topology = (order, cycle)
+
+        return self._topology
+
+    def _cycle_from(self, start: str, unsorted: set) -> List[str]:
+        """Найти цикл среди узлов, оставшихся после алгоритма Кана."""
+        # У каждого неотсортированного узла есть неотсортированный
+        # предшественник, поэтому обход по предшественникам замкнется
+        index: Dict[str, int] = {}
+        path: List[str] = []
+        current = start
+        while current not in index:
+            index[current] = len(path)
+            path.append(current)
+            current = next(
+                wp_id for wp_id in self.predecessors(current) if wp_id in unsorted
+            )
+        cycle = path[index[current]:][::-1]
+        return cycle + [cycle[0]]
+
+    # ==================== Рабочие места ====================
+
+    def get_workplace(self, workplace_id: str) -> Workplace:
+        """
+        Получить рабочее место по ID.
+
+        Raises:
+            ValidationError: Рабочего места нет в графе
+        """
+        try:
+            return self.workplaces[workplace_id]
+        except KeyError:
+            raise ValidationError(
+                f"Workplace {workplace_id} is not in process graph "
+                f"{self.process_graph_id or '<new>'}"
+            ) from None
+
+    def upsert_workplace(self, workplace_id: str, **fields: Any) -> Workplace:
+        """
+        Создать рабочее место или обновить поля существующего.
+
+        Args:
+            workplace_id: ID рабочего места
+            **fields: Поля Workplace (для нового места обязательны
+                workplace_name, required_speciality, required_qualification)
+
+        Returns:
+            Workplace: Рабочее место после изменения
+
+        Raises:
+            ValidationError: Клетка (x, y) занята другим рабочим местом
+        """
+        current = self.workplaces.get(workplace_id)
+        if current is None:
+            workplace = Workplace(workplace_id=workplace_id, **fields)
+        else:
+            workplace = Workplace.model_validate(
+                {**current.model_dump(), **fields, "workplace_id": workplace_id}
+            )
+
+        position = self._grid_position(workplace)
+        if position is not None:
+            occupant = self._grid[position[1]][position[0]]
+            if occupant not in (None, workplace_id):
+                raise ValidationError(
+                    f"Grid cell {position} is occupied by workplace {occupant}"
+                )
+
+        self.workplaces[workplace_id] = workplace
+        self._place(workplace_id, position)
+        self._relink(workplace_id)
+        return workplace
+
+    def remove_workplace(self, workplace_id: str) -> Workplace:
+        """Удалить рабочее место вместе с маршрутами, которые его касаются."""
+        workplace = self.get_workplace(workplace_id)
+
+        for from_id, to_id in [k for k in self.routes if workplace_id in k]:
+            self.remove_route(from_id, to_id)
+        for source_id in list(self._predecessors.get(workplace_id, ())):
+            source = self.workplaces.get(source_id)
+            if source is not None and workplace_id in source.next_workplace_ids:
+                source.next_workplace_ids.remove(workplace_id)
+            self._relink(source_id)
+
+        del self.workplaces[workplace_id]
+        self._place(workplace_id, None)
+        self._relink(workplace_id)
+        self._predecessors.pop(workplace_id, None)
+        return workplace
+
+    # ==================== Маршруты ====================
+
+    def add_route(self, from_workplace: str, to_workplace: str, length: int) -> Route:
+        """
+        Добавить маршрут (или изменить длину существующего).
+
+        next_workplace_ids начального рабочего места дополняется конечным.
+        """
+        source = self.get_workplace(from_workplace)
+        self.get_workplace(to_workplace)
+        if from_workplace == to_workplace:
+            raise ValidationError(f"Route from {from_workplace} to itself")
+
+        route = Route(
+            length=length, from_workplace=from_workplace, to_workplace=to_workplace
+        )
+        self.routes[(from_workplace, to_workplace)] = route
+        self._route_targets.setdefault(from_workplace, {})[to_workplace] = None
+        if to_workplace not in source.next_workplace_ids:
+            source.next_workplace_ids.append(to_workplace)
+        self._relink(from_workplace)
+        return route
+
+    def remove_route(self, from_workplace: str, to_workplace: str) -> Route:
+        """Удалить маршрут и ссылку на конечное место из next_workplace_ids."""
+        try:
+            route = self.routes.pop((from_workplace, to_workplace))
+        except KeyError:
+            raise ValidationError(
+                f"Route {from_workplace} -> {to_workplace} is not in process graph"
+            ) from None
+
+        targets = self._route_targets.get(from_workplace, {})
+        targets.pop(to_workplace, None)
+        if not targets:
+            self._route_targets.pop(from_workplace, None)
+
+        source = self.workplaces.get(from_workplace)
+        if source is not None and to_workplace in source.next_workplace_ids:
+            source.next_workplace_ids.remove(to_workplace)
+        self._relink(from_workplace)
+        return route
+
+
+def _workplace_to_proto(simulator_pb2, workplace: Workplace):
+    """Конвертировать Workplace в simulator_pb2.Workplace."""
+    kwargs = workplace.model_dump(exclude={"worker", "equipment", "x", "y"})
+    if workplace.worker is not None:
+        kwargs["worker"] = simulator_pb2.Worker(**workplace.worker.model_dump())
+    if workplace.equipment is not None:
+        kwargs["equipment"] = simulator_pb2.Equipment(**workplace.equipment.model_dump())
+    if workplace.x is not None:
+        kwargs["x"] = workplace.x
+    if workplace.y is not None:
+        kwargs["y"] = workplace.y
+    return simulator_pb2.Workplace(**kwargs)
+
+
+class ProcessGraphEditor:
+    """
+    Транзакционный редактор графа процесса.
+
+    Граф загружается один раз (из get_workshop_plan или из последних
+    SimulationParameters.processes), правки применяются локально, а при
+    выходе из ``async with`` без исключения отправляется один
+    update_process_graph. При исключении правки отбрасываются.
+    """
+
+    def __init__(
+        self,
+        client,
+        simulation_id: str,
+        source: str = "workshop_plan",
+        graph: Optional[ProcessGraph] = None,
+    ):
+        """
+        Args:
+            client: AsyncSimulationClient (или AsyncUnifiedClient)
+            simulation_id: ID симуляции
+            source: Откуда загрузить граф: "workshop_plan" (get_workshop_plan)
+                или "parameters" (последние SimulationParameters.processes)
+            graph: Уже известный граф; если задан, загрузка с сервера
+                не выполняется
+        """
+        if source not in GRAPH_SOURCES:
+            raise ValueError(
+                f"Unknown graph source {source!r}, expected one of {GRAPH_SOURCES}"
+            )
+        self.client = client
+        self.simulation_id = simulation_id
+        self.source = source
+        self._initial_graph = graph
+        self._graph: Optional[IndexedProcessGraph] = None
+        self._edits = 0
+        self.response: Optional[SimulationResponse] = None
+
+    async def __aenter__(self) -> "ProcessGraphEditor":
+        await self.load()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.commit()
+        elif self._edits:
+            logger.warning(
+                f"Discarding {self._edits} process graph edits for simulation "
+                f"{self.simulation_id}: {exc_val!r}"
+            )
+
+    @property
+    def graph(self) -> IndexedProcessGraph:
+        """Редактируемый граф."""
+        if self._graph is None:
+            raise ValidationError("Process graph is not loaded. Call load() first.")
+        return self._graph
+
+    @property
+    def pending_edits(self) -> int:
+        """Количество неотправленных правок."""
+        return self._edits
+
+    async def load(self) -> IndexedProcessGraph:
+        """Загрузить граф (один запрос к серверу) и сбросить правки."""
+        if self._initial_graph is None:
+            self._initial_graph = await self._fetch_graph()
+        self._graph = IndexedProcessGraph.from_model(self._initial_graph)
+        self._edits = 0
+        return self._graph
+
+    async def _fetch_graph(self) -> Optional[ProcessGraph]:
+        """Получить текущий граф с сервера."""
+        if self.source == "workshop_plan":
+            response = await self.client.get_workshop_plan(self.simulation_id)
+            return response.workshop_plan
+
+        response = await self.client.get_simulation(self.simulation_id)
+        parameters = response.simulations.parameters
+        return parameters[-1].processes if parameters else None
+
+    async def commit(self) -> Optional[SimulationResponse]:
+        """
+        Отправить граф одним update_process_graph.
+
+        Returns:
+            Optional[SimulationResponse]: Ответ сервера или None, если правок не было
+        """
+        if not self._edits:
+            return None
+
+        process_graph = self.graph.to_model()
+        self.response = await self.client.update_process_graph(
+            self.simulation_id, process_graph
+        )
+        logger.info(
+            f"Committed {self._edits} process graph edits for simulation "
+            f"{self.simulation_id} in one update_process_graph"
+        )
+        # Отправленный граф становится новой точкой отката
+        self._initial_graph = process_graph
+        self._edits = 0
+        return self.response
+
+    def rollback(self) -> None:
+        """Отменить неотправленные правки."""
+        self._graph = IndexedProcessGraph.from_model(self._initial_graph)
+        self._edits = 0
+
+    # ==================== Правки ====================
+
+    def add_route(self, from_workplace: str, to_workplace: str, length: int) -> Route:
+        """Добавить маршрут между рабочими местами."""
+        route = self.graph.add_route(from_workplace, to_workplace, length)
+        self._edits += 1
+        return route
+
+    def delete_route(self, from_workplace: str, to_workplace: str) -> Route:
+        """Удалить маршрут между рабочими местами."""
+        route = self.graph.remove_route(from_workplace, to_workplace)
+        self._edits += 1
+        return route
+
+    def configure_workplace(self, workplace_id: str, **fields: Any) -> Workplace:
+        """
+        Создать или изменить рабочее место в графе.
+
+        Если передан next_workplace_ids, маршруты к местам, которых нет в
+        новом списке, удаляются.
+        """
+        next_ids: Optional[List[str]] = fields.get("next_workplace_ids")
+        workplace = self.graph.upsert_workplace(workplace_id, **fields)
+        if next_ids is not None:
+            for from_id, to_id in [k for k in self.graph.routes if k[0] == workplace_id]:
+                if to_id not in next_ids:
+                    self.graph.remove_route(from_id, to_id)
+        self._edits += 1
+        return workplace
+
+    def remove_workplace(self, workplace_id: str) -> Workplace:
+        """Удалить рабочее место и его маршруты."""
+        workplace = self.graph.remove_workplace(workplace_id)
+        self._edits += 1
+        return workplace
+
+    def set_start_node(self, workplace_id: str, is_start_node: bool = True) -> Workplace:
+        """Отметить рабочее место как начальный узел."""
+        self.graph.get_workplace(workplace_id)
+        return self.configure_workplace(workplace_id, is_start_node=is_start_node)
+
+    def set_end_node(self, workplace_id: str, is_end_node: bool = True) -> Workplace:
+        """Отметить рабочее место как конечный узел."""
+        self.graph.get_workplace(workplace_id)
+        return self.configure_workplace(workplace_id, is_end_node=is_end_node)
@@ -1,12 +1,32 @@
 """
 Generated protobuf and gRPC code.
 This module is auto-generated from simulator.proto file.
+
+Содержимое simulator_pb2 / simulator_pb2_grpc загружается лениво:
+импорт ``simulation_client.proto.simulator_pb2`` не тянет за собой
+gRPC stub'ы, а имена сообщений по-прежнему доступны как атрибуты пакета.
 """
 
-from .simulator_pb2 import *
-from .simulator_pb2_grpc import *
+import importlib
 
 __all__ = [
     "simulator_pb2",
     "simulator_pb2_grpc",
 ]
+
+
+def __getattr__(name: str):
+    """Лениво разрешить подмодуль или имя из сгенерированного кода."""
+    if name in __all__:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        for module_name in __all__:
+            module = importlib.import_module(f".{module_name}", __name__)
+            if hasattr(module, name):
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
@@ -0,0 +1,274 @@
+"""
+Компилируемые конвертеры protobuf <-> dict.
+
+Для каждого типа сообщения один раз по дескриптору строится план: список
+функций, по одной на поле, уже знающих вид поля (скаляр, enum, вложенное
+сообщение, repeated, map, optional с presence). Планы кэшируются по
+дескриптору, поэтому при конвертации нет проверок hasattr/isinstance
+на каждом поле, а вложенные типы берутся из дескриптора, а не угадываются
+по имени ключа.
+
+Набор ключей совпадает с json_format.MessageToDict(
+preserving_proto_field_name=True, always_print_fields_with_no_presence=True):
+скаляры и repeated поля без presence выводятся всегда, в том числе со
+значениями по умолчанию (0, "", False, []), так что словарь проходит
+валидацию Pydantic моделей с обязательными полями; optional поля и
+вложенные сообщения - только если установлены; enum - по имени. Вызов
+MessageToDict без always_print_fields_with_no_presence значения по
+умолчанию пропускает. Отличие в значениях: 64-битные целые остаются int,
+а не строками. dict_to_proto принимает и вывод json_format.MessageToDict
+(json-имена полей, 64-битные целые строками).
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.protobuf.descriptor import Descriptor, FieldDescriptor
+
+_INT64_TYPES = {
+    FieldDescriptor.TYPE_INT64,
+    FieldDescriptor.TYPE_UINT64,
+    FieldDescriptor.TYPE_SINT64,
+    FieldDescriptor.TYPE_FIXED64,
+    FieldDescriptor.TYPE_SFIXED64,
+}
+
+# Шаг плана proto -> dict: step(message, result)
+ToDictStep = Callable[[Any, Dict[str, Any]], None]
+# Шаг плана dict -> proto: step(message, value)
+FromDictStep = Callable[[Any, Any], None]
+
+_TO_DICT_PLANS: Dict[Descriptor, List[ToDictStep]] = {}
+_FROM_DICT_PLANS: Dict[Descriptor, Dict[str, FromDictStep]] = {}
+
+
+# ==================== PROTO -> DICT ====================
+
+
+def message_to_dict(message) -> Dict[str, Any]:
+    """Конвертировать protobuf сообщение в словарь по скомпилированному плану."""
+    result: Dict[str, Any] = {}
+    for step in to_dict_plan(message.DESCRIPTOR):
+        step(message, result)
+    return result
+
+
+def to_dict_plan(descriptor: Descriptor) -> List[ToDictStep]:
+    """План proto -> dict для типа сообщения (строится один раз)."""
+    plan = _TO_DICT_PLANS.get(descriptor)
+    if plan is None:
+        plan = [_compile_to_dict(field) for field in descriptor.fields]
+        _TO_DICT_PLANS[descriptor] = plan
+    return plan
+
+
+def _value_to_dict(field: FieldDescriptor) -> Optional[Callable[[Any], Any]]:
+    """Конвертер одного значения поля (без учета repeated/map)."""
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        return message_to_dict
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        names = {value.number: value.name for value in field.enum_type.values}
+        return lambda value: names.get(value, value)
+    return None
+
+
+def _compile_to_dict(field: FieldDescriptor) -> ToDictStep:
+    name = field.name
+
+    if _is_map(field):
+        convert = _value_to_dict(field.message_type.fields_by_name["value"])
+        if convert is None:
+
+            def step(message, result):
+                result[name] = dict(getattr(message, name))
+
+        else:
+
+            def step(message, result):
+                result[name] = {
+                    key: convert(value)
+                    for key, value in getattr(message, name).items()
+                }
+
+        return step
+
+    convert = _value_to_dict(field)
+
+    if field.is_repeated:
+        if convert is None:
+
+            def step(message, result):
+                result[name] = list(getattr(message, name))
+
+        else:
+
+            def step(message, result):
+                result[name] = [convert(value) for value in getattr(message, name)]
+
+        return step
+
+    if field.has_presence:
+        convert = convert or (lambda value: value)
+
+        def step(message, result):
+            if message.HasField(name):
+                result[name] = convert(getattr(message, name))
+
+        return step
+
+    if convert is None:
+
+        def step(message, result):
+            result[name] = getattr(message, name)
+
+    else:
+
+        def step(message, result):
+            result[name] = convert(getattr(message, name))
+
+    return step
+
+
+# ==================== DICT -> PROTO ====================
+
+
+def dict_to_message(data: Dict[str, Any], proto_class):
+    """Создать protobuf сообщение из словаря по скомпилированному плану."""
+    message = proto_class()
+    fill_message(message, data)
+    return message
+
+
+def fill_message(message, data: Dict[str, Any]) -> None:
+    """
+    Заполнить protobuf сообщение значениями из словаря.
+
+    Ключи - имена полей proto или их json-имена; значения None пропускаются.
+
+    Raises:
+        ValueError: Ключ не соответствует ни одному полю сообщения
+    """
+    plan = from_dict_plan(message.DESCRIPTOR)
+    for key, value in data.items():
+        if value is None:
+            continue
+        step = plan.get(key)
+        if step is None:
+            raise ValueError(
+                f"Message {message.DESCRIPTOR.full_name} has no field {key!r}"
+            )
+        step(message, value)
+
+
+def from_dict_plan(descriptor: Descriptor) -> Dict[str, FromDictStep]:
+    """План dict -> proto для типа сообщения (строится один раз)."""
+    plan = _FROM_DICT_PLANS.get(descriptor)
+    if plan is None:
+        plan = {}
+        for field in descriptor.fields:
+            step = _compile_from_dict(field)
+            plan[field.name] = step
+            plan.setdefault(field.json_name, step)
+        _FROM_DICT_PLANS[descriptor] = plan
+    return plan
+
+
+def _scalar_from_dict(field: FieldDescriptor) -> Optional[Callable[[Any], Any]]:
+    """Приведение скалярного значения (enum по имени, int64 из строки)."""
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        numbers = {value.name: value.number for value in field.enum_type.values}
+        return lambda value: numbers[value] if isinstance(value, str) else value
+    if field.type in _INT64_TYPES:
+        return int
+    if field.type in (FieldDescriptor.TYPE_DOUBLE, FieldDescriptor.TYPE_FLOAT):
+        return float
+    return None
+
+
+def _compile_from_dict(field: FieldDescriptor) -> FromDictStep:
+    name = field.name
+
+    if _is_map(field):
+        key_field = field.message_type.fields_by_name["key"]
+        value_field = field.message_type.fields_by_name["value"]
+        convert_key = _scalar_from_dict(key_field) or (lambda key: key)
+
+        if value_field.type == FieldDescriptor.TYPE_MESSAGE:
+
+            def step(message, value):
+                container = getattr(message, name)
+                for key, item in value.items():
+                    fill_message(container[convert_key(key)], item)
+
+        else:
+            convert = _scalar_from_dict(value_field) or (lambda item: item)
+
+            def step(message, value):
+                container = getattr(message, name)
+                for key, item in value.items():
+                    container[convert_key(key)] = convert(item)
+
+        return step
+
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        if field.is_repeated:
+
+            def step(message, value):
+                container = getattr(message, name)
+                for item in value:
+                    fill_message(container.add(), item)
+
+        else:
+
+            def step(message, value):
+                nested = getattr(message, name)
+                nested.SetInParent()
+                fill_message(nested, value)
+
+        return step
+
+    convert = _scalar_from_dict(field)
+
+    if field.is_repeated:
+        if convert is None:
+
+            def step(message, value):
+                getattr(message, name).extend(value)
+
+        else:
+
+            def step(message, value):
+                getattr(message, name).extend(convert(item) for item in value)
+
+        return step
+
+    if convert is None:
+
+        def step(message, value):
+            setattr(message, name, value)
+
+    else:
+
+        def step(message, value):
+            setattr(message, name, convert(value))
+
+    return step
+
+
+def _is_map(field: FieldDescriptor) -> bool:
+    return (
+        field.type == FieldDescriptor.TYPE_MESSAGE
+        and field.message_type.GetOptions().map_entry
+    )
+
+
+def clear_plans() -> Tuple[int, int]:
+    """
+    Очистить кэш планов.
+
+    Returns:
+        Tuple[int, int]: Число удаленных планов (proto -> dict, dict -> proto)
+    """
+    counts = (len(_TO_DICT_PLANS), len(_FROM_DICT_PLANS))
+    _TO_DICT_PLANS.clear()
+    _FROM_DICT_PLANS.clear()
+    return counts
@@ -0,0 +1,432 @@
+"""
+Приведение симуляции к желаемым параметрам.
+
+Чтобы перевести симуляцию из конфигурации A в B, вызывающему коду
+приходится вычислять набор add_*/delete_*/set_* вызовов или отправлять
+все заново. SimulationReconciler сравнивает желаемые SimulationParameters
+с текущими и выполняет только нужные вызовы, по фазам:
+
+1. удаления (поставщики, тендеры);
+2. добавления (поставщики, в том числе запасные, тендеры);
+3. настройки (логист, склады, политики, сертификации, улучшения,
+   инспекция и сроки поставки поставщиков);
+4. граф процесса;
+5. строки производственного плана (ссылаются на тендеры).
+
+Вызовы одной фазы выполняются параллельно (не более max_concurrency),
+фазы - последовательно. Поля желаемых параметров со значением по
+умолчанию (None, пустая строка) не меняются.
+
+```python
+result = await client.apply(simulation_id, desired_parameters)
+for action in result.applied:
+    print(action.method, action.target)
+```
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from pydantic import Field
+
+from .exceptions import SimulationError
+from .models import (
+    BaseModel,
+    DistributionStrategy,
+    ProductionSchedule,
+    SimulationParameters,
+    SimulationResponse,
+    WarehouseType,
+)
+from .schedule_sync import ProductionScheduleSync
+
+logger = logging.getLogger(__name__)
+
+PHASE_REMOVE = 1
+PHASE_ADD = 2
+PHASE_CONFIGURE = 3
+PHASE_GRAPH = 4
+PHASE_PLAN = 5
+
+# Методы с параметром decode: промежуточные ответы не декодируются
+_NO_DECODE_METHODS = frozenset(
+    {"set_production_plan_row", "set_worker_on_workplace", "unset_worker_on_workplace"}
+)
+
+
+class ReconcileAction(BaseModel):
+    """Один вызов клиента для приведения к желаемому состоянию."""
+
+    phase: int
+    method: str
+    target: str
+    kwargs: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ApplyResult(BaseModel):
+    """Результат apply: выполненные вызовы и неприменимые изменения."""
+
+    applied: List[ReconcileAction] = Field(default_factory=list)
+    # Изменения, для которых в API нет вызова (уменьшение склада и т.д.)
+    skipped: List[str] = Field(default_factory=list)
+    response: Optional[SimulationResponse] = None
+
+    @property
+    def changed(self) -> bool:
+        """Были ли выполнены вызовы."""
+        return bool(self.applied)
+
+
+def _worker_id(warehouse) -> Optional[str]:
+    if warehouse is None or warehouse.inventory_worker is None:
+        return None
+    return warehouse.inventory_worker.worker_id
+
+
+class SimulationReconciler:
+    """
+    Приведение параметров одной симуляции к желаемым.
+
+    Поставщики, тендеры, сертификации и улучшения сопоставляются по ID,
+    строки плана - по tender_id (как в ProductionScheduleSync).
+    """
+
+    def __init__(self, client, simulation_id: str, max_concurrency: int = 8):
+        """
+        Args:
+            client: AsyncSimulationClient
+            simulation_id: ID симуляции
+            max_concurrency: Максимум одновременных вызовов одной фазы
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.client = client
+        self.simulation_id = simulation_id
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    def plan(
+        current: SimulationParameters, desired: SimulationParameters
+    ) -> "ApplyResult":
+        """
+        Вычислить вызовы без их выполнения.
+
+        Returns:
+            ApplyResult: applied - вызовы в порядке выполнения,
+                skipped - неприменимые изменения
+        """
+        actions: List[ReconcileAction] = []
+        skipped: List[str] = []
+
+        def add(phase: int, method: str, target: str, **kwargs) -> None:
+            actions.append(
+                ReconcileAction(
+                    phase=phase, method=method, target=target, kwargs=kwargs
+                )
+            )
+
+        # Поставщики: смена основной/запасной роли - удаление и добавление
+        current_suppliers = {s.supplier_id: (s, False) for s in current.suppliers}
+        current_suppliers.update(
+            {s.supplier_id: (s, True) for s in current.backup_suppliers}
+        )
+        desired_suppliers = {s.supplier_id: (s, False) for s in desired.suppliers}
+        desired_suppliers.update(
+            {s.supplier_id: (s, True) for s in desired.backup_suppliers}
+        )
+        for supplier_id, (_, is_backup) in current_suppliers.items():
+            wanted = desired_suppliers.get(supplier_id)
+            if wanted is None or wanted[1] != is_backup:
+                add(
+                    PHASE_REMOVE,
+                    "delete_supplier",
+                    supplier_id,
+                    supplier_id=supplier_id,
+                )
+        for supplier_id, (supplier, is_backup) in desired_suppliers.items():
+            existing = current_suppliers.get(supplier_id)
+            if existing is None or existing[1] != is_backup:
+                add(
+                    PHASE_ADD,
+                    "add_supplier",
+                    supplier_id,
+                    supplier_id=supplier_id,
+                    is_backup=is_backup,
+                )
+            # Добавленный поставщик приходит из каталога без инспекции
+            # и со своим сроком поставки: срок сравнивается только
+            # у уже подключенных
+            current_inspection = existing[0].quality_inspection if existing else False
+            if supplier.quality_inspection != current_inspection:
+                add(
+                    PHASE_CONFIGURE,
+                    "set_quality_inspection",
+                    supplier_id,
+                    supplier_id=supplier_id,
+                    inspection_enabled=supplier.quality_inspection,
+                )
+            if existing is not None and (
+                supplier.delivery_period != existing[0].delivery_period
+            ):
+                add(
+                    PHASE_CONFIGURE,
+                    "set_delivery_period",
+                    supplier_id,
+                    supplier_id=supplier_id,
+                    delivery_period_days=supplier.delivery_period,
+                )
+
+        # Тендеры
+        current_tenders = {t.tender_id for t in current.tenders}
+        desired_tenders = {t.tender_id for t in desired.tenders}
+        for tender_id in sorted(current_tenders - desired_tenders):
+            add(PHASE_REMOVE, "delete_tender", tender_id, tender_id=tender_id)
+        for tender in desired.tenders:
+            if tender.tender_id not in current_tenders:
+                add(
+                    PHASE_ADD,
+                    "add_tender",
+                    tender.tender_id,
+                    tender_id=tender.tender_id,
+                )
+
+        # Логист
+        current_logist = current.logist.worker_id if current.logist else None
+        if desired.logist is not None and desired.logist.worker_id != current_logist:
+            add(
+                PHASE_CONFIGURE,
+                "set_logist",
+                desired.logist.worker_id,
+                worker_id=desired.logist.worker_id,
+            )
+
+        # Склады: работник и размер (размер можно только увеличить)
+        for field, warehouse_type in (
+            ("materials_warehouse", WarehouseType.WAREHOUSE_TYPE_MATERIALS),
+            ("product_warehouse", WarehouseType.WAREHOUSE_TYPE_PRODUCTS),
+        ):
+            wanted = getattr(desired, field)
+            if wanted is None:
+                continue
+            existing = getattr(current, field)
+            worker_id = _worker_id(wanted)
+            if worker_id is not None and worker_id != _worker_id(existing):
+                add(
+                    PHASE_CONFIGURE,
+                    "set_warehouse_worker",
+                    field,
+                    worker_id=worker_id,
+                    warehouse_type=warehouse_type,
+                )
+            current_size = existing.size if existing is not None else 0
+            if wanted.size > current_size:
+                add(
+                    PHASE_CONFIGURE,
+                    "increase_warehouse_size",
+                    field,
+                    warehouse_type=warehouse_type,
+                    size=wanted.size - current_size,
+                )
+            elif wanted.size < current_size:
+                skipped.append(
+                    f"{field}.size: cannot decrease {current_size} -> {wanted.size}"
+                )
+
+        # Политики
+        if (
+            desired.dealing_with_defects
+            and desired.dealing_with_defects != current.dealing_with_defects
+        ):
+            add(
+                PHASE_CONFIGURE,
+                "set_dealing_with_defects",
+                "dealing_with_defects",
+                policy=desired.dealing_with_defects,
+            )
+        if desired.sales_strategy and desired.sales_strategy != current.sales_strategy:
+            add(
+                PHASE_CONFIGURE,
+                "set_sales_strategy",
+                "sales_strategy",
+                strategy=desired.sales_strategy,
+            )
+        if desired.distribution_strategy not in (
+            current.distribution_strategy,
+            DistributionStrategy.DISTRIBUTION_STRATEGY_UNSPECIFIED,
+        ):
+            skipped.append("distribution_strategy: no RPC to change it")
+
+        # Сертификации и улучшения: сопоставление по ID, отсутствующие
+        # в текущих считаются неполученными/невнедренными
+        obtained = {c.certificate_type: c.is_obtained for c in current.certifications}
+        for certification in desired.certifications:
+            is_obtained = obtained.get(certification.certificate_type, False)
+            if is_obtained != certification.is_obtained:
+                add(
+                    PHASE_CONFIGURE,
+                    "set_certification_status",
+                    certification.certificate_type,
+                    certificate_type=certification.certificate_type,
+                    is_obtained=certification.is_obtained,
+                )
+        implemented = {
+            i.improvement_id: i.is_implemented for i in current.lean_improvements
+        }
+        for improvement in desired.lean_improvements:
+            is_implemented = implemented.get(improvement.improvement_id, False)
+            if is_implemented != improvement.is_implemented:
+                add(
+                    PHASE_CONFIGURE,
+                    "set_lean_improvement_status",
+                    improvement.improvement_id,
+                    improvement_id=improvement.improvement_id,
+                    is_implemented=improvement.is_implemented,
+                )
+
+        # Граф процесса отправляется целиком одним вызовом
+        if desired.processes is not None and desired.processes != current.processes:
+            add(
+                PHASE_GRAPH,
+                "update_process_graph",
+                desired.processes.process_graph_id,
+                process_graph=desired.processes,
+            )
+
+        # Строки производственного плана
+        if desired.production_schedule is not None:
+            changed, _, not_in_desired = ProductionScheduleSync.diff(
+                current.production_schedule or ProductionSchedule(),
+                desired.production_schedule,
+            )
+            for row in changed:
+                add(PHASE_PLAN, "set_production_plan_row", row.tender_id, row=row)
+            skipped.extend(
+                f"production_schedule row {tender_id}: no RPC to delete it"
+                for tender_id in not_in_desired
+            )
+
+        actions.sort(key=lambda action: action.phase)
+        return ApplyResult(applied=actions, skipped=skipped)
+
+    async def apply(
+        self,
+        desired: SimulationParameters,
+        current: Optional[SimulationParameters] = None,
+        dry_run: bool = False,
+    ) -> ApplyResult:
+        """
+        Привести параметры симуляции к желаемым.
+
+        Args:
+            desired: Желаемые параметры
+            current: Текущие параметры; если не заданы, берутся из зеркала
+                состояния или через get_simulation
+            dry_run: Только вычислить вызовы
+
+        Returns:
+            ApplyResult: Выполненные вызовы, неприменимые изменения и
+                состояние симуляции после последнего вызова
+
+        Raises:
+            SimulationError: Часть вызовов фазы завершилась ошибкой;
+                следующие фазы не выполняются. В details перечислены
+                failed ("method:target" -> ошибка) и applied
+        """
+        if current is None:
+            current = await self.client._get_current_parameters(self.simulation_id)
+            current = current or SimulationParameters()
+
+        planned = self.plan(current, desired)
+        for message in planned.skipped:
+            logger.warning(f"Simulation {self.simulation_id}: skipped {message}")
+        if dry_run or not planned.applied:
+            return planned
+        return await self.execute(planned)
+
+    async def execute(self, planned: ApplyResult) -> ApplyResult:
+        """
+        Выполнить вычисленные вызовы по фазам.
+
+        Args:
+            planned: Вызовы (например, из plan())
+
+        Returns:
+            ApplyResult: Выполненные вызовы и состояние симуляции после
+                них (get_simulation, если последняя фаза шла параллельно)
+
+        Raises:
+            SimulationError: Часть вызовов фазы завершилась ошибкой;
+                запись симуляции в state_mirror сбрасывается
+        """
+        result = ApplyResult(skipped=planned.skipped)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        last_raw = None
+
+        async def call(action: ReconcileAction):
+            nonlocal last_raw
+            kwargs = dict(action.kwargs)
+            if action.method in _NO_DECODE_METHODS:
+                kwargs["decode"] = False
+            async with semaphore:
+                response = await getattr(self.client, action.method)(
+                    self.simulation_id, **kwargs
+                )
+            last_raw = response
+            return response
+
+        try:
+            for phase in sorted({action.phase for action in planned.applied}):
+                await self._execute_phase(phase, planned, result, call)
+        except BaseException:
+            # Выполненные вызовы не декодировались и не попали в зеркало:
+            # повторный apply() должен планировать от свежего состояния
+            self.client.state_mirror.forget(self.simulation_id)
+            raise
+
+        last_phase = max((action.phase for action in planned.applied), default=0)
+        concurrent = self.max_concurrency > 1 and (
+            sum(action.phase == last_phase for action in planned.applied) > 1
+        )
+        if concurrent:
+            # Ответ, завершившийся последним на клиенте, может не содержать
+            # изменений, примененных сервером после него
+            result.response = await self.client.get_simulation(self.simulation_id)
+        elif isinstance(last_raw, SimulationResponse):
+            result.response = last_raw
+        elif last_raw is not None:
+            result.response = await self.client._decode_simulation_response(last_raw)
+
+        logger.info(
+            f"Applied {len(result.applied)} changes to simulation "
+            f"{self.simulation_id}, skipped {len(result.skipped)}"
+        )
+        return result
+
+    async def _execute_phase(
+        self, phase: int, planned: ApplyResult, result: ApplyResult, call
+    ) -> None:
+        """Выполнить вызовы одной фазы; успешные добавляются в result."""
+        actions = [action for action in planned.applied if action.phase == phase]
+        outcomes = await asyncio.gather(
+            *(call(action) for action in actions), return_exceptions=True
+        )
+
+        failed: Dict[str, str] = {}
+        for action, outcome in zip(actions, outcomes):
+            if isinstance(outcome, BaseException):
+                failed[f"{action.method}:{action.target}"] = str(outcome)
+            else:
+                result.applied.append(action)
+        if failed:
+            raise SimulationError(
+                f"Failed to apply {len(failed)} changes to simulation "
+                f"{self.simulation_id}",
+                details={
+                    "failed": failed,
+                    "applied": [
+                        f"{action.method}:{action.target}"
+                        for action in result.applied
+                    ],
+                },
+            )
@@ -0,0 +1,216 @@
+"""
+Кэш неизменяемых результатов симуляции.
+
+Результаты и метрики завершенного шага симуляции больше не меняются,
+поэтому их можно хранить локально. ResultCache хранит сериализованные
+protobuf ответы по ключу (simulation_id, step, metric_kind): LRU в памяти
+поверх SQLite файла, так что история доступна и после перезапуска процесса.
+
+```python
+cache = ResultCache("~/.cache/simulation_client/results.sqlite")
+client = AsyncSimulationClient(result_cache=cache)
+```
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    simulation_id TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    metric_kind TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (simulation_id, step, metric_kind)
+) WITHOUT ROWID
+"""
+
+
+class ResultCache:
+    """
+    Кэш protobuf байтов по (simulation_id, step, metric_kind).
+
+    В памяти хранится не более max_memory_entries последних записей;
+    если задан path, все записи сохраняются в SQLite и подгружаются
+    в память при промахе. Значения - bytes (SerializeToString()), поэтому
+    кэш не зависит от версии Pydantic моделей.
+
+    Из корутин используются aget/aput/ainvalidate: попадание в память
+    обслуживается сразу, а чтение и запись SQLite (с commit и fsync)
+    выполняются в потоке и не блокируют event loop.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_memory_entries: int = 1024):
+        """
+        Args:
+            path: Путь к SQLite файлу (None - только память)
+            max_memory_entries: Размер LRU в памяти
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        # _lock защищает LRU и счетчики, _db_lock - SQLite соединение:
+        # обращение к памяти не ждет записи на диск в другом потоке
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+            self._db.commit()
+
+    def get(self, simulation_id: str, step: int, metric_kind: str) -> Optional[bytes]:
+        """Получить сохраненный ответ или None."""
+        key = (simulation_id, step, metric_kind)
+        payload = self._memory_get(key)
+        if payload is None and self._db is not None:
+            payload = self._disk_get(key)
+        return self._count(key, payload)
+
+    async def aget(
+        self, simulation_id: str, step: int, metric_kind: str
+    ) -> Optional[bytes]:
+        """get() для event loop: чтение SQLite выполняется в потоке."""
+        key = (simulation_id, step, metric_kind)
+        payload = self._memory_get(key)
+        if payload is None and self._db is not None:
+            payload = await asyncio.to_thread(self._disk_get, key)
+        return self._count(key, payload)
+
+    def put(
+        self, simulation_id: str, step: int, metric_kind: str, payload: bytes
+    ) -> None:
+        """Сохранить ответ завершенного шага."""
+        key = (simulation_id, step, metric_kind)
+        with self._lock:
+            self._remember(key, payload)
+        if self._db is not None:
+            self._disk_put(key, payload)
+
+    async def aput(
+        self, simulation_id: str, step: int, metric_kind: str, payload: bytes
+    ) -> None:
+        """put() для event loop: запись в SQLite выполняется в потоке."""
+        key = (simulation_id, step, metric_kind)
+        with self._lock:
+            self._remember(key, payload)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_put, key, payload)
+
+    def invalidate(self, simulation_id: str) -> None:
+        """Удалить все записи симуляции."""
+        self._forget(simulation_id)
+        if self._db is not None:
+            self._disk_delete(simulation_id)
+
+    async def ainvalidate(self, simulation_id: str) -> None:
+        """invalidate() для event loop: удаление из SQLite выполняется в потоке."""
+        self._forget(simulation_id)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_delete, simulation_id)
+
+    def close(self) -> None:
+        """Закрыть SQLite соединение."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        with self._db_lock:
+            if self._db is not None:
+                return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        with self._lock:
+            return len(self._memory)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Статистика попаданий."""
+        return {
+            "memory_entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    # ==================== Память ====================
+
+    def _memory_get(self, key: CacheKey) -> Optional[bytes]:
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            return payload
+
+    def _count(self, key: CacheKey, payload: Optional[bytes]) -> Optional[bytes]:
+        """Учесть промах или попадание с диска (попадания в память учтены)."""
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            elif key not in self._memory:
+                self._remember(key, payload)
+                self.disk_hits += 1
+        return payload
+
+    def _forget(self, simulation_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._memory if k[0] == simulation_id]:
+                del self._memory[key]
+
+    def _remember(self, key: CacheKey, payload: bytes) -> None:
+        """Положить запись в LRU в памяти."""
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    # ==================== SQLite ====================
+    # Выполняются в потоке из aget/aput/ainvalidate
+
+    def _disk_get(self, key: CacheKey) -> Optional[bytes]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT payload FROM results "
+                "WHERE simulation_id = ? AND step = ? AND metric_kind = ?",
+                key,
+            ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def _disk_put(self, key: CacheKey, payload: bytes) -> None:
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (*key, sqlite3.Binary(payload)),
+            )
+            self._db.commit()
+
+    def _disk_delete(self, simulation_id: str) -> None:
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "DELETE FROM results WHERE simulation_id = ?", (simulation_id,)
+            )
+            self._db.commit()
@@ -0,0 +1,174 @@
+"""
+Пакетное обновление производственного плана.
+
+set_production_plan_row обновляет одну строку за вызов и возвращает всю
+симуляцию. ProductionScheduleSync сравнивает желаемый план с текущим
+(get_production_schedule) по tender_id, отправляет только изменившиеся
+строки с ограниченным параллелизмом без декодирования ответов. Порядок, в
+котором сервер применил параллельные запросы, неизвестен, поэтому итоговое
+состояние симуляции запрашивается одним get_simulation.
+
+```python
+sync = client.production_schedule_sync(simulation_id, max_concurrency=8)
+result = await sync.sync(desired_schedule)
+print(result.updated, result.unchanged)
+```
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import Field
+
+from .exceptions import SimulationError
+from .models import BaseModel, ProductionPlanRow, ProductionSchedule, SimulationResponse
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleSyncResult(BaseModel):
+    """Результат синхронизации производственного плана."""
+
+    updated: List[str] = Field(default_factory=list)
+    unchanged: List[str] = Field(default_factory=list)
+    # Строки, которые есть на сервере, но отсутствуют в желаемом плане.
+    # Удаления строк в API нет, поэтому они только сообщаются
+    not_in_desired: List[str] = Field(default_factory=list)
+    response: Optional[SimulationResponse] = None
+
+
+class ProductionScheduleSync:
+    """
+    Синхронизатор производственного плана одной симуляции.
+
+    Строки сопоставляются по tender_id. Изменившиеся и новые строки
+    отправляются параллельно (не более max_concurrency запросов
+    одновременно) без декодирования ответов. Ответ, завершившийся
+    последним на клиенте, не обязательно отражает последнюю примененную
+    сервером строку, поэтому после параллельной отправки состояние
+    загружается get_simulation; ответ декодируется, только если запросы
+    шли по одному.
+    """
+
+    def __init__(self, client, simulation_id: str, max_concurrency: int = 8):
+        """
+        Args:
+            client: AsyncSimulationClient
+            simulation_id: ID симуляции
+            max_concurrency: Максимум одновременных set_production_plan_row
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.client = client
+        self.simulation_id = simulation_id
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    def diff(
+        current: ProductionSchedule, desired: ProductionSchedule
+    ) -> Tuple[List[ProductionPlanRow], List[str], List[str]]:
+        """
+        Сравнить планы по tender_id.
+
+        Returns:
+            Tuple: (строки для отправки, неизменные tender_id,
+                tender_id, которых нет в желаемом плане)
+        """
+        current_rows: Dict[str, ProductionPlanRow] = {
+            row.tender_id: row for row in current.rows
+        }
+        desired_rows: Dict[str, ProductionPlanRow] = {
+            row.tender_id: row for row in desired.rows
+        }
+
+        changed = [
+            row
+            for tender_id, row in desired_rows.items()
+            if current_rows.get(tender_id) != row
+        ]
+        unchanged = [
+            tender_id
+            for tender_id, row in desired_rows.items()
+            if current_rows.get(tender_id) == row
+        ]
+        not_in_desired = [
+            tender_id for tender_id in current_rows if tender_id not in desired_rows
+        ]
+        return changed, unchanged, not_in_desired
+
+    async def sync(
+        self,
+        desired: ProductionSchedule,
+        current: Optional[ProductionSchedule] = None,
+    ) -> ScheduleSyncResult:
+        """
+        Привести план на сервере к желаемому.
+
+        Args:
+            desired: Желаемый производственный план
+            current: Текущий план; если не задан, загружается
+                через get_production_schedule
+
+        Returns:
+            ScheduleSyncResult: Отправленные и неизменные строки и
+                состояние симуляции после всех отправленных строк
+
+        Raises:
+            SimulationError: Часть строк не удалось отправить; в details
+                перечислены failed (tender_id -> ошибка) и updated
+        """
+        if current is None:
+            response = await self.client.get_production_schedule(self.simulation_id)
+            current = response.schedule
+
+        changed, unchanged, not_in_desired = self.diff(current, desired)
+        result = ScheduleSyncResult(unchanged=unchanged, not_in_desired=not_in_desired)
+        if not_in_desired:
+            logger.warning(
+                f"Production schedule of simulation {self.simulation_id} has rows "
+                f"not present in desired schedule: {not_in_desired}"
+            )
+        if not changed:
+            return result
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        last_raw = None
+
+        async def send(row: ProductionPlanRow):
+            nonlocal last_raw
+            async with semaphore:
+                raw = await self.client.set_production_plan_row(
+                    self.simulation_id, row, decode=False
+                )
+            last_raw = raw
+            return raw
+
+        outcomes = await asyncio.gather(
+            *(send(row) for row in changed), return_exceptions=True
+        )
+
+        failed: Dict[str, str] = {}
+        for row, outcome in zip(changed, outcomes):
+            if isinstance(outcome, BaseException):
+                failed[row.tender_id] = str(outcome)
+            else:
+                result.updated.append(row.tender_id)
+
+        logger.info(
+            f"Synced production schedule of simulation {self.simulation_id}: "
+            f"{len(result.updated)} updated, {len(unchanged)} unchanged, "
+            f"{len(failed)} failed"
+        )
+        if failed:
+            # Состояние в state_mirror сброшено вызовами с decode=False
+            raise SimulationError(
+                f"Failed to update {len(failed)} production plan rows",
+                details={"failed": failed, "updated": result.updated},
+            )
+
+        if len(changed) == 1 or self.max_concurrency == 1:
+            result.response = await self.client._decode_simulation_response(last_raw)
+        else:
+            result.response = await self.client.get_simulation(self.simulation_id)
+        return result
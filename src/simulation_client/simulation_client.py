@@ -1,16 +1,29 @@
 import asyncio
+import contextlib
 import grpc
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterable, Sequence, Union
 from datetime import datetime
 import logging
 
 from .base_client import AsyncBaseClient
+from .decode_executor import DecodeExecutor
+from .hedging import HedgingPolicy
+from .priority import PriorityScheduler
+from .result_cache import ResultCache
+from .state_mirror import SimulationStateMirror
 from .proto import simulator_pb2
 from .proto import simulator_pb2_grpc
 from .models import *
 from .exceptions import *
 from .utils import proto_to_dict
 
+if TYPE_CHECKING:
+    from .process_graph import ProcessGraphEditor
+    from .schedule_sync import ProductionScheduleSync
+    from .reconcile import ApplyResult
+    from .pool import SimulationPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,8 +50,48 @@ class AsyncSimulationClient(AsyncBaseClient):
         timeout: float = 30.0,
         rate_limit: Optional[float] = None,
         enable_logging: bool = True,
+        compression: Optional[Union[str, grpc.Compression]] = None,
+        max_receive_message_length: Optional[int] = None,
+        max_send_message_length: Optional[int] = None,
+        large_response_warning_ratio: float = 0.8,
+        channel: Optional[grpc.aio.Channel] = None,
+        connect_mode: str = "ping",
+        state_mirror_ttl: float = 5.0,
+        result_cache: Optional[ResultCache] = None,
+        decode_executor: Optional[DecodeExecutor] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        priority_scheduler: Optional[PriorityScheduler] = None,
     ):
-        super().__init__(host, port, max_retries, timeout, rate_limit, enable_logging)
+        super().__init__(
+            host,
+            port,
+            max_retries,
+            timeout,
+            rate_limit,
+            enable_logging,
+            compression=compression,
+            max_receive_message_length=max_receive_message_length,
+            max_send_message_length=max_send_message_length,
+            large_response_warning_ratio=large_response_warning_ratio,
+            channel=channel,
+            connect_mode=connect_mode,
+            hedging=hedging,
+            priority_scheduler=priority_scheduler,
+        )
+        # Последнее состояние симуляций из ответов сервера
+        self.state_mirror = SimulationStateMirror(ttl=state_mirror_ttl)
+        # Ответы метрик завершенных шагов (None - без кэширования)
+        self.result_cache = result_cache
+        # Конвертация больших SimulationResponse вне event loop
+        self.decode_executor = decode_executor
+        # Общие опросы watch_metrics (создаются при первой подписке)
+        self._metrics_watcher = None
+
+    async def close(self):
+        """Остановить опросы watch_metrics и закрыть соединение."""
+        if self._metrics_watcher is not None:
+            await self._metrics_watcher.close()
+        await super().close()
 
     def _create_stub(self, channel: grpc.aio.Channel):
         """Создать stub для SimulationService."""
@@ -107,7 +160,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     self.stub.get_simulation,
                     simulator_pb2.GetSimulationRequest(simulation_id=simulation_id),
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Get simulation")
@@ -122,7 +175,8 @@ class AsyncSimulationClient(AsyncBaseClient):
             simulation_id: ID симуляции
 
         Returns:
-            Dict: Информация о симуляции
+            Dict: Информация о симуляции (формат utils.proto_to_dict: поля
+                со значениями по умолчанию, включая "", присутствуют)
         """
         try:
             async with self._timeout_context():
@@ -163,7 +217,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     self.stub.run_simulation,
                     simulator_pb2.RunSimulationRequest(simulation_id=simulation_id),
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Run simulation")
@@ -225,7 +279,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
                 logger.info(f"Set logist {worker_id} for simulation {simulation_id}")
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to set logist {worker_id}: {e}")
@@ -261,7 +315,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 logger.info(
                     f"Added supplier {supplier_id} to simulation {simulation_id}"
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to add supplier {supplier_id}: {e}")
@@ -292,7 +346,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 logger.info(
                     f"Deleted supplier {supplier_id} from simulation {simulation_id}"
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to delete supplier {supplier_id}: {e}")
@@ -328,7 +382,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 logger.info(
                     f"Set worker {worker_id} on {warehouse_type.value} warehouse"
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to set warehouse worker {worker_id}: {e}")
@@ -362,7 +416,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 logger.info(
                     f"Increased {warehouse_type.value} warehouse size by {size}"
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to increase warehouse size: {e}")
@@ -371,8 +425,12 @@ class AsyncSimulationClient(AsyncBaseClient):
     # ==================== Управление рабочими местами ====================
 
     async def set_worker_on_workplace(
-        self, simulation_id: str, worker_id: str, workplace_id: str
-    ) -> simulator_pb2.SimulationResponse:
+        self,
+        simulation_id: str,
+        worker_id: str,
+        workplace_id: str,
+        decode: bool = True,
+    ) -> Union[SimulationResponse, simulator_pb2.SimulationResponse]:
         """
         Назначить работника на рабочее место.
 
@@ -380,6 +438,9 @@ class AsyncSimulationClient(AsyncBaseClient):
             simulation_id: ID симуляции
             worker_id: ID работника
             workplace_id: ID рабочего места
+            decode: Конвертировать ответ в Pydantic модель. False возвращает
+                protobuf ответ как есть (для пакетных назначений);
+                запись симуляции в state_mirror при этом сбрасывается
 
         Returns:
             SimulationResponse: Обновленная симуляция
@@ -396,7 +457,11 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
                 logger.info(f"Set worker {worker_id} on workplace {workplace_id}")
-                return self._proto_to_simulation_response(response)
+                if not decode:
+                    # Ответ не попадает в зеркало, и оно больше не актуально
+                    self.state_mirror.forget(simulation_id)
+                    return response
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to set worker on workplace: {e}")
@@ -406,14 +471,17 @@ class AsyncSimulationClient(AsyncBaseClient):
     # Используйте update_process_graph для изменения графа процесса
 
     async def unset_worker_on_workplace(
-        self, simulation_id: str, worker_id: str
-    ) -> simulator_pb2.SimulationResponse:
+        self, simulation_id: str, worker_id: str, decode: bool = True
+    ) -> Union[SimulationResponse, simulator_pb2.SimulationResponse]:
         """
         Снять работника с рабочего места.
 
         Args:
             simulation_id: ID симуляции
             worker_id: ID работника
+            decode: Конвертировать ответ в Pydantic модель. False возвращает
+                protobuf ответ как есть (для пакетных назначений);
+                запись симуляции в state_mirror при этом сбрасывается
 
         Returns:
             SimulationResponse: Обновленная симуляция
@@ -428,7 +496,11 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
                 logger.info(f"Unset worker {worker_id} from workplace")
-                return self._proto_to_simulation_response(response)
+                if not decode:
+                    # Ответ не попадает в зеркало, и оно больше не актуально
+                    self.state_mirror.forget(simulation_id)
+                    return response
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to unset worker from workplace: {e}")
@@ -462,7 +534,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
                 logger.info(f"Added tender {tender_id} to simulation {simulation_id}")
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to add tender {tender_id}: {e}")
@@ -493,7 +565,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 logger.info(
                     f"Deleted tender {tender_id} from simulation {simulation_id}"
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to delete tender {tender_id}: {e}")
@@ -526,7 +598,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 logger.info(
                     f"Set defects policy to {policy} for simulation {simulation_id}"
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to set defects policy: {e}")
@@ -563,7 +635,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 logger.info(
                     f"Set sales strategy to {strategy} for simulation {simulation_id}"
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             logger.error(f"Failed to set sales strategy: {e}")
@@ -604,7 +676,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 response = await self._with_retry(
                     self.stub.update_process_graph, request
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Update process graph")
@@ -822,7 +894,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 response = await self._with_retry(
                     self.stub.get_defect_policies, request
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Get defect policies")
@@ -882,7 +954,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 response = await self._with_retry(
                     self.stub.set_quality_inspection, request
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Set quality inspection")
@@ -914,7 +986,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 response = await self._with_retry(
                     self.stub.set_equipment_maintenance_interval, request
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Set equipment maintenance interval")
@@ -944,7 +1016,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 response = await self._with_retry(
                     self.stub.set_certification_status, request
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Set certification status")
@@ -974,7 +1046,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                 response = await self._with_retry(
                     self.stub.set_lean_improvement_status, request
                 )
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Set lean improvement status")
@@ -1241,6 +1313,111 @@ class AsyncSimulationClient(AsyncBaseClient):
         except grpc.RpcError as e:
             self._handle_grpc_error(e, "Get available sales strategies")
 
+    # ==================== Зеркало состояния ====================
+
+    async def get_current_simulation(
+        self, simulation_id: str, max_age: Optional[float] = None
+    ) -> Simulation:
+        """
+        Получить текущее состояние симуляции.
+
+        Состояние берется из зеркала (последний ответ любого метода,
+        вернувшего симуляцию), если оно не старше max_age; иначе
+        выполняется get_simulation.
+
+        Args:
+            simulation_id: ID симуляции
+            max_age: Допустимый возраст состояния в секундах
+                (по умолчанию state_mirror_ttl)
+
+        Returns:
+            Simulation: Состояние симуляции
+        """
+        simulation = self.state_mirror.get(simulation_id, max_age)
+        if simulation is None:
+            response = await self.get_simulation(simulation_id)
+            simulation = response.simulations
+            self.state_mirror.record(simulation, response.timestamp)
+        return simulation
+
+    async def get_current_step(self, simulation_id: str) -> int:
+        """Текущий шаг симуляции (из зеркала, если оно свежее)."""
+        return (await self.get_current_simulation(simulation_id)).step
+
+    async def get_current_suppliers(self, simulation_id: str) -> List[Supplier]:
+        """Текущие поставщики симуляции (из зеркала, если оно свежее)."""
+        parameters = await self._get_current_parameters(simulation_id)
+        return list(parameters.suppliers) if parameters else []
+
+    async def get_current_process_graph(
+        self, simulation_id: str
+    ) -> Optional[ProcessGraph]:
+        """Текущий граф процесса симуляции (из зеркала, если оно свежее)."""
+        parameters = await self._get_current_parameters(simulation_id)
+        return parameters.processes if parameters else None
+
+    async def _get_current_parameters(
+        self, simulation_id: str
+    ) -> Optional[SimulationParameters]:
+        """Последние параметры симуляции."""
+        simulation = await self.get_current_simulation(simulation_id)
+        return simulation.parameters[-1] if simulation.parameters else None
+
+    # ==================== Кэш результатов ====================
+
+    async def _fetch_step_result(
+        self, metric_kind: str, simulation_id: str, step: int, func, request, response_type
+    ):
+        """
+        Выполнить запрос метрик шага через result_cache.
+
+        При попадании ответ восстанавливается из сохраненных байтов без
+        запроса к серверу. Ответ сохраняется, только если шаг уже завершен
+        (см. _is_step_final): метрики текущего шага еще меняются.
+
+        Args:
+            metric_kind: Вид метрик (ключ кэша)
+            simulation_id: ID симуляции
+            step: Номер шага
+            func: Метод stub
+            request: Protobuf запрос
+            response_type: Класс protobuf ответа
+
+        Returns:
+            Protobuf ответ
+        """
+        cache = self.result_cache
+        if cache is not None:
+            payload = await cache.aget(simulation_id, step, metric_kind)
+            if payload is not None:
+                return response_type.FromString(payload)
+
+        await self._rate_limit()
+        response = await self._with_retry(func, request)
+
+        if cache is not None and self._is_step_final(simulation_id, step):
+            await cache.aput(
+                simulation_id, step, metric_kind, response.SerializeToString()
+            )
+        return response
+
+    def _is_step_final(self, simulation_id: str, step: int) -> bool:
+        """
+        Завершен ли шаг симуляции по последнему известному состоянию.
+
+        Шаг завершен, если симуляция завершена, ушла дальше этого шага или
+        уже содержит результаты этого шага. Если состояние симуляции
+        неизвестно, шаг считается незавершенным.
+        """
+        simulation = self.state_mirror.get(simulation_id, max_age=float("inf"))
+        if simulation is None:
+            return False
+        return (
+            simulation.is_completed
+            or step < simulation.step
+            or any(result.step == step for result in simulation.results)
+        )
+
     # ==================== Вспомогательные методы ====================
 
     def _warehouse_type_to_proto(self, warehouse_type: WarehouseType) -> int:
@@ -1263,15 +1440,11 @@ class AsyncSimulationClient(AsyncBaseClient):
             int: step симуляции (>= 1) или 1, если не удалось получить/step=0
         """
         try:
-            sim_response = await self.get_simulation(simulation_id)
+            step = await self.get_current_step(simulation_id)
             # В сервисе step по факту обязателен: на сервере часто используется `if request.step:`,
             # и при step=0 он считается "не передан" (falsy), что приводит к падению.
             # Поэтому гарантируем step >= 1.
-            return (
-                sim_response.simulations.step
-                if sim_response.simulations.step > 0
-                else 1
-            )
+            return step if step > 0 else 1
         except Exception as e:
             logger.warning(
                 f"Failed to get step from simulation {simulation_id}: {e}, using step=1"
@@ -1280,6 +1453,32 @@ class AsyncSimulationClient(AsyncBaseClient):
 
     def _proto_to_simulation_response(self, response) -> SimulationResponse:
         """Конвертировать protobuf SimulationResponse в Pydantic модель."""
+        simulation_response = self._build_simulation_response(response)
+        self.state_mirror.record(
+            simulation_response.simulations, simulation_response.timestamp
+        )
+        return simulation_response
+
+    async def _decode_simulation_response(self, response) -> SimulationResponse:
+        """
+        Конвертировать SimulationResponse, при необходимости вне event loop.
+
+        С decode_executor большие ответы конвертируются в его пуле;
+        без него - как _proto_to_simulation_response.
+        """
+        if self.decode_executor is None:
+            return self._proto_to_simulation_response(response)
+
+        simulation_response = await self.decode_executor.decode_simulation_response(
+            self, response
+        )
+        self.state_mirror.record(
+            simulation_response.simulations, simulation_response.timestamp
+        )
+        return simulation_response
+
+    def _build_simulation_response(self, response) -> SimulationResponse:
+        """Pydantic модель SimulationResponse без побочных эффектов."""
         # В proto файле поле называется simulations (множественное число)
         sim = (
             response.simulations
@@ -1906,21 +2105,53 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except Exception as e:
             logger.error(f"Failed to update process graph: {e}")
             raise
 
+    def edit_process_graph(
+        self,
+        simulation_id: str,
+        source: str = "workshop_plan",
+        graph: Optional[ProcessGraph] = None,
+    ) -> "ProcessGraphEditor":
+        """
+        Редактировать граф процесса с отправкой одним update_process_graph.
+
+        Пример:
+        ```python
+        async with client.edit_process_graph(simulation_id) as editor:
+            editor.add_route("wp_1", "wp_2", length=3)
+            editor.set_start_node("wp_1")
+        ```
+
+        Args:
+            simulation_id: ID симуляции
+            source: Откуда загрузить граф: "workshop_plan" или "parameters"
+            graph: Уже известный граф (без запроса к серверу)
+
+        Returns:
+            ProcessGraphEditor: Редактор (асинхронный контекстный менеджер)
+        """
+        from .process_graph import ProcessGraphEditor
+
+        return ProcessGraphEditor(self, simulation_id, source=source, graph=graph)
+
     async def set_production_plan_row(
-        self, simulation_id: str, row: "ProductionPlanRow"
-    ) -> SimulationResponse:
+        self, simulation_id: str, row: "ProductionPlanRow", decode: bool = True
+    ) -> Union[SimulationResponse, simulator_pb2.SimulationResponse]:
         """
         Установить строку производственного плана.
 
         Args:
             simulation_id: ID симуляции
             row: Строка производственного плана
+            decode: Конвертировать ответ в Pydantic модель. False возвращает
+                protobuf ответ как есть (для пакетных обновлений, где
+                промежуточные состояния симуляции не нужны);
+                запись симуляции в state_mirror при этом сбрасывается
 
         Returns:
             SimulationResponse: Обновленная симуляция
@@ -1936,12 +2167,142 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
-                return self._proto_to_simulation_response(response)
+                if not decode:
+                    # Ответ не попадает в зеркало, и оно больше не актуально
+                    self.state_mirror.forget(simulation_id)
+                    return response
+                return await self._decode_simulation_response(response)
 
         except Exception as e:
             logger.error(f"Failed to set production plan row: {e}")
             raise
 
+    def production_schedule_sync(
+        self, simulation_id: str, max_concurrency: int = 8
+    ) -> "ProductionScheduleSync":
+        """
+        Создать синхронизатор производственного плана.
+
+        Args:
+            simulation_id: ID симуляции
+            max_concurrency: Максимум одновременных set_production_plan_row
+
+        Returns:
+            ProductionScheduleSync: Синхронизатор
+        """
+        from .schedule_sync import ProductionScheduleSync
+
+        return ProductionScheduleSync(self, simulation_id, max_concurrency)
+
+    def simulation_pool(
+        self, size: int = 4, refill_rate: float = 2.0
+    ) -> "SimulationPool":
+        """
+        Создать пул заранее созданных симуляций.
+
+        Args:
+            size: Сколько готовых симуляций держать
+            refill_rate: Максимум созданий в секунду при пополнении
+
+        Returns:
+            SimulationPool: Пул (пополнение запускается в start())
+        """
+        from .pool import SimulationPool
+
+        return SimulationPool(self, size=size, refill_rate=refill_rate)
+
+    async def apply(
+        self,
+        simulation_id: str,
+        desired: SimulationParameters,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+    ) -> "ApplyResult":
+        """
+        Привести параметры симуляции к желаемым минимальным набором вызовов.
+
+        Сравнивает желаемые параметры с текущими (поставщики, в том числе
+        запасные, тендеры, логист, склады, политики, сертификации,
+        улучшения, граф процесса, строки плана) и выполняет только нужные
+        add_*/delete_*/set_* вызовы по фазам: удаления, добавления,
+        настройки, граф, план.
+
+        Args:
+            simulation_id: ID симуляции
+            desired: Желаемые параметры
+            max_concurrency: Максимум одновременных вызовов одной фазы
+            dry_run: Только вычислить вызовы, не выполняя их
+
+        Returns:
+            ApplyResult: Выполненные вызовы, неприменимые изменения и
+                состояние симуляции после последнего вызова
+
+        Raises:
+            SimulationError: Часть вызовов завершилась ошибкой
+        """
+        from .reconcile import SimulationReconciler
+
+        reconciler = SimulationReconciler(self, simulation_id, max_concurrency)
+        return await reconciler.apply(desired, dry_run=dry_run)
+
+    async def staff_workplaces(
+        self,
+        simulation_id: str,
+        workers: List[Worker],
+        workplaces: Optional[List[Workplace]] = None,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        salary_weight: float = 1.0,
+        qualification_weight: float = 0.1,
+    ) -> "ApplyResult":
+        """
+        Подобрать и назначить работников на рабочие места.
+
+        Назначения вычисляются венгерским алгоритмом (см. solve_staffing):
+        специальность и квалификация должны подходить, среди допустимых
+        назначений выбираются дешевые по зарплате. Конфликтующие текущие
+        назначения снимаются до новых; ответы промежуточных вызовов не
+        декодируются.
+
+        Args:
+            simulation_id: ID симуляции
+            workers: Доступные работники (например, get_all_workers_simple)
+            workplaces: Рабочие места; по умолчанию - из графа процесса
+                текущих параметров симуляции. Текущие назначения всегда
+                берутся из графа процесса
+            max_concurrency: Максимум одновременных вызовов
+            dry_run: Только вычислить вызовы, не выполняя их
+            salary_weight: Вес зарплаты в стоимости назначения
+            qualification_weight: Вес избыточной квалификации
+
+        Returns:
+            ApplyResult: Выполненные вызовы; в skipped - рабочие места
+                без подходящего работника
+
+        Raises:
+            SimulationError: Часть вызовов завершилась ошибкой
+        """
+        from .reconcile import SimulationReconciler
+        from .staffing import solve_staffing, staffing_actions
+
+        # Текущие назначения - по всему графу: работник, которого план ставит
+        # на место из workplaces, может стоять на месте вне этого списка
+        parameters = await self._get_current_parameters(simulation_id)
+        processes = parameters.processes if parameters else None
+        graph_workplaces = processes.workplaces if processes else []
+        if workplaces is None:
+            workplaces = graph_workplaces
+
+        plan = solve_staffing(workers, workplaces, salary_weight, qualification_weight)
+        planned = staffing_actions(plan, workplaces, graph_workplaces)
+        for message in planned.skipped:
+            logger.warning(f"Simulation {simulation_id}: {message}")
+        if dry_run or not planned.applied:
+            return planned
+
+        reconciler = SimulationReconciler(self, simulation_id, max_concurrency)
+        return await reconciler.execute(planned)
+
     async def get_factory_metrics(
         self, simulation_id: str, step: int = 1
     ) -> "FactoryMetricsResponse":
@@ -1961,13 +2322,16 @@ class AsyncSimulationClient(AsyncBaseClient):
 
         try:
             async with self._timeout_context():
-                await self._rate_limit()
                 request = simulator_pb2.GetMetricsRequest(
                     simulation_id=simulation_id, step=step
                 )
-                response = await self._with_retry(
+                response = await self._fetch_step_result(
+                    "factory_metrics",
+                    simulation_id,
+                    step,
                     self.stub.get_factory_metrics,
                     request,
+                    simulator_pb2.FactoryMetricsResponse,
                 )
 
                 return self._proto_to_factory_metrics_response(response)
@@ -1995,13 +2359,16 @@ class AsyncSimulationClient(AsyncBaseClient):
 
         try:
             async with self._timeout_context():
-                await self._rate_limit()
                 request = simulator_pb2.GetMetricsRequest(
                     simulation_id=simulation_id, step=step
                 )
-                response = await self._with_retry(
+                response = await self._fetch_step_result(
+                    "production_metrics",
+                    simulation_id,
+                    step,
                     self.stub.get_production_metrics,
                     request,
+                    simulator_pb2.ProductionMetricsResponse,
                 )
 
                 return self._proto_to_production_metrics_response(response)
@@ -2029,13 +2396,16 @@ class AsyncSimulationClient(AsyncBaseClient):
 
         try:
             async with self._timeout_context():
-                await self._rate_limit()
                 request = simulator_pb2.GetMetricsRequest(
                     simulation_id=simulation_id, step=step
                 )
-                response = await self._with_retry(
+                response = await self._fetch_step_result(
+                    "quality_metrics",
+                    simulation_id,
+                    step,
                     self.stub.get_quality_metrics,
                     request,
+                    simulator_pb2.QualityMetricsResponse,
                 )
 
                 return self._proto_to_quality_metrics_response(response)
@@ -2063,13 +2433,16 @@ class AsyncSimulationClient(AsyncBaseClient):
 
         try:
             async with self._timeout_context():
-                await self._rate_limit()
                 request = simulator_pb2.GetMetricsRequest(
                     simulation_id=simulation_id, step=step
                 )
-                response = await self._with_retry(
+                response = await self._fetch_step_result(
+                    "engineering_metrics",
+                    simulation_id,
+                    step,
                     self.stub.get_engineering_metrics,
                     request,
+                    simulator_pb2.EngineeringMetricsResponse,
                 )
 
                 return self._proto_to_engineering_metrics_response(response)
@@ -2097,13 +2470,16 @@ class AsyncSimulationClient(AsyncBaseClient):
 
         try:
             async with self._timeout_context():
-                await self._rate_limit()
                 request = simulator_pb2.GetMetricsRequest(
                     simulation_id=simulation_id, step=step
                 )
-                response = await self._with_retry(
+                response = await self._fetch_step_result(
+                    "commercial_metrics",
+                    simulation_id,
+                    step,
                     self.stub.get_commercial_metrics,
                     request,
+                    simulator_pb2.CommercialMetricsResponse,
                 )
 
                 return self._proto_to_commercial_metrics_response(response)
@@ -2131,13 +2507,16 @@ class AsyncSimulationClient(AsyncBaseClient):
 
         try:
             async with self._timeout_context():
-                await self._rate_limit()
                 request = simulator_pb2.GetMetricsRequest(
                     simulation_id=simulation_id, step=step
                 )
-                response = await self._with_retry(
+                response = await self._fetch_step_result(
+                    "procurement_metrics",
+                    simulation_id,
+                    step,
                     self.stub.get_procurement_metrics,
                     request,
+                    simulator_pb2.ProcurementMetricsResponse,
                 )
 
                 return self._proto_to_procurement_metrics_response(response)
@@ -2160,12 +2539,15 @@ class AsyncSimulationClient(AsyncBaseClient):
         """
         try:
             async with self._timeout_context():
-                await self._rate_limit()
-                response = await self._with_retry(
+                response = await self._fetch_step_result(
+                    "all_metrics",
+                    simulation_id,
+                    step,
                     self.stub.get_all_metrics,
                     simulator_pb2.GetAllMetricsRequest(
                         simulation_id=simulation_id, step=step
                     ),
+                    simulator_pb2.AllMetricsResponse,
                 )
 
                 return self._proto_to_all_metrics_response(response)
@@ -2174,6 +2556,113 @@ class AsyncSimulationClient(AsyncBaseClient):
             logger.error(f"Failed to get all metrics: {e}")
             raise
 
+    async def fetch_metrics_history(
+        self,
+        simulation_id: str,
+        steps: Iterable[int],
+        kinds: Sequence[str] = ("factory",),
+        max_concurrency: int = 8,
+    ) -> Dict[str, Any]:
+        """
+        Получить метрики нескольких шагов в виде временных рядов NumPy.
+
+        Шаги запрашиваются параллельно, метрики завершенных шагов берутся
+        из result_cache, если он задан. Требуется numpy.
+
+        Args:
+            simulation_id: ID симуляции
+            steps: Номера шагов
+            kinds: Виды метрик: "factory", "production", "quality",
+                "engineering", "commercial", "procurement"
+            max_concurrency: Максимум одновременных запросов
+
+        Returns:
+            Dict[str, numpy.ndarray]: Столбец "step" и столбцы
+                "<kind>.<metric>" по шагам
+        """
+        from .metrics_history import fetch_metrics_history
+
+        return await fetch_metrics_history(
+            self, simulation_id, steps, kinds, max_concurrency
+        )
+
+    async def watch_metrics(
+        self,
+        simulation_id: str,
+        interval: float = 1.0,
+        step: Optional[int] = None,
+    ) -> AsyncIterator["AllMetricsResponse"]:
+        """
+        Подписаться на изменения метрик симуляции.
+
+        Все подписчики одной симуляции разделяют один опрос get_all_metrics.
+        Метрики отправляются только при изменении (сравниваются protobuf
+        байты без timestamp); пока они не меняются, интервал опроса
+        удваивается до 30 секунд. Временные ошибки сети опрос не прерывают
+        (см. metrics_watch). Опрос останавливается, когда закрывается
+        последний подписчик; чтобы это происходило сразу при выходе из
+        цикла, используйте contextlib.aclosing(client.watch_metrics(...)).
+
+        Args:
+            simulation_id: ID симуляции
+            interval: Интервал опроса в секундах
+            step: Шаг (None - текущий шаг симуляции)
+
+        Yields:
+            AllMetricsResponse: Изменившиеся метрики
+        """
+        if self._metrics_watcher is None:
+            from .metrics_watch import MetricsWatcher
+
+            self._metrics_watcher = MetricsWatcher(self)
+
+        stream = self._metrics_watcher.watch(simulation_id, interval, step)
+        async with contextlib.aclosing(stream):
+            async for metrics in stream:
+                yield metrics
+
+    async def get_simulation_results_by_steps(
+        self, simulation_id: str, steps: List[int], max_concurrency: int = 4
+    ) -> List[SimulationResults]:
+        """
+        Получить результаты симуляции по шагам через get_all_metrics(step).
+
+        Запасной путь для длинных симуляций, у которых полный
+        SimulationResponse не помещается в max_receive_message_length
+        (MessageTooLargeError): вместо всей истории parameters/results
+        запрашиваются метрики отдельных шагов, каждое сообщение небольшое.
+
+        В метриках нет profit и cost, поэтому они заполняются нулями,
+        а profitability берется из FactoryMetrics.
+
+        Args:
+            simulation_id: ID симуляции
+            steps: Номера шагов
+            max_concurrency: Максимальное число одновременных запросов
+
+        Returns:
+            List[SimulationResults]: Результаты в порядке steps
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(step: int) -> SimulationResults:
+            async with semaphore:
+                metrics = await self.get_all_metrics(simulation_id, step)
+            return SimulationResults(
+                profit=0,
+                cost=0,
+                profitability=metrics.factory.profitability,
+                factory_metrics=metrics.factory,
+                production_metrics=metrics.production,
+                quality_metrics=metrics.quality,
+                engineering_metrics=metrics.engineering,
+                commercial_metrics=metrics.commercial,
+                procurement_metrics=metrics.procurement,
+                step=step,
+            )
+
+        return list(await asyncio.gather(*(fetch(step) for step in steps)))
+
     async def get_production_schedule(
         self, simulation_id: str
     ) -> "ProductionScheduleResponse":
@@ -2255,14 +2744,17 @@ class AsyncSimulationClient(AsyncBaseClient):
             raise
 
     async def get_warehouse_load_chart(
-        self, simulation_id: str, warehouse_id: str
-    ) -> "WarehouseLoadChartResponse":
+        self, simulation_id: str, warehouse_id: str, decode: bool = True
+    ) -> Union["WarehouseLoadChartResponse", simulator_pb2.WarehouseLoadChartResponse]:
         """
         Получить график загрузки склада.
 
         Args:
             simulation_id: ID симуляции
             warehouse_id: ID склада
+            decode: Конвертировать ответ в Pydantic модель. False возвращает
+                protobuf ответ как есть, например для arrays.load_chart_array
+                без создания модели на каждую точку
 
         Returns:
             WarehouseLoadChartResponse: График загрузки склада
@@ -2277,6 +2769,8 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
+                if not decode:
+                    return response
                 return self._proto_to_warehouse_load_chart_response(response)
 
         except Exception as e:
@@ -2363,16 +2857,38 @@ class AsyncSimulationClient(AsyncBaseClient):
             logger.error(f"Failed to get defect policies: {e}")
             raise
 
-    async def validate_configuration(self, simulation_id: str) -> "ValidationResponse":
+    async def validate_configuration(
+        self,
+        simulation_id: str,
+        parameters: Optional[SimulationParameters] = None,
+        required_materials: Optional[List["RequiredMaterial"]] = None,
+    ) -> "ValidationResponse":
         """
         Валидировать конфигурацию симуляции.
 
+        Если переданы parameters, сначала выполняется локальная проверка
+        (validation.validate_parameters). При ошибках ее результат
+        возвращается сразу, без запроса к серверу.
+
         Args:
             simulation_id: ID симуляции
+            parameters: Текущие параметры симуляции для локальной проверки
+            required_materials: Требуемые материалы для проверки поставщиков
 
         Returns:
             ValidationResponse: Результат валидации
         """
+        if parameters is not None:
+            from .validation import validate_parameters
+
+            local = validate_parameters(parameters, required_materials)
+            if not local.is_valid:
+                logger.info(
+                    f"Configuration of simulation {simulation_id} failed local "
+                    f"validation with {len(local.errors)} errors, server call skipped"
+                )
+                return local
+
         try:
             async with self._timeout_context():
                 await self._rate_limit()
@@ -2415,7 +2931,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except Exception as e:
             logger.error(f"Failed to set quality inspection: {e}")
@@ -2447,7 +2963,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except Exception as e:
             logger.error(f"Failed to set delivery period: {e}")
@@ -2479,7 +2995,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except Exception as e:
             logger.error(f"Failed to set equipment maintenance interval: {e}")
@@ -2511,7 +3027,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except Exception as e:
             logger.error(f"Failed to set certification status: {e}")
@@ -2543,7 +3059,7 @@ class AsyncSimulationClient(AsyncBaseClient):
                     ),
                 )
 
-                return self._proto_to_simulation_response(response)
+                return await self._decode_simulation_response(response)
 
         except Exception as e:
             logger.error(f"Failed to set lean improvement status: {e}")
@@ -0,0 +1,261 @@
+"""
+Назначение работников на рабочие места.
+
+Рабочее место требует специальность (required_speciality) и
+квалификацию не ниже required_qualification. solve_staffing строит
+матрицу стоимостей назначений (numpy): зарплата работника плюс штраф за
+избыточную квалификацию; стоимость недопустимых пар превышает сумму
+стоимостей любого набора допустимых. Затем матрица решается венгерским
+алгоритмом, так что штатных мест заполняется максимум, а при равенстве
+выбирается минимальная стоимость.
+
+Применение выполняет SimulationReconciler.execute: сначала параллельно
+снимаются работники, чьи назначения конфликтуют с планом, затем
+выполняются назначения, без декодирования промежуточных ответов.
+
+```python
+workers = await client.get_all_workers_simple()
+result = await client.staff_workplaces(simulation_id, workers)
+print(len(result.applied), result.skipped)
+```
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import Field
+
+from .models import BaseModel, Worker, Workplace
+from .reconcile import PHASE_CONFIGURE, PHASE_REMOVE, ApplyResult, ReconcileAction
+from .utils import require_numpy
+
+logger = logging.getLogger(__name__)
+
+
+def linear_sum_assignment(cost):
+    """
+    Назначение минимальной стоимости (венгерский алгоритм).
+
+    Алгоритм кратчайших увеличивающих путей с потенциалами, O(n^2 m);
+    поиск минимума по столбцам векторизован.
+
+    Args:
+        cost: Матрица (n, m) конечных стоимостей
+
+    Returns:
+        Tuple[ndarray, ndarray]: Номера строк (по возрастанию) и
+            назначенных им столбцов; назначается min(n, m) пар
+    """
+    np = require_numpy()
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        empty = np.zeros(0, dtype=int)
+        return empty, empty
+
+    # Индексы с 1; столбец 0 - фиктивный корень пути
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    row_of = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+    for row in range(1, n + 1):
+        row_of[0] = row
+        column = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current = row_of[column]
+            free = ~used[1:]
+            reduced = cost[current - 1] - u[current] - v[1:]
+            better = free & (reduced < min_reduced[1:])
+            min_reduced[1:][better] = reduced[better]
+            way[1:][better] = column
+            candidates = np.where(free, min_reduced[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+            u[row_of[used]] += delta
+            v[used] -= delta
+            min_reduced[~used] -= delta
+            column = next_column
+            if row_of[column] == 0:
+                break
+        # Чередование вдоль найденного пути
+        while column:
+            previous = way[column]
+            row_of[column] = row_of[previous]
+            column = previous
+
+    assigned = np.nonzero(row_of[1:])[0]
+    rows = row_of[1:][assigned] - 1
+    if transposed:
+        rows, assigned = assigned, rows
+    order = np.argsort(rows)
+    return rows[order], assigned[order]
+
+
+def assignment_costs(
+    workers: Sequence[Worker],
+    workplaces: Sequence[Workplace],
+    salary_weight: float = 1.0,
+    qualification_weight: float = 0.1,
+):
+    """
+    Матрица стоимостей назначений (работники x рабочие места).
+
+    Стоимость допустимой пары - доля зарплаты от максимальной с весом
+    salary_weight плюс избыточная квалификация с весом
+    qualification_weight. Пустая required_speciality допускает любую
+    специальность. Недопустимая пара стоит больше, чем назначение всех
+    работников по самой дорогой допустимой паре, при любых весах.
+
+    Returns:
+        Tuple[ndarray, ndarray]: Стоимости и маска допустимых пар
+    """
+    np = require_numpy()
+    salary = np.array([worker.salary for worker in workers], dtype=float)
+    qualification = np.array([worker.qualification for worker in workers], dtype=float)
+    required = np.array(
+        [workplace.required_qualification for workplace in workplaces], dtype=float
+    )
+
+    codes: Dict[str, int] = {}
+    specialty = np.array(
+        [codes.setdefault(worker.specialty, len(codes)) for worker in workers]
+    )
+    required_specialty = np.array(
+        [
+            codes.get(workplace.required_speciality, -1)
+            if workplace.required_speciality
+            else -2
+            for workplace in workplaces
+        ]
+    )
+
+    feasible = (
+        (specialty[:, None] == required_specialty[None, :])
+        | (required_specialty[None, :] == -2)
+    ) & (qualification[:, None] >= required[None, :])
+    max_salary = salary.max() if len(salary) and salary.max() > 0 else 1.0
+    cost = salary_weight * (salary[:, None] / max_salary) + qualification_weight * (
+        qualification[:, None] - required[None, :]
+    )
+    largest = float(np.abs(cost[feasible]).max(initial=0.0))
+    infeasible = (len(workers) + 1) * (largest + 1.0)
+    return np.where(feasible, cost, infeasible), feasible
+
+
+class StaffingPlan(BaseModel):
+    """Назначения работников."""
+
+    # ID рабочего места -> ID работника
+    assignments: Dict[str, str] = Field(default_factory=dict)
+    # Рабочие места без подходящего работника
+    unassigned: List[str] = Field(default_factory=list)
+    cost: float = 0.0
+
+
+def solve_staffing(
+    workers: Sequence[Worker],
+    workplaces: Sequence[Workplace],
+    salary_weight: float = 1.0,
+    qualification_weight: float = 0.1,
+) -> StaffingPlan:
+    """
+    Подобрать работников на рабочие места.
+
+    Args:
+        workers: Доступные работники
+        workplaces: Рабочие места
+        salary_weight: Вес зарплаты в стоимости назначения
+        qualification_weight: Вес избыточной квалификации
+
+    Returns:
+        StaffingPlan: Назначения и рабочие места без работника
+    """
+    plan = StaffingPlan()
+    if workers and workplaces:
+        cost, feasible = assignment_costs(
+            workers, workplaces, salary_weight, qualification_weight
+        )
+        for row, column in zip(*linear_sum_assignment(cost)):
+            if not feasible[row, column]:
+                continue
+            workplace_id = workplaces[column].workplace_id
+            plan.assignments[workplace_id] = workers[row].worker_id
+            plan.cost += float(cost[row, column])
+    plan.unassigned = [
+        workplace.workplace_id
+        for workplace in workplaces
+        if workplace.workplace_id not in plan.assignments
+    ]
+    return plan
+
+
+def staffing_actions(
+    plan: StaffingPlan,
+    workplaces: Sequence[Workplace],
+    graph_workplaces: Optional[Sequence[Workplace]] = None,
+) -> ApplyResult:
+    """
+    Вызовы для перехода от текущих назначений к плану.
+
+    Снимаются работники, стоящие на рабочем месте плана с другим
+    назначением, и работники, которых план ставит на другое место, в том
+    числе на местах графа вне workplaces. Совпадающие назначения не
+    трогаются.
+
+    Args:
+        plan: План назначений
+        workplaces: Рабочие места плана
+        graph_workplaces: Все рабочие места графа процесса; текущие
+            назначения берутся из них (по умолчанию - из workplaces)
+
+    Returns:
+        ApplyResult: Вызовы (не выполненные) и места без работника
+    """
+    if graph_workplaces is None:
+        graph_workplaces = workplaces
+    current: Dict[str, str] = {
+        workplace.workplace_id: workplace.worker.worker_id
+        for workplace in graph_workplaces
+        if workplace.worker is not None
+    }
+    planned_workers = set(plan.assignments.values())
+    actions: List[ReconcileAction] = []
+
+    for workplace_id, worker_id in current.items():
+        target = plan.assignments.get(workplace_id)
+        if target == worker_id:
+            continue
+        if target is not None or worker_id in planned_workers:
+            actions.append(
+                ReconcileAction(
+                    phase=PHASE_REMOVE,
+                    method="unset_worker_on_workplace",
+                    target=worker_id,
+                    kwargs={"worker_id": worker_id},
+                )
+            )
+
+    for workplace_id, worker_id in plan.assignments.items():
+        if current.get(workplace_id) != worker_id:
+            actions.append(
+                ReconcileAction(
+                    phase=PHASE_CONFIGURE,
+                    method="set_worker_on_workplace",
+                    target=workplace_id,
+                    kwargs={"worker_id": worker_id, "workplace_id": workplace_id},
+                )
+            )
+
+    return ApplyResult(
+        applied=actions,
+        skipped=[
+            f"workplace {workplace_id}: no qualified worker"
+            for workplace_id in plan.unassigned
+        ],
+    )
@@ -0,0 +1,112 @@
+"""
+Локальное зеркало состояния симуляций.
+
+Каждый изменяющий RPC SimulationService возвращает полную обновленную
+Simulation. AsyncSimulationClient записывает ее в зеркало, и чтения
+текущего шага, поставщиков или графа обслуживаются из него, пока запись
+свежая, без повторного get_simulation.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .models import Simulation
+
+# Версия записи: (step, timestamp ответа)
+Version = Tuple[int, str]
+
+
+class SimulationStateMirror:
+    """
+    Последняя известная Simulation по simulation_id.
+
+    Запись заменяется только ответом с версией не ниже текущей, поэтому
+    ответы параллельных запросов, пришедшие не по порядку, не откатывают
+    состояние назад. Число записей ограничено (LRU).
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 256):
+        """
+        Args:
+            ttl: Время (секунды), в течение которого запись считается свежей
+            max_entries: Максимум симуляций в зеркале
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Simulation, Version, float]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, simulation_id: str) -> bool:
+        return simulation_id in self._entries
+
+    def record(self, simulation: Simulation, timestamp: str = "") -> bool:
+        """
+        Записать состояние симуляции из ответа сервера.
+
+        Args:
+            simulation: Симуляция из ответа
+            timestamp: timestamp ответа (ISO формат)
+
+        Returns:
+            bool: True, если запись обновлена (версия не старее текущей)
+        """
+        simulation_id = simulation.simulation_id
+        if not simulation_id:
+            return False
+
+        version = (simulation.step, timestamp)
+        current = self._entries.get(simulation_id)
+        if current is not None and version < current[1]:
+            return False
+
+        self._entries[simulation_id] = (simulation, version, time.monotonic())
+        self._entries.move_to_end(simulation_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def get(
+        self, simulation_id: str, max_age: Optional[float] = None
+    ) -> Optional[Simulation]:
+        """
+        Получить свежее состояние симуляции.
+
+        Args:
+            simulation_id: ID симуляции
+            max_age: Допустимый возраст записи (по умолчанию ttl)
+
+        Returns:
+            Optional[Simulation]: Симуляция или None, если записи нет или она устарела
+        """
+        entry = self._entries.get(simulation_id)
+        max_age = self.ttl if max_age is None else max_age
+        if entry is None or time.monotonic() - entry[2] > max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(simulation_id)
+        return entry[0]
+
+    def version(self, simulation_id: str) -> Optional[Version]:
+        """Версия (step, timestamp) последней записи."""
+        entry = self._entries.get(simulation_id)
+        return entry[1] if entry is not None else None
+
+    def forget(self, simulation_id: Optional[str] = None) -> None:
+        """Удалить запись симуляции (None - очистить зеркало)."""
+        if simulation_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(simulation_id, None)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Статистика попаданий."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,299 @@
+"""
+Индекс каталога поставщиков.
+
+Выбор основных и запасных поставщиков - это перебор get_all_suppliers по
+material_type с компромиссом между стоимостью, надежностью, качеством и
+сроком поставки. SupplierIndex раскладывает поставщиков по материалам,
+поддерживает Парето-фронт каждого материала (поставщики, которых никто не
+превосходит по всем критериям сразу) и отвечает на запросы top-k по
+взвешенной оценке. Индекс обновляется по одному поставщику, без
+перестроения.
+
+```python
+index = await client.supplier_index()
+best = index.top_k("steel", k=3, weights={"cost": 2, "reliability": 1})
+selection = index.select(["steel", "plastic"], backups=1)
+await client.add_selected_suppliers(simulation_id, selection)
+```
+"""
+
+import heapq
+import logging
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from pydantic import Field
+
+from .exceptions import ValidationError
+from .models import BaseModel, Supplier
+
+logger = logging.getLogger(__name__)
+
+# Критерий -> True, если больше - лучше
+SUPPLIER_CRITERIA: Dict[str, bool] = {
+    "cost": False,
+    "reliability": True,
+    "product_quality": True,
+    "delivery_period": False,
+}
+
+
+def dominates(first: Supplier, second: Supplier) -> bool:
+    """Не хуже по всем критериям и лучше хотя бы по одному."""
+    better = False
+    for criterion, maximize in SUPPLIER_CRITERIA.items():
+        a = getattr(first, criterion)
+        b = getattr(second, criterion)
+        if not maximize:
+            a, b = -a, -b
+        if a < b:
+            return False
+        if a > b:
+            better = True
+    return better
+
+
+def pareto_front(suppliers: Iterable[Supplier]) -> List[Supplier]:
+    """Поставщики, которых не доминирует никто из списка."""
+    front: List[Supplier] = []
+    for supplier in suppliers:
+        _insert_into_front(front, supplier)
+    return front
+
+
+def _insert_into_front(front: List[Supplier], supplier: Supplier) -> None:
+    if any(dominates(member, supplier) for member in front):
+        return
+    front[:] = [member for member in front if not dominates(supplier, member)]
+    front.append(supplier)
+
+
+class SupplierSelection(BaseModel):
+    """Выбранные поставщики для add_supplier(is_backup=...)."""
+
+    supplier_ids: List[str] = Field(default_factory=list)
+    backup_supplier_ids: List[str] = Field(default_factory=list)
+    # Материалы без поставщиков в индексе
+    missing: List[str] = Field(default_factory=list)
+
+    def config(self) -> Dict[str, List[str]]:
+        """Ключи конфигурации run_complete_scenario."""
+        return {
+            "supplier_ids": list(self.supplier_ids),
+            "backup_supplier_ids": list(self.backup_supplier_ids),
+        }
+
+
+class _Bucket:
+    """Поставщики одного материала."""
+
+    def __init__(self):
+        self.suppliers: Dict[str, Supplier] = {}
+        self.front: List[Supplier] = []
+        # Критерий -> (min, max); None - пересчитать
+        self._ranges: Optional[Dict[str, Tuple[float, float]]] = None
+
+    def add(self, supplier: Supplier) -> None:
+        self.suppliers[supplier.supplier_id] = supplier
+        _insert_into_front(self.front, supplier)
+        self._ranges = None
+
+    def remove(self, supplier_id: str) -> None:
+        del self.suppliers[supplier_id]
+        self._ranges = None
+        if any(member.supplier_id == supplier_id for member in self.front):
+            # Поставщики, которых доминировал удаленный, могли войти во фронт
+            self.front = pareto_front(self.suppliers.values())
+
+    def ranges(self) -> Dict[str, Tuple[float, float]]:
+        if self._ranges is None:
+            self._ranges = {
+                criterion: (
+                    min(getattr(s, criterion) for s in self.suppliers.values()),
+                    max(getattr(s, criterion) for s in self.suppliers.values()),
+                )
+                for criterion in SUPPLIER_CRITERIA
+            }
+        return self._ranges
+
+
+class SupplierIndex:
+    """
+    Поставщики по material_type с Парето-фронтами.
+
+    Оценка поставщика - взвешенная сумма критериев, нормированных в [0, 1]
+    внутри материала (1 - лучший в материале). Пределы нормировки
+    пересчитываются лениво после изменения материала, фронт обновляется
+    при добавлении и пересчитывается только при удалении его члена.
+    """
+
+    def __init__(self, suppliers: Iterable[Supplier] = ()):
+        """
+        Args:
+            suppliers: Начальный список (например, get_all_suppliers_simple)
+        """
+        self._suppliers: Dict[str, Supplier] = {}
+        self._buckets: Dict[str, _Bucket] = {}
+        for supplier in suppliers:
+            self.add(supplier)
+
+    def __len__(self) -> int:
+        return len(self._suppliers)
+
+    def __contains__(self, supplier_id: str) -> bool:
+        return supplier_id in self._suppliers
+
+    def get(self, supplier_id: str) -> Optional[Supplier]:
+        """Поставщик по ID."""
+        return self._suppliers.get(supplier_id)
+
+    def materials(self) -> List[str]:
+        """Материалы, для которых есть поставщики."""
+        return sorted(self._buckets)
+
+    def suppliers(self, material_type: str) -> List[Supplier]:
+        """Поставщики материала."""
+        bucket = self._buckets.get(material_type)
+        return list(bucket.suppliers.values()) if bucket else []
+
+    # ==================== Изменения ====================
+
+    def add(self, supplier: Supplier) -> None:
+        """Добавить или заменить поставщика (ответ create_supplier/update_supplier)."""
+        if supplier.supplier_id in self._suppliers:
+            self.remove(supplier.supplier_id)
+        self._suppliers[supplier.supplier_id] = supplier
+        self._buckets.setdefault(supplier.material_type, _Bucket()).add(supplier)
+
+    def remove(self, supplier_id: str) -> bool:
+        """
+        Удалить поставщика (после delete_supplier).
+
+        Returns:
+            bool: True, если поставщик был в индексе
+        """
+        supplier = self._suppliers.pop(supplier_id, None)
+        if supplier is None:
+            return False
+        bucket = self._buckets[supplier.material_type]
+        bucket.remove(supplier_id)
+        if not bucket.suppliers:
+            del self._buckets[supplier.material_type]
+        return True
+
+    # ==================== Запросы ====================
+
+    def pareto_front(self, material_type: str) -> List[Supplier]:
+        """Парето-фронт материала."""
+        bucket = self._buckets.get(material_type)
+        return list(bucket.front) if bucket else []
+
+    def score(
+        self, supplier: Supplier, weights: Optional[Mapping[str, float]] = None
+    ) -> float:
+        """
+        Взвешенная оценка поставщика внутри его материала.
+
+        Args:
+            supplier: Поставщик из индекса
+            weights: Критерий -> вес (по умолчанию все критерии с весом 1)
+        """
+        weights = self._weights(weights)
+        bucket = self._buckets[supplier.material_type]
+        return self._score(supplier, weights, bucket.ranges())
+
+    def top_k(
+        self,
+        material_type: str,
+        k: int = 1,
+        weights: Optional[Mapping[str, float]] = None,
+        pareto_only: bool = False,
+        exclude: Iterable[str] = (),
+    ) -> List[Supplier]:
+        """
+        Лучшие поставщики материала по взвешенной оценке.
+
+        Args:
+            material_type: Материал
+            k: Сколько поставщиков вернуть
+            weights: Критерий (cost, reliability, product_quality,
+                delivery_period) -> вес
+            pareto_only: Выбирать только из Парето-фронта
+            exclude: ID поставщиков, которых не выбирать
+
+        Returns:
+            List[Supplier]: До k поставщиков по убыванию оценки
+
+        Raises:
+            ValidationError: Неизвестный критерий или отрицательный вес
+        """
+        weights = self._weights(weights)
+        bucket = self._buckets.get(material_type)
+        if bucket is None or k < 1:
+            return []
+        excluded = set(exclude)
+        candidates = bucket.front if pareto_only else bucket.suppliers.values()
+        ranges = bucket.ranges()
+        return heapq.nlargest(
+            k,
+            (s for s in candidates if s.supplier_id not in excluded),
+            key=lambda supplier: self._score(supplier, weights, ranges),
+        )
+
+    def select(
+        self,
+        material_types: Iterable[str],
+        weights: Optional[Mapping[str, float]] = None,
+        backups: int = 1,
+    ) -> SupplierSelection:
+        """
+        Выбрать основного и запасных поставщиков для каждого материала.
+
+        Args:
+            material_types: Материалы
+            weights: Веса критериев (см. top_k)
+            backups: Запасных поставщиков на материал
+
+        Returns:
+            SupplierSelection: ID для add_supplier(is_backup=False/True)
+        """
+        selection = SupplierSelection()
+        for material_type in material_types:
+            best = self.top_k(material_type, k=1 + backups, weights=weights)
+            if not best:
+                selection.missing.append(material_type)
+                continue
+            selection.supplier_ids.append(best[0].supplier_id)
+            selection.backup_supplier_ids.extend(s.supplier_id for s in best[1:])
+        return selection
+
+    @staticmethod
+    def _weights(weights: Optional[Mapping[str, float]]) -> Dict[str, float]:
+        if weights is None:
+            return dict.fromkeys(SUPPLIER_CRITERIA, 1.0)
+        unknown = [name for name in weights if name not in SUPPLIER_CRITERIA]
+        if unknown:
+            raise ValidationError(
+                f"Unknown supplier criteria {unknown}, "
+                f"expected {list(SUPPLIER_CRITERIA)}"
+            )
+        if any(weight < 0 for weight in weights.values()):
+            raise ValidationError("Supplier criteria weights must be >= 0")
+        return dict(weights)
+
+    @staticmethod
+    def _score(
+        supplier: Supplier,
+        weights: Mapping[str, float],
+        ranges: Mapping[str, Tuple[float, float]],
+    ) -> float:
+        score = 0.0
+        for criterion, weight in weights.items():
+            low, high = ranges[criterion]
+            if high == low:
+                normalized = 1.0
+            else:
+                normalized = (getattr(supplier, criterion) - low) / (high - low)
+                if not SUPPLIER_CRITERIA[criterion]:
+                    normalized = 1.0 - normalized
+            score += weight * normalized
+        return score
@@ -0,0 +1,394 @@
+"""
+Суррогатная модель для отсева конфигураций до запуска симуляции.
+
+Большая часть кандидатов перебора заведомо слабые, а каждый прогон -
+это create_simulation, настройка и run_simulation. SurrogateScreen
+обучается на уже известных парах (конфигурация -> метрика), например из
+checkpoint SuccessiveHalvingOptimizer, предсказывает метрику гребневой
+регрессией или k ближайшими соседями (numpy) и пропускает кандидатов,
+у которых верхняя граница предсказания ниже текущего лучшего значения.
+
+Небольшая доля пропускаемых кандидатов (audit_rate) все равно
+прогоняется: по ним считается ошибка предсказания.
+
+```python
+screen = SurrogateScreen(method="knn", k=5)
+screen.load_checkpoint("previous_search.json")
+optimizer = client.optimizer(candidates, surrogate=screen)
+await optimizer.run()
+print(screen.stats)  # saved_calls, audit_mae, ...
+```
+"""
+
+import json
+import logging
+import math
+import random
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .exceptions import ValidationError
+from .models import BaseModel
+from .optimizer import canonical_config, config_hash
+from .replications import MINIMIZED_METRICS
+from .utils import require_numpy
+
+logger = logging.getLogger(__name__)
+
+SURROGATE_METHODS = ("ridge", "knn")
+
+# Признак: (ключ конфигурации, значение) - индикатор;
+# (ключ, None) - числовое значение
+Feature = Tuple[str, Optional[str]]
+
+
+class ConfigEncoder:
+    """
+    Кодирование конфигураций в числовые векторы.
+
+    Списки ID (supplier_ids, tender_ids, ...) и строковые значения
+    кодируются индикаторами, словари (equipment_assignments) - индикаторами
+    пар ключ=значение, числа - как есть. Значения, не встречавшиеся при
+    fit(), игнорируются.
+    """
+
+    def __init__(self):
+        self.features: List[Feature] = []
+        self._index: Dict[Feature, int] = {}
+
+    @staticmethod
+    def _items(config: Mapping[str, Any]):
+        for key, value in config.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                yield (key, str(value)), 1.0
+            elif isinstance(value, (int, float)):
+                yield (key, None), float(value)
+            elif isinstance(value, Mapping):
+                for item_key, item_value in value.items():
+                    yield (key, f"{item_key}={item_value}"), 1.0
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                for item in value:
+                    yield (key, str(item)), 1.0
+            else:
+                yield (key, str(value)), 1.0
+
+    def fit(self, configs: Sequence[Mapping[str, Any]]) -> "ConfigEncoder":
+        """Собрать словарь признаков."""
+        for config in configs:
+            for feature, _ in self._items(config):
+                if feature not in self._index:
+                    self._index[feature] = len(self.features)
+                    self.features.append(feature)
+        return self
+
+    def transform(self, configs: Sequence[Mapping[str, Any]]):
+        """Матрица признаков (len(configs), len(features))."""
+        np = require_numpy()
+        matrix = np.zeros((len(configs), len(self.features)))
+        for row, config in enumerate(configs):
+            for feature, value in self._items(config):
+                column = self._index.get(feature)
+                if column is not None:
+                    matrix[row, column] = value
+        return matrix
+
+
+class SurrogateModel:
+    """
+    Предсказание метрики по конфигурации.
+
+    ridge - гребневая регрессия (решение нормальных уравнений), разброс
+    оценивается по остаткам скользящего контроля (leave-one-out, точная
+    формула e_i / (1 - h_ii)): остатки на обучающей выборке занижены,
+    особенно когда признаков больше, чем пар. knn - среднее k ближайших
+    соседей, разброс - их стандартное отклонение, но не меньше
+    leave-one-out ошибки knn на обучающей выборке (при k=1 разброс
+    соседей всегда нулевой). Пока пар меньше двух, разброс бесконечен.
+    Признаки стандартизируются по обучающей выборке.
+    """
+
+    def __init__(self, method: str = "ridge", alpha: float = 1.0, k: int = 5):
+        """
+        Args:
+            method: "ridge" или "knn"
+            alpha: Коэффициент регуляризации гребневой регрессии
+            k: Число соседей для knn
+
+        Raises:
+            ValidationError: Неизвестный метод или некорректные параметры
+        """
+        if method not in SURROGATE_METHODS:
+            raise ValidationError(
+                f"Unknown surrogate method {method!r}, expected {SURROGATE_METHODS}"
+            )
+        if alpha < 0 or k < 1:
+            raise ValidationError("Expected alpha >= 0 and k >= 1")
+        self.method = method
+        self.alpha = alpha
+        self.k = k
+        self.encoder = ConfigEncoder()
+        self._x = None
+        self._y = None
+        self._center = None
+        self._scale = None
+        self._weights = None
+        self._residual_std = 0.0
+
+    def fit(
+        self, configs: Sequence[Mapping[str, Any]], values: Sequence[float]
+    ) -> "SurrogateModel":
+        """
+        Обучить модель.
+
+        Args:
+            configs: Конфигурации
+            values: Значения метрики (по одному на конфигурацию)
+        """
+        np = require_numpy()
+        self.encoder = ConfigEncoder().fit(configs)
+        x = self.encoder.transform(configs)
+        y = np.asarray(values, dtype=float)
+
+        self._center = x.mean(axis=0)
+        scale = x.std(axis=0)
+        self._scale = np.where(scale > 0, scale, 1.0)
+        self._x = (x - self._center) / self._scale
+        self._y = y
+
+        if self.method == "ridge":
+            gram = self._x.T @ self._x + self.alpha * np.eye(self._x.shape[1])
+            self._weights = np.linalg.solve(gram, self._x.T @ (y - y.mean()))
+            residuals = y - self._predict_ridge(self._x)
+            # Диагональ матрицы влияния (с учетом свободного члена y.mean())
+            leverage = 1.0 / len(y) + (
+                self._x * np.linalg.solve(gram, self._x.T).T
+            ).sum(axis=1)
+            errors = residuals / np.clip(1.0 - leverage, 1e-12, None)
+        else:
+            errors = self._knn_errors()
+        self._residual_std = (
+            float(np.sqrt((errors**2).mean())) if len(y) > 1 else math.inf
+        )
+        return self
+
+    def _knn_errors(self):
+        """Ошибки предсказания каждой пары по k ближайшим из остальных."""
+        np = require_numpy()
+        if len(self._y) < 2:
+            return np.zeros(len(self._y))
+        distances = ((self._x[:, None, :] - self._x[None, :, :]) ** 2).sum(axis=2)
+        np.fill_diagonal(distances, np.inf)
+        k = min(self.k, len(self._y) - 1)
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        return self._y - self._y[nearest].mean(axis=1)
+
+    def _predict_ridge(self, x):
+        return x @ self._weights + self._y.mean()
+
+    def predict(self, configs: Sequence[Mapping[str, Any]]):
+        """
+        Предсказать метрику.
+
+        Returns:
+            Tuple[ndarray, ndarray]: Среднее и стандартное отклонение
+        """
+        np = require_numpy()
+        if self._x is None:
+            raise ValidationError("Surrogate model is not fitted")
+        x = (self.encoder.transform(configs) - self._center) / self._scale
+
+        if self.method == "ridge":
+            return self._predict_ridge(x), np.full(len(x), self._residual_std)
+
+        distances = ((x[:, None, :] - self._x[None, :, :]) ** 2).sum(axis=2)
+        k = min(self.k, len(self._y))
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        neighbours = self._y[nearest]
+        return neighbours.mean(axis=1), np.maximum(
+            neighbours.std(axis=1), self._residual_std
+        )
+
+
+class ScreenDecision(BaseModel):
+    """Решение по одному кандидату."""
+
+    predicted: float
+    upper_bound: float
+    # True - прогон не нужен
+    skip: bool
+    # True - кандидат был бы пропущен, но прогоняется для аудита
+    audit: bool = False
+
+
+class SurrogateScreen:
+    """
+    Отсев кандидатов по суррогатной модели.
+
+    До min_samples известных пар отсев не выполняется. Известные пары
+    накапливаются через observe(); модель переобучается при следующем
+    screen(). Значения - оценки "больше - лучше": минимизируемые метрики
+    (MINIMIZED_METRICS) передаются со знаком минус.
+    """
+
+    def __init__(
+        self,
+        method: str = "ridge",
+        alpha: float = 1.0,
+        k: int = 5,
+        confidence: float = 0.95,
+        audit_rate: float = 0.1,
+        min_samples: int = 10,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            method: "ridge" или "knn"
+            alpha: Коэффициент регуляризации гребневой регрессии
+            k: Число соседей для knn
+            confidence: Уровень верхней границы предсказания
+            audit_rate: Доля пропускаемых кандидатов, прогоняемых для аудита
+            min_samples: Минимум известных пар для отсева
+            seed: Seed выбора кандидатов для аудита
+        """
+        if not 0 <= audit_rate <= 1:
+            raise ValidationError("audit_rate must be in [0, 1]")
+        self.model = SurrogateModel(method, alpha=alpha, k=k)
+        self.confidence = confidence
+        self.audit_rate = audit_rate
+        self.min_samples = min_samples
+        self._random = random.Random(seed)
+        # Канонический хэш -> (конфигурация, значение метрики)
+        self._samples: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._fitted_samples = 0
+        self.screened = 0
+        self.skipped = 0
+        self.saved_calls = 0
+        self._audit_errors: List[float] = []
+
+    @property
+    def samples(self) -> int:
+        """Число известных пар."""
+        return len(self._samples)
+
+    @property
+    def best(self) -> float:
+        """Лучшее известное значение метрики."""
+        return max((value for _, value in self._samples.values()), default=-math.inf)
+
+    def observe(self, config: Mapping[str, Any], value: float) -> None:
+        """
+        Добавить известную пару (конфигурация, значение метрики).
+
+        Повторное наблюдение той же конфигурации заменяет значение.
+        """
+        if math.isnan(value):
+            return
+        self._samples[config_hash(config)] = (canonical_config(config), float(value))
+        self._fitted_samples = -1
+
+    def load_checkpoint(
+        self, path: Union[str, Path], metric: str = "profitability"
+    ) -> int:
+        """
+        Загрузить пары из checkpoint SuccessiveHalvingOptimizer.
+
+        Каждая конфигурация добавляется со средним своих прогонов (для
+        минимизируемой метрики - со знаком минус).
+
+        Args:
+            path: JSON файл checkpoint
+            metric: Метрика, которой должен соответствовать checkpoint
+
+        Returns:
+            int: Число загруженных пар
+        """
+        state = json.loads(Path(path).read_text())
+        if state.get("metric") != metric:
+            raise ValidationError(
+                f"Checkpoint {path} holds {state.get('metric')!r}, not {metric!r}"
+            )
+        sign = -1.0 if metric in MINIMIZED_METRICS else 1.0
+        loaded = 0
+        for saved in state["evaluations"].values():
+            if saved["values"]:
+                self.observe(
+                    saved["config"],
+                    sign * sum(saved["values"]) / len(saved["values"]),
+                )
+                loaded += 1
+        return loaded
+
+    def screen(
+        self, configs: Sequence[Mapping[str, Any]], best: Optional[float] = None
+    ) -> List[Optional[ScreenDecision]]:
+        """
+        Решить, каких кандидатов не прогонять.
+
+        Args:
+            configs: Кандидаты
+            best: Текущее лучшее значение (None - лучшее известное)
+
+        Returns:
+            List[Optional[ScreenDecision]]: Решения; None для всех
+                кандидатов, пока известно меньше min_samples пар
+        """
+        if self.samples < self.min_samples or not configs:
+            return [None] * len(configs)
+        if self._fitted_samples != self.samples:
+            configs_seen, values = zip(*self._samples.values())
+            self.model.fit(configs_seen, values)
+            self._fitted_samples = self.samples
+
+        best = self.best if best is None else best
+        z = NormalDist().inv_cdf(self.confidence)
+        means, stds = self.model.predict(configs)
+
+        decisions = []
+        for mean, std in zip(means.tolist(), stds.tolist()):
+            upper = mean + z * std
+            skip = upper < best
+            audit = skip and self._random.random() < self.audit_rate
+            decisions.append(
+                ScreenDecision(
+                    predicted=mean,
+                    upper_bound=upper,
+                    skip=skip and not audit,
+                    audit=audit,
+                )
+            )
+        self.screened += len(decisions)
+        self.skipped += sum(decision.skip for decision in decisions)
+        return decisions
+
+    def record_saved(self, calls: int) -> None:
+        """Учесть прогоны, не выполненные благодаря отсеву."""
+        self.saved_calls += calls
+
+    def record_audit(self, predicted: float, actual: float) -> None:
+        """Учесть ошибку предсказания на прогнанном для аудита кандидате."""
+        self._audit_errors.append(actual - predicted)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Отсев, сэкономленные прогоны и ошибка предсказания на аудите."""
+        errors = self._audit_errors
+        return {
+            "samples": self.samples,
+            "screened": self.screened,
+            "skipped": self.skipped,
+            "saved_calls": self.saved_calls,
+            "audited": len(errors),
+            "audit_mae": (
+                sum(abs(error) for error in errors) / len(errors)
+                if errors
+                else math.nan
+            ),
+            "audit_rmse": (
+                math.sqrt(sum(error**2 for error in errors) / len(errors))
+                if errors
+                else math.nan
+            ),
+        }
@@ -1,12 +1,29 @@
 import asyncio
-from typing import Optional, List, Dict, Any, Union
+import contextlib
+import grpc
+from typing import TYPE_CHECKING
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterable, Sequence, Union
 import logging
 
 from .simulation_client import AsyncSimulationClient
+from .decode_executor import DecodeExecutor
+from .hedging import HedgingPolicy
+from .priority import PriorityScheduler, call_priority
+from .result_cache import ResultCache
 from .database_client import AsyncDatabaseClient
 from .models import *
 from .exceptions import *
 
+if TYPE_CHECKING:
+    from .process_graph import ProcessGraphEditor
+    from .schedule_sync import ProductionScheduleSync
+    from .reconcile import ApplyResult
+    from .pool import SimulationPool
+    from .replications import ReplicationSummary
+    from .optimizer import SuccessiveHalvingOptimizer
+    from .surrogate import SurrogateScreen
+    from .supplier_index import SupplierIndex, SupplierSelection
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,19 +70,53 @@ class AsyncUnifiedClient:
         timeout: float = 30.0,
         rate_limit: Optional[float] = None,
         enable_logging: bool = True,
+        compression: Optional[Union[str, grpc.Compression]] = None,
+        max_receive_message_length: Optional[int] = None,
+        max_send_message_length: Optional[int] = None,
+        large_response_warning_ratio: float = 0.8,
+        share_channel: Optional[bool] = None,
+        connect_mode: str = "ping",
+        state_mirror_ttl: float = 5.0,
+        result_cache: Optional[ResultCache] = None,
+        decode_executor: Optional[DecodeExecutor] = None,
+        sim_hedging: Optional[HedgingPolicy] = None,
+        db_hedging: Optional[HedgingPolicy] = None,
+        priority_scheduler: Optional[PriorityScheduler] = None,
     ):
         """
         Инициализация объединенного клиента.
 
         Args:
-            sim_host: Хост сервиса симуляции
+            sim_host: Хост сервиса симуляции или адрес "unix:/path"
             sim_port: Порт сервиса симуляции
-            db_host: Хост сервиса базы данных
+            db_host: Хост сервиса базы данных или адрес "unix:/path"
             db_port: Порт сервиса базы данных
             max_retries: Максимальное количество повторных попыток
             timeout: Таймаут операций
             rate_limit: Ограничение запросов
             enable_logging: Включить логирование
+            compression: Сжатие исходящих запросов для обоих каналов: None,
+                "gzip", "deflate" или grpc.Compression. Размер ответов
+                get_* эта настройка не уменьшает: их сжатие выбирает сервер
+            max_receive_message_length: Максимальный размер входящего сообщения
+            max_send_message_length: Максимальный размер исходящего сообщения
+            large_response_warning_ratio: Доля лимита, после которой
+                большие ответы логируются с предупреждением
+            share_channel: Использовать один канал для обоих сервисов.
+                По умолчанию (None) канал общий, если адреса сервисов совпадают
+            connect_mode: Режим подключения обоих клиентов: "ping",
+                "eager" (прогрев) или "lazy" (подключение при первом запросе)
+            state_mirror_ttl: Сколько секунд состояние симуляции из последнего
+                ответа считается свежим для get_current_* методов
+            result_cache: Кэш метрик завершенных шагов (ResultCache)
+            decode_executor: Конвертация больших SimulationResponse вне
+                event loop (DecodeExecutor)
+            sim_hedging: Хеджирование запросов чтения к сервису симуляции
+                (HedgingPolicy)
+            db_hedging: Хеджирование запросов чтения к сервису базы данных
+                (HedgingPolicy)
+            priority_scheduler: Общие для обоих клиентов очереди вызовов
+                по классам приоритета (PriorityScheduler)
         """
         self.sim_client = AsyncSimulationClient(
             host=sim_host,
@@ -74,6 +125,16 @@ class AsyncUnifiedClient:
             timeout=timeout,
             rate_limit=rate_limit,
             enable_logging=enable_logging,
+            compression=compression,
+            max_receive_message_length=max_receive_message_length,
+            max_send_message_length=max_send_message_length,
+            large_response_warning_ratio=large_response_warning_ratio,
+            connect_mode=connect_mode,
+            state_mirror_ttl=state_mirror_ttl,
+            result_cache=result_cache,
+            decode_executor=decode_executor,
+            hedging=sim_hedging,
+            priority_scheduler=priority_scheduler,
         )
 
         self.db_client = AsyncDatabaseClient(
@@ -83,8 +144,28 @@ class AsyncUnifiedClient:
             timeout=timeout,
             rate_limit=rate_limit,
             enable_logging=enable_logging,
+            compression=compression,
+            max_receive_message_length=max_receive_message_length,
+            max_send_message_length=max_send_message_length,
+            large_response_warning_ratio=large_response_warning_ratio,
+            connect_mode=connect_mode,
+            hedging=db_hedging,
+            priority_scheduler=priority_scheduler,
         )
 
+        same_target = self.sim_client.target == self.db_client.target
+        if share_channel and not same_target:
+            raise ValueError(
+                f"Cannot share channel between different endpoints: "
+                f"{self.sim_client.target} and {self.db_client.target}"
+            )
+        self.share_channel = same_target if share_channel is None else share_channel
+        self._shared_channel: Optional[grpc.aio.Channel] = None
+        # Пул готовых симуляций для create_simulation (см. simulation_pool())
+        self._simulation_pool = None
+        # Индекс поставщиков (см. supplier_index())
+        self._supplier_index = None
+
     async def __aenter__(self):
         await self.connect()
         return self
@@ -96,6 +177,12 @@ class AsyncUnifiedClient:
         """Подключиться к обоим сервисам."""
         logger.info("Connecting to services...")
 
+        if self.share_channel and self._shared_channel is None:
+            # Оба сервиса за одним адресом: один канал вместо двух
+            self._shared_channel = await self.sim_client._create_channel()
+            self.sim_client.use_channel(self._shared_channel)
+            self.db_client.use_channel(self._shared_channel)
+
         # Подключаемся параллельно к обоим сервисам
         await asyncio.gather(self.sim_client.connect(), self.db_client.connect())
 
@@ -105,14 +192,57 @@ class AsyncUnifiedClient:
         """Закрыть соединения с обоими сервисами."""
         logger.info("Closing connections...")
 
+        if self._simulation_pool is not None:
+            await self._simulation_pool.close()
+
         await asyncio.gather(
             self.sim_client.close(),
             self.db_client.close(),
             return_exceptions=True,  # Закрываем оба, даже если один упал
         )
 
+        if self._shared_channel is not None:
+            await self._shared_channel.close()
+            self._shared_channel = None
+            self.sim_client.use_channel(None)
+            self.db_client.use_channel(None)
+
         logger.info("All connections closed")
 
+    def call_priority(self, priority: str):
+        """Задать класс приоритета для вызовов внутри блока (см. AsyncBaseClient.call_priority)."""
+        return call_priority(priority)
+
+    def add_event_hook(self, hook) -> None:
+        """Подписаться на события обоих клиентов (см. AsyncBaseClient.add_event_hook)."""
+        self.sim_client.add_event_hook(hook)
+        self.db_client.add_event_hook(hook)
+
+    def remove_event_hook(self, hook) -> None:
+        """Отписать обработчик событий от обоих клиентов."""
+        self.sim_client.remove_event_hook(hook)
+        self.db_client.remove_event_hook(hook)
+
+    async def get_current_simulation(
+        self, simulation_id: str, max_age: Optional[float] = None
+    ) -> Simulation:
+        """Текущее состояние симуляции (из зеркала, если оно свежее)."""
+        return await self.sim_client.get_current_simulation(simulation_id, max_age)
+
+    async def get_current_step(self, simulation_id: str) -> int:
+        """Текущий шаг симуляции."""
+        return await self.sim_client.get_current_step(simulation_id)
+
+    async def get_current_suppliers(self, simulation_id: str) -> List[Supplier]:
+        """Текущие поставщики симуляции."""
+        return await self.sim_client.get_current_suppliers(simulation_id)
+
+    async def get_current_process_graph(
+        self, simulation_id: str
+    ) -> Optional[ProcessGraph]:
+        """Текущий граф процесса симуляции."""
+        return await self.sim_client.get_current_process_graph(simulation_id)
+
     async def ping(self) -> Dict[str, bool]:
         """
         Проверить доступность всех сервисов.
@@ -135,11 +265,41 @@ class AsyncUnifiedClient:
         """
         Создать новую симуляцию.
 
+        Если подключен пул (simulation_pool()) и пополнение запущено,
+        симуляция выдается из пула.
+
         Returns:
             SimulationConfig: Конфигурация созданной симуляции
         """
+        pool = self._simulation_pool
+        if pool is not None and pool.running:
+            return (await pool.acquire()).config
         return await self.sim_client.create_simulation()
 
+    def simulation_pool(
+        self, size: int = 4, refill_rate: float = 2.0
+    ) -> "SimulationPool":
+        """
+        Подключить пул заранее созданных симуляций.
+
+        После pool.start() create_simulation (и run_complete_scenario,
+        create_and_configure_simulation) берут симуляции из пула. Пул
+        останавливается в close(). Повторный вызов возвращает уже
+        подключенный пул с новыми size и refill_rate, а не создает второй.
+
+        Args:
+            size: Сколько готовых симуляций держать
+            refill_rate: Максимум созданий в секунду при пополнении
+
+        Returns:
+            SimulationPool: Пул
+        """
+        if self._simulation_pool is not None:
+            self._simulation_pool.configure(size, refill_rate)
+        else:
+            self._simulation_pool = self.sim_client.simulation_pool(size, refill_rate)
+        return self._simulation_pool
+
     async def get_simulation(self, simulation_id: str) -> SimulationResponse:
         """
         Получить информацию о симуляции.
@@ -436,6 +596,23 @@ class AsyncUnifiedClient:
         """
         return await self.sim_client.set_sales_strategy(simulation_id, strategy)
 
+    def edit_process_graph(
+        self,
+        simulation_id: str,
+        source: str = "workshop_plan",
+        graph: Optional[ProcessGraph] = None,
+    ) -> "ProcessGraphEditor":
+        """
+        Редактировать граф процесса с отправкой одним update_process_graph.
+
+        См. AsyncSimulationClient.edit_process_graph.
+        """
+        return self.sim_client.edit_process_graph(simulation_id, source, graph)
+
+    # Методы ниже меняют граф по одному элементу: каждый вызов - это
+    # get_workshop_plan + update_process_graph. Для серии правок используйте
+    # edit_process_graph(), который отправляет все изменения одним запросом.
+
     async def add_process_route(
         self, simulation_id: str, length: int, from_workplace: str, to_workplace: str
     ) -> SimulationResponse:
@@ -451,9 +628,9 @@ class AsyncUnifiedClient:
         Returns:
             SimulationResponse: Обновленная симуляция
         """
-        return await self.sim_client.add_process_route(
-            simulation_id, length, from_workplace, to_workplace
-        )
+        async with self.edit_process_graph(simulation_id) as editor:
+            editor.add_route(from_workplace, to_workplace, length)
+        return editor.response
 
     async def delete_process_route(
         self, simulation_id: str, from_workplace: str, to_workplace: str
@@ -469,9 +646,9 @@ class AsyncUnifiedClient:
         Returns:
             SimulationResponse: Обновленная симуляция
         """
-        return await self.sim_client.delete_process_route(
-            simulation_id, from_workplace, to_workplace
-        )
+        async with self.edit_process_graph(simulation_id) as editor:
+            editor.delete_route(from_workplace, to_workplace)
+        return editor.response
 
     async def configure_workplace_in_graph(
         self,
@@ -484,41 +661,70 @@ class AsyncUnifiedClient:
         is_end_node: bool = False,
         next_workplace_ids: Optional[List[str]] = None,
     ) -> SimulationResponse:
-        """Настроить рабочее место в графе процесса."""
-        return await self.sim_client.configure_workplace_in_graph(
-            simulation_id,
-            workplace_id,
-            workplace_type,
-            worker_id,
-            equipment_id,
-            is_start_node,
-            is_end_node,
-            next_workplace_ids,
-        )
+        """
+        Настроить рабочее место в графе процесса.
+
+        workplace_type используется как имя нового рабочего места; работник
+        и оборудование ищутся по ID в базе данных.
+        """
+        fields: Dict[str, Any] = {
+            "is_start_node": is_start_node,
+            "is_end_node": is_end_node,
+        }
+        if worker_id is not None:
+            fields["worker"] = await self._find_worker(worker_id)
+        if equipment_id is not None:
+            fields["equipment"] = await self._find_equipment(equipment_id)
+        if next_workplace_ids is not None:
+            fields["next_workplace_ids"] = list(next_workplace_ids)
+
+        async with self.edit_process_graph(simulation_id) as editor:
+            if workplace_id not in editor.graph:
+                fields.setdefault("workplace_name", workplace_type)
+                fields.setdefault("required_speciality", "")
+                fields.setdefault("required_qualification", 0)
+            editor.configure_workplace(workplace_id, **fields)
+        return editor.response
 
     async def remove_workplace_from_graph(
         self, simulation_id: str, workplace_id: str
     ) -> SimulationResponse:
         """Удалить рабочее место из графа процесса."""
-        return await self.sim_client.remove_workplace_from_graph(
-            simulation_id, workplace_id
-        )
+        async with self.edit_process_graph(simulation_id) as editor:
+            editor.remove_workplace(workplace_id)
+        return editor.response
 
     async def set_workplace_as_start_node(
         self, simulation_id: str, workplace_id: str
     ) -> SimulationResponse:
         """Установить рабочее место как начальный узел."""
-        return await self.sim_client.set_workplace_as_start_node(
-            simulation_id, workplace_id
-        )
+        async with self.edit_process_graph(simulation_id) as editor:
+            editor.set_start_node(workplace_id)
+        return editor.response
 
     async def set_workplace_as_end_node(
         self, simulation_id: str, workplace_id: str
     ) -> SimulationResponse:
         """Установить рабочее место как конечный узел."""
-        return await self.sim_client.set_workplace_as_end_node(
-            simulation_id, workplace_id
-        )
+        async with self.edit_process_graph(simulation_id) as editor:
+            editor.set_end_node(workplace_id)
+        return editor.response
+
+    async def _find_worker(self, worker_id: str) -> Worker:
+        """Найти работника по ID в базе данных."""
+        response = await self.db_client.get_all_workers()
+        for worker in response.workers:
+            if worker.worker_id == worker_id:
+                return worker
+        raise NotFoundError(f"Worker {worker_id} not found")
+
+    async def _find_equipment(self, equipment_id: str) -> Equipment:
+        """Найти оборудование по ID в базе данных."""
+        response = await self.db_client.get_all_equipment()
+        for equipment in response.equipments:
+            if equipment.equipment_id == equipment_id:
+                return equipment
+        raise NotFoundError(f"Equipment {equipment_id} not found")
 
     async def update_process_graph(
         self, simulation_id: str, process_graph: "ProcessGraph"
@@ -588,9 +794,61 @@ class AsyncUnifiedClient:
 
     async def update_production_schedule(
         self, simulation_id: str, schedule: "ProductionSchedule"
-    ) -> SimulationResponse:
-        """Обновить производственный план."""
-        return await self.sim_client.update_production_schedule(simulation_id, schedule)
+    ) -> Optional[SimulationResponse]:
+        """
+        Обновить производственный план.
+
+        Отправляются только изменившиеся строки (см. ProductionScheduleSync).
+
+        Returns:
+            Optional[SimulationResponse]: Симуляция после последнего
+                изменения или None, если план не изменился
+        """
+        sync = self.production_schedule_sync(simulation_id)
+        result = await sync.sync(schedule)
+        return result.response
+
+    def production_schedule_sync(
+        self, simulation_id: str, max_concurrency: int = 8
+    ) -> "ProductionScheduleSync":
+        """Создать синхронизатор производственного плана."""
+        return self.sim_client.production_schedule_sync(simulation_id, max_concurrency)
+
+    async def apply(
+        self,
+        simulation_id: str,
+        desired: SimulationParameters,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+    ) -> "ApplyResult":
+        """Привести параметры симуляции к желаемым (см. AsyncSimulationClient.apply)."""
+        return await self.sim_client.apply(
+            simulation_id, desired, max_concurrency=max_concurrency, dry_run=dry_run
+        )
+
+    async def staff_workplaces(
+        self,
+        simulation_id: str,
+        workers: Optional[List[Worker]] = None,
+        workplaces: Optional[List[Workplace]] = None,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+    ) -> "ApplyResult":
+        """
+        Подобрать и назначить работников на рабочие места.
+
+        См. AsyncSimulationClient.staff_workplaces; по умолчанию работники
+        берутся из get_all_workers_simple().
+        """
+        if workers is None:
+            workers = await self.db_client.get_all_workers_simple()
+        return await self.sim_client.staff_workplaces(
+            simulation_id,
+            workers,
+            workplaces,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+        )
 
     async def get_workshop_plan(self, simulation_id: str) -> "WorkshopPlanResponse":
         """Получить план цеха."""
@@ -719,7 +977,10 @@ class AsyncUnifiedClient:
         Returns:
             Supplier: Созданный поставщик
         """
-        return await self.db_client.create_supplier(request)
+        supplier = await self.db_client.create_supplier(request)
+        if self._supplier_index is not None and supplier is not None:
+            self._supplier_index.add(supplier)
+        return supplier
 
     async def update_supplier(self, request: UpdateSupplierRequest) -> Supplier:
         """
@@ -731,7 +992,10 @@ class AsyncUnifiedClient:
         Returns:
             Supplier: Обновленный поставщик
         """
-        return await self.db_client.update_supplier(request)
+        supplier = await self.db_client.update_supplier(request)
+        if self._supplier_index is not None and supplier is not None:
+            self._supplier_index.add(supplier)
+        return supplier
 
     async def delete_supplier(self, request: DeleteSupplierRequest) -> SuccessResponse:
         """
@@ -743,7 +1007,32 @@ class AsyncUnifiedClient:
         Returns:
             SuccessResponse: Результат удаления
         """
-        return await self.db_client.delete_supplier(request)
+        response = await self.db_client.delete_supplier(request)
+        index = self._supplier_index
+        if index is not None and response is not None and response.success:
+            index.remove(request.supplier_id)
+        return response
+
+    async def supplier_index(self, refresh: bool = False) -> "SupplierIndex":
+        """
+        Индекс поставщиков по материалам с Парето-фронтами.
+
+        Строится по get_all_suppliers_simple() при первом вызове и далее
+        обновляется через create_supplier, update_supplier и
+        delete_supplier этого клиента.
+
+        Args:
+            refresh: Перестроить индекс заново
+
+        Returns:
+            SupplierIndex: Индекс
+        """
+        if self._supplier_index is None or refresh:
+            from .supplier_index import SupplierIndex
+
+            suppliers = await self.get_all_suppliers_simple()
+            self._supplier_index = SupplierIndex(suppliers)
+        return self._supplier_index
 
     async def get_all_workers(self) -> GetAllWorkersResponse:
         """
@@ -1201,6 +1490,23 @@ class AsyncUnifiedClient:
 
         return []
 
+    async def add_selected_suppliers(
+        self, simulation_id: str, selection: "SupplierSelection"
+    ) -> List[Union[SimulationResponse, Exception]]:
+        """
+        Добавить в симуляцию поставщиков, выбранных SupplierIndex.select().
+
+        Основные добавляются с is_backup=False, запасные - с is_backup=True.
+
+        Args:
+            simulation_id: ID симуляции
+            selection: Выбранные поставщики
+
+        Returns:
+            List[Union[SimulationResponse, Exception]]: Результаты вызовов
+        """
+        return await self.configure_simulation(simulation_id, **selection.config())
+
     async def configure_simulation_and_check(
         self,
         simulation_id: str,
@@ -1285,6 +1591,125 @@ class AsyncUnifiedClient:
         # 3. Запускаем симуляцию
         return await self.run_simulation(simulation_id)
 
+    async def run_replications(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        parameters: Optional[SimulationParameters] = None,
+        metrics: Sequence[str] = ("profit", "profitability", "oee", "defect_rate"),
+        min_replications: int = 5,
+        max_replications: int = 100,
+        max_concurrency: int = 4,
+        confidence: float = 0.95,
+        relative_precision: Optional[float] = 0.05,
+        precision: Optional[Dict[str, float]] = None,
+    ) -> "ReplicationSummary":
+        """
+        Прогнать одну конфигурацию несколько раз до достижения точности.
+
+        Каждый прогон создает новую симуляцию (из пула, если он подключен),
+        настраивает ее и запускает. Прогоны останавливаются, когда
+        доверительный интервал каждой метрики уже цели.
+
+        Args:
+            config: Конфигурация как в run_complete_scenario
+            parameters: Желаемые параметры для apply (вместо config)
+            metrics: Накапливаемые метрики: profit, profitability, oee,
+                defect_rate
+            min_replications: Минимум прогонов до проверки точности
+            max_replications: Максимум прогонов
+            max_concurrency: Максимум одновременных прогонов
+            confidence: Уровень доверия интервала
+            relative_precision: Целевая полуширина интервала относительно
+                |среднего| (для profit и profitability)
+            precision: Целевая абсолютная полуширина по метрикам; для oee
+                и defect_rate по умолчанию 0.02 и 0.002 (DEFAULT_PRECISION)
+
+        Returns:
+            ReplicationSummary: Среднее, стандартное отклонение и
+                полуширина интервала по метрикам, число прогонов
+
+        Raises:
+            ValidationError: Неизвестная метрика или некорректные границы
+            SimulationError: Ни один прогон не завершился успешно
+        """
+        from .replications import ReplicationRunner
+
+        async def replicate(index: int) -> SimulationResults:
+            if parameters is None:
+                response = await self.run_complete_scenario(config)
+            else:
+                simulation_id = (await self.create_simulation()).simulation_id
+                await self.apply(simulation_id, parameters)
+                response = await self.run_simulation(simulation_id)
+            if not response.simulations.results:
+                raise SimulationError(
+                    f"Replication {index} of simulation "
+                    f"{response.simulations.simulation_id} returned no results"
+                )
+            return response.simulations.results[-1]
+
+        runner = ReplicationRunner(
+            replicate,
+            metrics=metrics,
+            min_replications=min_replications,
+            max_replications=max_replications,
+            max_concurrency=max_concurrency,
+            confidence=confidence,
+            relative_precision=relative_precision,
+            precision=precision,
+        )
+        return await runner.run()
+
+    def optimizer(
+        self,
+        candidates: Iterable[Dict[str, Any]],
+        metric: str = "profitability",
+        min_replications: int = 1,
+        max_replications: int = 27,
+        eta: int = 3,
+        max_concurrency: int = 8,
+        checkpoint: Optional[str] = None,
+        surrogate: Optional["SurrogateScreen"] = None,
+        checkpoint_interval: float = 1.0,
+    ) -> "SuccessiveHalvingOptimizer":
+        """
+        Создать оптимизатор конфигурации (последовательное деление).
+
+        Кандидаты оцениваются через run_complete_scenario; после каждого
+        раунда остается лучшая 1/eta часть, а число прогонов на кандидата
+        растет в eta раз.
+
+        Args:
+            candidates: Конфигурации как в run_complete_scenario
+            metric: Метрика (profit, profitability, oee - максимизируются,
+                defect_rate - минимизируется)
+            min_replications: Прогонов на кандидата в первом раунде
+            max_replications: Максимум прогонов на кандидата
+            eta: Во сколько раз сокращается число кандидатов за раунд
+            max_concurrency: Максимум одновременных прогонов
+            checkpoint: JSON файл для сохранения и продолжения поиска
+            surrogate: Суррогатный отсев кандидатов перед первым раундом
+            checkpoint_interval: Минимальный интервал (секунды) между
+                сохранениями checkpoint после отдельных прогонов
+
+        Returns:
+            SuccessiveHalvingOptimizer: Оптимизатор (запуск - run())
+        """
+        from .optimizer import SuccessiveHalvingOptimizer
+
+        return SuccessiveHalvingOptimizer(
+            self,
+            candidates,
+            metric=metric,
+            min_replications=min_replications,
+            max_replications=max_replications,
+            eta=eta,
+            max_concurrency=max_concurrency,
+            checkpoint=checkpoint,
+            surrogate=surrogate,
+            checkpoint_interval=checkpoint_interval,
+        )
+
     async def get_available_resources(self) -> Dict[str, Any]:
         """
         Получить все доступные ресурсы параллельно.
@@ -1383,10 +1808,12 @@ class AsyncUnifiedClient:
         return await self.sim_client.update_process_graph(simulation_id, process_graph)
 
     async def set_production_plan_row(
-        self, simulation_id: str, row: "ProductionPlanRow"
+        self, simulation_id: str, row: "ProductionPlanRow", decode: bool = True
     ) -> SimulationResponse:
         """Установить строку производственного плана."""
-        return await self.sim_client.set_production_plan_row(simulation_id, row)
+        return await self.sim_client.set_production_plan_row(
+            simulation_id, row, decode=decode
+        )
 
     async def get_factory_metrics(
         self,
@@ -1444,6 +1871,38 @@ class AsyncUnifiedClient:
         """Получить все метрики."""
         return await self.sim_client.get_all_metrics(simulation_id, step)
 
+    async def fetch_metrics_history(
+        self,
+        simulation_id: str,
+        steps: Iterable[int],
+        kinds: Sequence[str] = ("factory",),
+        max_concurrency: int = 8,
+    ) -> Dict[str, Any]:
+        """Получить метрики нескольких шагов в виде временных рядов NumPy."""
+        return await self.sim_client.fetch_metrics_history(
+            simulation_id, steps, kinds, max_concurrency
+        )
+
+    async def watch_metrics(
+        self,
+        simulation_id: str,
+        interval: float = 1.0,
+        step: Optional[int] = None,
+    ) -> AsyncIterator["AllMetricsResponse"]:
+        """Подписаться на изменения метрик симуляции."""
+        stream = self.sim_client.watch_metrics(simulation_id, interval, step)
+        async with contextlib.aclosing(stream):
+            async for metrics in stream:
+                yield metrics
+
+    async def get_simulation_results_by_steps(
+        self, simulation_id: str, steps: List[int], max_concurrency: int = 4
+    ) -> List[SimulationResults]:
+        """Получить результаты по шагам (запасной путь для больших симуляций)."""
+        return await self.sim_client.get_simulation_results_by_steps(
+            simulation_id, steps, max_concurrency
+        )
+
     async def get_production_schedule(
         self, simulation_id: str
     ) -> "ProductionScheduleResponse":
@@ -1461,11 +1920,11 @@ class AsyncUnifiedClient:
         return await self.sim_client.get_unplanned_repair(simulation_id)
 
     async def get_warehouse_load_chart(
-        self, simulation_id: str, warehouse_id: str
+        self, simulation_id: str, warehouse_id: str, decode: bool = True
     ) -> "WarehouseLoadChartResponse":
         """Получить график загрузки склада."""
         return await self.sim_client.get_warehouse_load_chart(
-            simulation_id, warehouse_id
+            simulation_id, warehouse_id, decode=decode
         )
 
     async def get_required_materials(
@@ -1484,9 +1943,20 @@ class AsyncUnifiedClient:
         """Получить политики работы с браком."""
         return await self.sim_client.get_defect_policies(simulation_id)
 
-    async def validate_configuration(self, simulation_id: str) -> "ValidationResponse":
-        """Валидировать конфигурацию симуляции."""
-        return await self.sim_client.validate_configuration(simulation_id)
+    async def validate_configuration(
+        self,
+        simulation_id: str,
+        parameters: Optional[SimulationParameters] = None,
+        required_materials: Optional[List["RequiredMaterial"]] = None,
+    ) -> "ValidationResponse":
+        """
+        Валидировать конфигурацию симуляции.
+
+        С parameters сервер вызывается только после успешной локальной проверки.
+        """
+        return await self.sim_client.validate_configuration(
+            simulation_id, parameters, required_materials
+        )
 
     async def set_quality_inspection(
         self, simulation_id: str, supplier_id: str, inspection_enabled: bool = True
@@ -55,6 +55,7 @@ async def retry_async(
     max_retries: int = 3,
     base_delay: float = 1.0,
     retry_exceptions: tuple = (Exception,),
+    retry_if: Optional[Callable[[Exception], bool]] = None,
     **kwargs,
 ) -> Any:
     """
@@ -65,6 +66,8 @@ async def retry_async(
         max_retries: Максимальное количество попыток
         base_delay: Базовая задержка
         retry_exceptions: Исключения, при которых нужно повторять
+        retry_if: Дополнительная проверка исключения; если вернула False,
+            исключение пробрасывается сразу, без повторов
         *args, **kwargs: Аргументы функции
 
     Returns:
@@ -78,6 +81,9 @@ async def retry_async(
         except retry_exceptions as e:
             last_exception = e
 
+            if retry_if is not None and not retry_if(e):
+                raise
+
             if attempt == max_retries:
                 logger.error(f"Failed after {max_retries + 1} attempts: {e}")
                 raise
@@ -152,87 +158,52 @@ async def timeout_context(timeout: float):
         raise TimeoutError(f"Operation timed out after {timeout}s")
 
 
+def require_numpy():
+    """
+    Импортировать numpy.
+
+    numpy - опциональная зависимость (extra "numpy"), нужна только для
+    функций, возвращающих массивы.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "This feature requires numpy: pip install 'simulation-client[numpy]'"
+        ) from e
+    return numpy
+
+
 def dict_to_proto(data: Dict, proto_class) -> Any:
-    """Конвертировать словарь в protobuf сообщение."""
-    from .proto import simulator_pb2
+    """
+    Конвертировать словарь в protobuf сообщение.
+
+    Вложенные типы, enum и map поля определяются по дескриптору
+    (см. proto_convert); план конвертации кэшируется для каждого типа.
+    """
+    from .proto_convert import dict_to_message
 
     if proto_class is None:
         raise ValueError("proto_class must be specified")
 
-    proto = proto_class()
-
-    for key, value in data.items():
-        if value is not None:
-            if isinstance(value, dict):
-                # Рекурсивно конвертируем вложенные словари
-                nested_proto = getattr(proto, key)
-                dict_to_proto(value, type(nested_proto))
-            elif isinstance(value, list):
-                # Обрабатываем списки
-                if value and isinstance(value[0], dict):
-                    # Список словарей
-                    for item in value:
-                        getattr(proto, key).add().CopyFrom(
-                            dict_to_proto(
-                                item, getattr(simulator_pb2, key[:-1].title())
-                            )
-                        )
-                else:
-                    # Простой список
-                    getattr(proto, key).extend(value)
-            else:
-                setattr(proto, key, value)
-
-    return proto
+    return dict_to_message(data, proto_class)
 
 
 def proto_to_dict(proto) -> Dict:
-    """Конвертировать protobuf сообщение в словарь."""
+    """
+    Конвертировать protobuf сообщение в словарь.
+
+    Формат - как у proto_convert.message_to_dict: поля без presence
+    выводятся всегда, включая значения по умолчанию (пустые строки тоже,
+    раньше они пропускались); optional поля и вложенные сообщения - только
+    если установлены; enum - по имени. Это ключи
+    json_format.MessageToDict(preserving_proto_field_name=True,
+    always_print_fields_with_no_presence=True). План конвертации
+    кэшируется для каждого типа сообщения.
+    """
     if proto is None:
         return {}
 
-    from google.protobuf.descriptor import FieldDescriptor
-
-    result = {}
-
-    for field in proto.DESCRIPTOR.fields:
-        field_name = field.name
-
-        # Для optional scalar полей (proto3 с presence) пропускаем,
-        # если поле не установлено, чтобы не подставлять значения по умолчанию
-        if getattr(field, "has_presence", False) and not proto.HasField(field_name):
-            continue
-
-        value = getattr(proto, field_name)
-
-        # Проверяем тип поля
-        if field.is_repeated:
-            if field.message_type:
-                # Список сообщений
-                result[field_name] = [proto_to_dict(item) for item in value]
-            else:
-                # Простой список
-                result[field_name] = list(value)
-        elif field.message_type:
-            # Вложенное сообщение
-            if value:
-                result[field_name] = proto_to_dict(value)
-        elif field.type == FieldDescriptor.TYPE_MESSAGE and hasattr(
-            field, "message_type"
-        ):
-            # Map поле (в protobuf 3+ map представлены как сообщения)
-            if hasattr(value, "items"):
-                result[field_name] = dict(value)
-            else:
-                # Обычное вложенное сообщение
-                result[field_name] = proto_to_dict(value)
-        else:
-            # Простое поле
-            if value is not None and value != "":
-                # Конвертируем специальные типы
-                if field.type == FieldDescriptor.TYPE_ENUM:
-                    result[field_name] = field.enum_type.values_by_number[value].name
-                else:
-                    result[field_name] = value
-
-    return result
+    from .proto_convert import message_to_dict
+
+    return message_to_dict(proto)
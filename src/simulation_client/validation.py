@@ -0,0 +1,201 @@
+"""
+Локальная проверка конфигурации симуляции.
+
+Проверяет типичные ошибки SimulationParameters/ProcessGraph без запроса
+к серверу. Результат - ValidationResponse, как у validate_configuration,
+поэтому серверную проверку можно вызывать только после успешной локальной.
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import (
+    ProcessGraph,
+    RequiredMaterial,
+    SimulationParameters,
+    Supplier,
+    ValidationResponse,
+    Warehouse,
+)
+
+
+def validate_process_graph(graph: Optional[ProcessGraph]) -> Tuple[List[str], List[str]]:
+    """
+    Проверить граф процесса.
+
+    Проверяется наличие начального и конечного узлов, маршруты и
+    next_workplace_ids на неизвестные рабочие места, достижимость
+    рабочих мест от начальных узлов и соответствие работников требованиям
+    рабочих мест.
+
+    Args:
+        graph: Граф процесса
+
+    Returns:
+        Tuple[List[str], List[str]]: Ошибки и предупреждения
+    """
+    errors: List[str] = []
+    warnings: List[str] = []
+
+    if graph is None or not graph.workplaces:
+        errors.append("Process graph has no workplaces")
+        return errors, warnings
+
+    workplaces = {wp.workplace_id: wp for wp in graph.workplaces}
+    adjacency: Dict[str, Set[str]] = {wp_id: set() for wp_id in workplaces}
+
+    for route in graph.routes:
+        unknown = [
+            wp_id
+            for wp_id in (route.from_workplace, route.to_workplace)
+            if wp_id not in workplaces
+        ]
+        if unknown:
+            errors.append(
+                f"Route {route.from_workplace} -> {route.to_workplace} "
+                f"references unknown workplace {', '.join(unknown)}"
+            )
+            continue
+        adjacency[route.from_workplace].add(route.to_workplace)
+
+    for wp in graph.workplaces:
+        for next_id in wp.next_workplace_ids:
+            if next_id not in workplaces:
+                errors.append(
+                    f"Workplace {wp.workplace_id} references unknown next workplace {next_id}"
+                )
+            else:
+                adjacency[wp.workplace_id].add(next_id)
+
+    start_nodes = [wp.workplace_id for wp in graph.workplaces if wp.is_start_node]
+    end_nodes = [wp.workplace_id for wp in graph.workplaces if wp.is_end_node]
+    if not start_nodes:
+        errors.append("Process graph has no start node")
+    if not end_nodes:
+        errors.append("Process graph has no end node")
+
+    if start_nodes:
+        reachable = _reachable(start_nodes, adjacency)
+        for wp_id in workplaces:
+            if wp_id not in reachable:
+                errors.append(f"Workplace {wp_id} is unreachable from start nodes")
+        if end_nodes and not reachable.intersection(end_nodes):
+            errors.append("No end node is reachable from start nodes")
+
+    for wp in graph.workplaces:
+        if wp.worker is None:
+            warnings.append(f"Workplace {wp.workplace_id} has no worker")
+            continue
+        if wp.worker.qualification < wp.required_qualification:
+            errors.append(
+                f"Worker {wp.worker.worker_id} at workplace {wp.workplace_id} has "
+                f"qualification {wp.worker.qualification}, "
+                f"required {wp.required_qualification}"
+            )
+        if wp.required_speciality and wp.worker.specialty != wp.required_speciality:
+            errors.append(
+                f"Worker {wp.worker.worker_id} at workplace {wp.workplace_id} has "
+                f"speciality {wp.worker.specialty!r}, "
+                f"required {wp.required_speciality!r}"
+            )
+
+    return errors, warnings
+
+
+def validate_materials(
+    required_materials: Iterable[RequiredMaterial],
+    suppliers: Iterable[Supplier],
+) -> List[str]:
+    """
+    Проверить, что для каждого требуемого материала есть поставщик.
+
+    Материал считается обеспеченным, если у него есть контрактный
+    поставщик или среди поставщиков есть поставщик этого материала
+    (по material_type или product_name).
+
+    Returns:
+        List[str]: Ошибки
+    """
+    supplied: Set[str] = set()
+    for supplier in suppliers:
+        supplied.add(supplier.material_type)
+        supplied.add(supplier.product_name)
+    supplied.discard("")
+
+    errors = []
+    for material in required_materials:
+        if material.has_contracted_supplier:
+            continue
+        if material.material_id in supplied or material.name in supplied:
+            continue
+        errors.append(
+            f"No supplier for required material {material.name or material.material_id}"
+        )
+    return errors
+
+
+def validate_warehouse(warehouse: Optional[Warehouse], name: str) -> List[str]:
+    """Проверить, что загрузка склада не превышает его вместимость."""
+    if warehouse is None:
+        return []
+
+    errors = []
+    stored = sum(warehouse.materials.values())
+    loading = max(warehouse.loading, stored)
+    if loading > warehouse.size:
+        errors.append(
+            f"{name} warehouse {warehouse.warehouse_id} is over capacity: "
+            f"{loading} > {warehouse.size}"
+        )
+    return errors
+
+
+def validate_parameters(
+    parameters: SimulationParameters,
+    required_materials: Optional[Iterable[RequiredMaterial]] = None,
+) -> ValidationResponse:
+    """
+    Проверить параметры симуляции локально.
+
+    Args:
+        parameters: Параметры симуляции
+        required_materials: Требуемые материалы (get_required_materials);
+            если не заданы, обеспеченность материалов не проверяется
+
+    Returns:
+        ValidationResponse: Результат в формате validate_configuration
+    """
+    errors, warnings = validate_process_graph(parameters.processes)
+
+    if required_materials is not None:
+        errors.extend(
+            validate_materials(
+                required_materials,
+                [*parameters.suppliers, *parameters.backup_suppliers],
+            )
+        )
+    elif not parameters.suppliers:
+        warnings.append("No suppliers configured")
+
+    errors.extend(validate_warehouse(parameters.materials_warehouse, "Materials"))
+    errors.extend(validate_warehouse(parameters.product_warehouse, "Product"))
+
+    return ValidationResponse(
+        is_valid=not errors,
+        errors=errors,
+        warnings=warnings,
+        timestamp=datetime.now().isoformat(),
+    )
+
+
+def _reachable(start_nodes: Iterable[str], adjacency: Dict[str, Set[str]]) -> Set[str]:
+    """Рабочие места, достижимые от начальных узлов (BFS)."""
+    seen = set(start_nodes)
+    queue = deque(seen)
+    while queue:
+        for next_id in adjacency[queue.popleft()]:
+            if next_id not in seen:
+                seen.add(next_id)
+                queue.append(next_id)
+    return seen
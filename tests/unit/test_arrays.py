@@ -0,0 +1,138 @@
+"""
+Unit tests for NumPy chart and series representations.
+
+Проверяем:
+- Ряды метрик склада как одномерные массивы
+- Строки графиков как структурированные массивы из моделей и protobuf
+- Сырой ответ get_warehouse_load_chart(decode=False)
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.arrays import (
+    downtime_chart_array,
+    load_chart_array,
+    warehouse_series,
+)
+from src.simulation_client.models import (
+    DowntimeChart,
+    DowntimeData,
+    LoadPoint,
+    MonthlyProductivity,
+    ProductionMetrics,
+    WarehouseLoadChart,
+    WarehouseMetrics,
+)
+from src.simulation_client.proto import simulator_pb2
+
+np = pytest.importorskip("numpy")
+
+
+class TestSeries:
+    """Тесты одномерных рядов."""
+
+    def test_warehouse_metrics(self):
+        """load_over_time и max_capacity_over_time - массивы int64."""
+        metrics = WarehouseMetrics(
+            load_over_time=[1, 2, 3], max_capacity_over_time=[10, 10, 12]
+        )
+
+        series = metrics.to_numpy()
+
+        assert series["load_over_time"].dtype == np.int64
+        assert series["load_over_time"].tolist() == [1, 2, 3]
+        assert series["max_capacity_over_time"].max() == 12
+
+    def test_protobuf_repeated_field(self):
+        """Ряды разбираются из protobuf без модели."""
+        proto = simulator_pb2.WarehouseMetrics(load_over_time=[5, 6])
+
+        series = warehouse_series(proto)
+
+        assert series["load_over_time"].tolist() == [5, 6]
+        assert series["max_capacity_over_time"].size == 0
+
+
+class TestRecords:
+    """Тесты структурированных массивов."""
+
+    def test_load_chart(self):
+        """Точки графика загрузки становятся строками массива."""
+        chart = WarehouseLoadChart(
+            warehouse_id="wh-1",
+            data_points=[
+                LoadPoint(timestamp="2024-01-01", load=3, max_capacity=10),
+                LoadPoint(timestamp="2024-01-02", load=7, max_capacity=10),
+            ],
+        )
+
+        points = chart.to_numpy()
+
+        assert points.dtype.names == ("timestamp", "load", "max_capacity")
+        assert points["load"].tolist() == [3, 7]
+        assert points[1]["timestamp"] == "2024-01-02"
+
+    def test_models_and_protobuf_match(self):
+        """Модель и protobuf дают одинаковый массив."""
+        proto = simulator_pb2.DowntimeChart(
+            downtime_data=[
+                simulator_pb2.DowntimeChart.DowntimeData(
+                    process_name="cut", cause="repair", downtime_minutes=15
+                )
+            ]
+        )
+        model = DowntimeChart(
+            downtime_data=[
+                DowntimeData(process_name="cut", cause="repair", downtime_minutes=15)
+            ]
+        )
+
+        assert np.array_equal(downtime_chart_array(proto), model.to_numpy())
+
+    def test_empty_rows(self):
+        """Пустой график - пустой массив с теми же столбцами."""
+        productivity = ProductionMetrics().to_numpy()
+
+        assert productivity.size == 0
+        assert productivity.dtype.names == ("month", "units_produced")
+
+    def test_monthly_productivity(self):
+        """Месячная продуктивность - структурированный массив."""
+        metrics = ProductionMetrics(
+            monthly_productivity=[
+                MonthlyProductivity(month="jan", units_produced=4),
+                MonthlyProductivity(month="feb", units_produced=6),
+            ]
+        )
+
+        assert metrics.to_numpy()["units_produced"].sum() == 10
+
+
+class TestRawLoadChart:
+    """Тесты get_warehouse_load_chart(decode=False)."""
+
+    @pytest.mark.asyncio
+    async def test_raw_response(self):
+        """decode=False возвращает protobuf для разбора в массив."""
+        client = AsyncSimulationClient(enable_logging=False)
+        client.stub = AsyncMock()
+        raw = simulator_pb2.WarehouseLoadChartResponse(
+            chart=simulator_pb2.WarehouseLoadChart(
+                warehouse_id="wh-1",
+                data_points=[
+                    simulator_pb2.WarehouseLoadChart.LoadPoint(
+                        timestamp="t1", load=2, max_capacity=5
+                    )
+                ],
+            )
+        )
+
+        with patch.object(client, "_with_retry", AsyncMock(return_value=raw)):
+            response = await client.get_warehouse_load_chart(
+                "sim-1", "wh-1", decode=False
+            )
+
+        assert response is raw
+        assert load_chart_array(response.chart)["max_capacity"].tolist() == [5]
@@ -0,0 +1,262 @@
+"""
+Unit tests for AsyncBaseClient.
+
+Проверяем общую логику транспорта:
+- Настройки сжатия канала и отдельных вызовов
+- Лимиты размера сообщений и обработку слишком больших ответов
+"""
+
+import logging
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+import grpc
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.base_client import _parse_compression
+from src.simulation_client.exceptions import MessageTooLargeError
+
+
+class FakeRpcError(grpc.RpcError):
+    """RpcError с заданными code() и details()."""
+
+    def __init__(self, code: grpc.StatusCode, details: str):
+        super().__init__(details)
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+
+class FakeStub:
+    """Stub с одним методом get_simulation."""
+
+    def __init__(self, response_size: int = 0):
+        response = MagicMock()
+        response.ByteSize.return_value = response_size
+        self.get_simulation = AsyncMock(return_value=response)
+
+
+class TestCompression:
+    """Тесты настроек сжатия."""
+
+    def test_parse_compression(self):
+        """Строковые алиасы приводятся к grpc.Compression."""
+        assert _parse_compression(None) is None
+        assert _parse_compression("gzip") == grpc.Compression.Gzip
+        assert _parse_compression("Deflate") == grpc.Compression.Deflate
+        assert _parse_compression("none") == grpc.Compression.NoCompression
+        assert _parse_compression(grpc.Compression.Gzip) == grpc.Compression.Gzip
+
+        with pytest.raises(ValueError):
+            _parse_compression("brotli")
+        with pytest.raises(ValueError):
+            _parse_compression("auto")
+
+    @pytest.mark.asyncio
+    async def test_channel_compression(self):
+        """Сжатие клиента передается в канал."""
+        client = AsyncSimulationClient(compression="gzip")
+
+        with patch("grpc.aio.insecure_channel") as mock_channel:
+            await client._create_channel()
+
+        assert mock_channel.call_args.kwargs["compression"] == grpc.Compression.Gzip
+
+    @pytest.mark.asyncio
+    async def test_call_compression_override(self):
+        """call_compression() задает сжатие для вызовов внутри блока."""
+        client = AsyncSimulationClient()
+        client.stub = FakeStub()
+
+        with client.call_compression("deflate"):
+            await client._with_retry(client.stub.get_simulation, "request")
+        await client._with_retry(client.stub.get_simulation, "request")
+
+        first, second = client.stub.get_simulation.call_args_list
+        assert first.kwargs["compression"] == grpc.Compression.Deflate
+        assert "compression" not in second.kwargs
+
+    @pytest.mark.asyncio
+    async def test_response_sizes_recorded(self):
+        """Размеры ответов запоминаются по методам."""
+        client = AsyncSimulationClient()
+        client.stub = FakeStub(response_size=5000)
+
+        await client._with_retry(client.stub.get_simulation, MagicMock())
+
+        assert client.observed_response_sizes == {"get_simulation": 5000}
+
+
+class TestMessageSizeLimits:
+    """Тесты лимитов размера сообщений."""
+
+    @pytest.mark.asyncio
+    async def test_channel_options(self):
+        """Лимиты передаются в опции канала."""
+        client = AsyncSimulationClient(
+            max_receive_message_length=64 * 1024 * 1024,
+            max_send_message_length=8 * 1024 * 1024,
+        )
+
+        with patch("grpc.aio.insecure_channel") as mock_channel:
+            await client._create_channel()
+
+        options = dict(mock_channel.call_args.kwargs["options"])
+        assert options["grpc.max_receive_message_length"] == 64 * 1024 * 1024
+        assert options["grpc.max_send_message_length"] == 8 * 1024 * 1024
+
+    @pytest.mark.asyncio
+    async def test_message_too_large_is_not_retried(self):
+        """Превышение лимита не повторяется и превращается в MessageTooLargeError."""
+        client = AsyncSimulationClient(max_retries=3)
+        error = FakeRpcError(
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+            "Received message larger than max (5000000 vs. 4194304)",
+        )
+        func = AsyncMock(side_effect=error)
+
+        with pytest.raises(grpc.RpcError) as exc_info:
+            await client._with_retry(func, "request")
+        assert func.call_count == 1
+
+        with pytest.raises(MessageTooLargeError):
+            client._handle_grpc_error(exc_info.value, "Get simulation")
+
+    @pytest.mark.asyncio
+    async def test_large_response_warning(self, caplog):
+        """Ответ ближе порога к лимиту логируется один раз."""
+        client = AsyncSimulationClient(max_receive_message_length=1000)
+        client.stub = FakeStub(response_size=900)
+
+        with caplog.at_level(logging.WARNING):
+            await client._with_retry(client.stub.get_simulation, "request")
+            await client._with_retry(client.stub.get_simulation, "request")
+
+        warnings = [r for r in caplog.records if "max_receive_message_length" in r.message]
+        assert len(warnings) == 1
+
+
+class TestTransport:
+    """Тесты адресов и общего канала."""
+
+    def test_target(self):
+        """TCP адрес собирается из host:port, unix: адрес передается как есть."""
+        assert AsyncSimulationClient("localhost", 50051).target == "localhost:50051"
+        assert (
+            AsyncSimulationClient("unix:/run/simulator.sock").target
+            == "unix:/run/simulator.sock"
+        )
+        assert (
+            AsyncSimulationClient("unix-abstract:simulator").target
+            == "unix-abstract:simulator"
+        )
+
+    @pytest.mark.asyncio
+    async def test_unix_socket_channel(self):
+        """Канал создается для unix: адреса без порта."""
+        client = AsyncSimulationClient("unix:/run/simulator.sock")
+
+        with patch("grpc.aio.insecure_channel") as mock_channel:
+            await client._create_channel()
+
+        assert mock_channel.call_args.args[0] == "unix:/run/simulator.sock"
+
+    @pytest.mark.asyncio
+    async def test_external_channel_is_not_closed(self):
+        """Внешний канал используется в connect() и не закрывается в close()."""
+        channel = MagicMock()
+        channel.close = AsyncMock()
+        client = AsyncSimulationClient(channel=channel, enable_logging=False)
+
+        with patch.object(client, "ping", AsyncMock(return_value=True)), patch(
+            "grpc.aio.insecure_channel"
+        ) as mock_create:
+            await client.connect()
+            await client.close()
+
+        mock_create.assert_not_called()
+        assert client.channel is channel
+        assert not client.owns_channel
+        channel.close.assert_not_called()
+
+
+class TestConnectModes:
+    """Тесты режимов подключения и событий соединения."""
+
+    @staticmethod
+    def _mock_channel():
+        channel = MagicMock()
+        channel.channel_ready = AsyncMock()
+        channel.close = AsyncMock()
+        return channel
+
+    def test_unknown_mode(self):
+        """Неизвестный режим подключения отклоняется."""
+        with pytest.raises(ValueError):
+            AsyncSimulationClient(connect_mode="instant")
+
+    @pytest.mark.asyncio
+    async def test_eager_connect(self):
+        """Режим eager прогревает канал, stub и схемы и сообщает время соединения."""
+        client = AsyncSimulationClient(connect_mode="eager", enable_logging=False)
+        events = []
+        client.add_event_hook(lambda event, data: events.append((event, data)))
+        channel = self._mock_channel()
+
+        with patch("grpc.aio.insecure_channel", return_value=channel), patch(
+            "src.simulation_client.models.build_models", return_value=3
+        ) as mock_build, patch.object(client, "ping", AsyncMock(return_value=True)):
+            await client.connect()
+
+        channel.channel_ready.assert_awaited_once()
+        mock_build.assert_called_once()
+        assert client._stub_methods_owner is client.stub
+        assert client._method_name(client.stub.ping) == "ping"
+
+        assert [event for event, _ in events] == ["connect"]
+        data = events[0][1]
+        assert data["mode"] == "eager"
+        assert data["service"] == "SimulationService"
+        assert data["duration"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_lazy_connect(self):
+        """Режим lazy не делает ping, время соединения измеряет первый вызов."""
+        client = AsyncSimulationClient(connect_mode="lazy", enable_logging=False)
+        events = []
+        client.add_event_hook(lambda event, data: events.append(event))
+
+        with patch("grpc.aio.insecure_channel", return_value=self._mock_channel()), \
+                patch.object(client, "ping", AsyncMock(return_value=True)) as mock_ping:
+            await client.connect()
+
+        mock_ping.assert_not_called()
+        assert events == []
+
+        client.stub = FakeStub()
+        await client._with_retry(client.stub.get_simulation, "request")
+        await client._with_retry(client.stub.get_simulation, "request")
+
+        assert events == ["connect"]
+
+    @pytest.mark.asyncio
+    async def test_failing_hook_is_ignored(self):
+        """Исключение в обработчике не ломает подключение."""
+        client = AsyncSimulationClient(enable_logging=False)
+
+        def broken_hook(event, data):
+            raise RuntimeError("boom")
+
+        client.add_event_hook(broken_hook)
+
+        with patch("grpc.aio.insecure_channel", return_value=self._mock_channel()), \
+                patch.object(client, "ping", AsyncMock(return_value=True)):
+            await client.connect()
+
+        client.remove_event_hook(broken_hook)
+        assert client._event_hooks == []
@@ -0,0 +1,88 @@
+"""
+Unit tests for the adaptive decode executor.
+
+Проверяем:
+- Маленькие ответы конвертируются в event loop
+- Большие ответы конвертируются в пуле потоков и процессов
+- Учет предотвращенной блокировки и событие decode_offloaded
+- Запись результата в зеркало состояния
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.decode_executor import DecodeExecutor
+from src.simulation_client.proto import simulator_pb2
+
+
+def simulation_response(steps: int = 1):
+    simulation = simulator_pb2.Simulation(simulation_id="sim-1", capital=1000)
+    for step in range(1, steps + 1):
+        simulation.parameters.add(step=step)
+    return simulator_pb2.SimulationResponse(
+        simulations=simulation, timestamp="2024-01-01T00:00:00"
+    )
+
+
+class TestDecodeExecutor:
+    """Тесты DecodeExecutor."""
+
+    def test_invalid_mode(self):
+        """Неизвестный режим отклоняется."""
+        with pytest.raises(ValueError):
+            DecodeExecutor(mode="fiber")
+
+    @pytest.mark.asyncio
+    async def test_small_response_inline(self):
+        """Ответ меньше порога конвертируется без пула."""
+        executor = DecodeExecutor(threshold=10**6)
+        client = AsyncSimulationClient(enable_logging=False, decode_executor=executor)
+
+        response = await client._decode_simulation_response(simulation_response())
+
+        assert response.simulations.simulation_id == "sim-1"
+        assert executor.stats["inline"] == 1
+        assert executor._executor is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    async def test_large_response_offloaded(self, mode):
+        """Большой ответ конвертируется в пуле, время учитывается."""
+        executor = DecodeExecutor(threshold=1, mode=mode, max_workers=1)
+        client = AsyncSimulationClient(enable_logging=False, decode_executor=executor)
+        events = []
+        client.add_event_hook(lambda event, data: events.append((event, data)))
+
+        try:
+            response = await client._decode_simulation_response(simulation_response(5))
+        finally:
+            executor.shutdown()
+
+        assert response.simulations.step == 5
+        assert executor.stats["offloaded"] == 1
+        assert executor.stats["stall_prevented"] > 0
+        assert events[0][0] == "decode_offloaded"
+        assert events[0][1]["mode"] == mode
+        # В режиме process распаковка результата выполняется в event loop
+        assert (events[0][1]["loop_duration"] > 0) == (mode == "process")
+        assert executor.stats["stall_prevented"] == pytest.approx(
+            events[0][1]["duration"] - events[0][1]["loop_duration"]
+        )
+        assert client.state_mirror.get("sim-1").step == 5
+
+    @pytest.mark.asyncio
+    async def test_client_methods_use_executor(self):
+        """Методы, возвращающие SimulationResponse, используют исполнитель."""
+        executor = DecodeExecutor(threshold=1)
+        client = AsyncSimulationClient(enable_logging=False, decode_executor=executor)
+        client.stub = AsyncMock()
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=simulation_response())
+        ):
+            response = await client.set_logist("sim-1", "logist-1")
+
+        executor.shutdown()
+        assert response.simulations.simulation_id == "sim-1"
+        assert executor.stats["offloaded"] == 1
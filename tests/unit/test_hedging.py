@@ -0,0 +1,192 @@
+"""
+Unit tests for hedged read requests.
+
+Проверяем:
+- Без достаточного числа наблюдений запрос не хеджируется
+- Медленный основной запрос проигрывает повторному и отменяется
+- Бюджет ограничивает число повторных запросов
+- Методы записи не хеджируются
+- Повторный запрос в реплику и событие hedge через _with_retry
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.hedging import HedgingPolicy, hedged_call
+
+
+def warmed_policy(latency: float = 0.001, **kwargs) -> HedgingPolicy:
+    """Политика с наблюдениями задержки get_simulation."""
+    kwargs.setdefault("min_samples", 5)
+    kwargs.setdefault("min_delay", 0.001)
+    policy = HedgingPolicy(**kwargs)
+    for _ in range(kwargs["min_samples"]):
+        policy.record("get_simulation", latency)
+    return policy
+
+
+def slow_call(delay: float, result="slow"):
+    """Вызов, отвечающий через delay секунд."""
+    state = {"cancelled": False}
+
+    async def call(*args, **kwargs):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return result
+
+    return call, state
+
+
+class TestHedgingPolicy:
+    """Тесты HedgingPolicy."""
+
+    def test_invalid_percentile(self):
+        """Перцентиль вне (0, 100) отклоняется."""
+        with pytest.raises(ValueError):
+            HedgingPolicy(percentile=100)
+
+    def test_read_methods(self):
+        """По умолчанию хеджируются только get_*; ping проверяет свой канал."""
+        policy = HedgingPolicy()
+
+        assert policy.is_hedged("get_simulation")
+        assert not policy.is_hedged("ping")
+        assert not policy.is_hedged("set_logist")
+        assert not policy.is_hedged(None)
+
+    def test_delay_requires_samples(self):
+        """Пока наблюдений меньше min_samples, задержки нет."""
+        policy = HedgingPolicy(min_samples=3, min_delay=0.0)
+        policy.record("get_simulation", 0.1)
+
+        assert policy.delay_for("get_simulation") is None
+
+        policy.record("get_simulation", 0.2)
+        policy.record("get_simulation", 0.3)
+        assert policy.delay_for("get_simulation") == 0.3
+
+
+class TestHedgedCall:
+    """Тесты hedged_call."""
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_samples(self):
+        """Без наблюдений повторный запрос не отправляется."""
+        policy = HedgingPolicy(budget=1.0)
+        primary, _ = slow_call(0.01, "primary")
+        alternate = AsyncMock(return_value="alternate")
+
+        result = await hedged_call(policy, "get_simulation", primary, alternate)
+
+        assert result == "primary"
+        alternate.assert_not_called()
+        assert policy.stats["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_cancels_primary(self):
+        """Повторный запрос побеждает медленный основной, тот отменяется."""
+        policy = warmed_policy(budget=1.0)
+        primary, state = slow_call(10.0)
+        alternate = AsyncMock(return_value="alternate")
+        delays = []
+        expected_delay = policy.delay_for("get_simulation")
+
+        result = await hedged_call(
+            policy,
+            "get_simulation",
+            primary,
+            alternate,
+            "request",
+            on_hedge=delays.append,
+        )
+        await asyncio.sleep(0)
+
+        assert result == "alternate"
+        alternate.assert_awaited_once_with("request")
+        assert state["cancelled"]
+        assert policy.stats["hedge_wins"] == 1
+        assert delays == [expected_delay]
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_hedges(self):
+        """Без бюджета основной запрос просто дожидается."""
+        # Медиана по 20 быстрым наблюдениям не сдвигается медленными ответами
+        policy = warmed_policy(budget=0.5, min_samples=20, percentile=50)
+        alternate = AsyncMock(return_value="alternate")
+
+        results = []
+        for _ in range(4):
+            primary, _ = slow_call(0.01, "primary")
+            results.append(
+                await hedged_call(policy, "get_simulation", primary, alternate)
+            )
+
+        # Бюджет 0.5 на запрос: повторный запрос на каждый второй
+        assert results.count("alternate") == 2
+        assert policy.stats["hedged"] == 2
+        assert policy.stats["budget_exhausted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_both_fail_raises_primary_error(self):
+        """Если оба запроса упали, поднимается ошибка основного."""
+        policy = warmed_policy(budget=1.0)
+
+        async def primary(*args):
+            await asyncio.sleep(0.01)
+            raise ConnectionError("primary")
+
+        alternate = AsyncMock(side_effect=ConnectionError("alternate"))
+
+        with pytest.raises(ConnectionError, match="primary"):
+            await hedged_call(policy, "get_simulation", primary, alternate)
+
+
+class FakeStub:
+    """Stub с медленным get_simulation и методом записи set_logist."""
+
+    def __init__(self, delay: float):
+        self.get_simulation, self.state = slow_call(delay, "primary")
+        self.set_logist = AsyncMock(return_value="written")
+
+
+class TestClientHedging:
+    """Хеджирование в _with_retry."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_to_replica_emits_event(self):
+        """Повторный запрос уходит в реплику, клиент сообщает событие hedge."""
+        client = AsyncSimulationClient(
+            enable_logging=False, hedging=warmed_policy(budget=1.0)
+        )
+        client.stub = FakeStub(delay=10.0)
+        replica = FakeStub(delay=0.0)
+        replica.get_simulation = AsyncMock(return_value="replica")
+        client._hedge_stubs = [replica]
+        events = []
+        client.add_event_hook(lambda event, data: events.append((event, data)))
+
+        response = await client._with_retry(client.stub.get_simulation, "request")
+
+        assert response == "replica"
+        replica.get_simulation.assert_awaited_once_with("request")
+        assert events[0][0] == "hedge"
+        assert events[0][1]["method"] == "get_simulation"
+
+    @pytest.mark.asyncio
+    async def test_write_methods_not_hedged(self):
+        """Методы записи вызываются один раз без хеджирования."""
+        policy = warmed_policy(budget=1.0)
+        client = AsyncSimulationClient(enable_logging=False, hedging=policy)
+        client.stub = FakeStub(delay=0.0)
+
+        response = await client._with_retry(client.stub.set_logist, "request")
+
+        assert response == "written"
+        client.stub.set_logist.assert_awaited_once_with("request")
+        assert policy.stats["requests"] == 0
@@ -0,0 +1,81 @@
+"""
+Unit tests for package import cost.
+
+Проверяем, что импорт пакета ленивый:
+- ``import simulation_client`` не загружает grpc, pydantic и модели
+- схемы моделей строятся при первом использовании
+- публичные классы по-прежнему доступны как атрибуты пакета
+
+Время импорта зависит от загрузки машины и проверяется не здесь, а
+скриптом scripts/benchmark_import_time.py.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+HEAVY_MODULES = [
+    "grpc",
+    "pydantic",
+    "simulation_client.models",
+    "simulation_client.proto.simulator_pb2",
+    "simulation_client.proto.simulator_pb2_grpc",
+    "simulation_client.simulation_client",
+]
+
+
+def _run_in_fresh_interpreter(code: str) -> dict:
+    """Выполнить код в чистом интерпретаторе и вернуть JSON из stdout."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(SRC_DIR), "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime:
+    """Тесты ленивого импорта пакета."""
+
+    def test_package_import_is_lazy(self):
+        """Импорт пакета не загружает тяжелые зависимости."""
+        data = _run_in_fresh_interpreter(
+            "import json, sys\n"
+            "import simulation_client\n"
+            f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+            "print(json.dumps({'heavy': heavy}))\n"
+        )
+
+        assert data["heavy"] == []
+
+    def test_models_are_built_on_first_use(self):
+        """Схемы Pydantic строятся при первом использовании модели."""
+        data = _run_in_fresh_interpreter(
+            "import json\n"
+            "from simulation_client.models import Simulation\n"
+            "before = Simulation.__pydantic_complete__\n"
+            "Simulation(capital=1, step=0, simulation_id='sim')\n"
+            "after = Simulation.__pydantic_complete__\n"
+            "print(json.dumps({'before': before, 'after': after}))\n"
+        )
+
+        assert data == {"before": False, "after": True}
+
+    def test_lazy_attributes(self):
+        """Публичные классы и подмодули доступны как атрибуты пакета."""
+        import src.simulation_client as package
+        from src.simulation_client.unified_client import AsyncUnifiedClient
+
+        assert package.AsyncUnifiedClient is AsyncUnifiedClient
+        assert package.models.Simulation.__name__ == "Simulation"
+        assert set(package.__all__) <= set(dir(package))
+
+        with pytest.raises(AttributeError):
+            package.DoesNotExist
@@ -0,0 +1,117 @@
+"""
+Unit tests for the metrics history fetcher.
+
+Проверяем:
+- Разворачивание protobuf метрик в числовые столбцы
+- Сборку временных рядов по шагам и использование кэша
+- Ошибки запросов отдельных шагов
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.exceptions import SimulationError, ValidationError
+from src.simulation_client.metrics_history import flatten_metrics
+from src.simulation_client.models import Simulation
+from src.simulation_client.proto import simulator_pb2
+from src.simulation_client.result_cache import ResultCache
+
+np = pytest.importorskip("numpy")
+
+
+def factory_response(step: int):
+    return simulator_pb2.FactoryMetricsResponse(
+        metrics=simulator_pb2.FactoryMetrics(profitability=step / 10, oee=0.5)
+    )
+
+
+class TestFlattenMetrics:
+    """Тесты flatten_metrics."""
+
+    def test_scalars_and_numeric_maps(self):
+        """Скалярные поля и числовые словари становятся столбцами."""
+        metrics = simulator_pb2.ProductionMetrics(
+            average_equipment_utilization=0.75,
+            wip_count=3,
+            material_reserves={"steel": 10},
+            monthly_productivity=[
+                simulator_pb2.ProductionMetrics.MonthlyProductivity(
+                    month="jan", units_produced=5
+                )
+            ],
+        )
+
+        values = flatten_metrics("production", metrics)
+
+        assert values == {
+            "production.average_equipment_utilization": 0.75,
+            "production.wip_count": 3.0,
+            "production.finished_goods_count": 0.0,
+            "production.material_reserves.steel": 10.0,
+        }
+
+
+class TestFetchMetricsHistory:
+    """Тесты fetch_metrics_history."""
+
+    @pytest.fixture
+    def client(self):
+        client = AsyncSimulationClient(enable_logging=False)
+        client.stub = AsyncMock()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_columns_in_step_order(self, client):
+        """Столбцы упорядочены по шагам независимо от порядка запроса."""
+
+        async def respond(func, request):
+            return factory_response(request.step)
+
+        with patch.object(client, "_with_retry", AsyncMock(side_effect=respond)):
+            history = await client.fetch_metrics_history("sim-1", steps=[3, 1, 2])
+
+        assert history["step"].tolist() == [1, 2, 3]
+        assert history["factory.profitability"] == pytest.approx([0.1, 0.2, 0.3])
+        assert history["factory.oee"].dtype == np.float64
+
+    @pytest.mark.asyncio
+    async def test_cached_steps_are_reused(self, client):
+        """Завершенные шаги берутся из result_cache."""
+        client.result_cache = ResultCache()
+        client.state_mirror.record(
+            Simulation(capital=1000, step=5, simulation_id="sim-1")
+        )
+        client.result_cache.put(
+            "sim-1", 1, "factory_metrics", factory_response(1).SerializeToString()
+        )
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=factory_response(2))
+        ) as mock_retry:
+            history = await client.fetch_metrics_history("sim-1", steps=[1, 2])
+
+        mock_retry.assert_awaited_once()
+        assert mock_retry.call_args[0][1].step == 2
+        assert history["factory.profitability"] == pytest.approx([0.1, 0.2])
+
+    @pytest.mark.asyncio
+    async def test_failed_steps(self, client):
+        """Ошибки отдельных запросов собираются в SimulationError."""
+
+        async def respond(func, request):
+            if request.step == 2:
+                raise RuntimeError("boom")
+            return factory_response(request.step)
+
+        with patch.object(client, "_with_retry", AsyncMock(side_effect=respond)):
+            with pytest.raises(SimulationError) as exc_info:
+                await client.fetch_metrics_history("sim-1", steps=[1, 2])
+
+        assert exc_info.value.details["failed"] == {"factory@2": "boom"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind(self, client):
+        """Неизвестный вид метрик отклоняется до запросов."""
+        with pytest.raises(ValidationError):
+            await client.fetch_metrics_history("sim-1", steps=[1], kinds=["sales"])
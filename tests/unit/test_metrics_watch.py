@@ -0,0 +1,243 @@
+"""
+Unit tests for the shared metrics watch.
+
+Проверяем:
+- Сравнение ответов без учета timestamp
+- Один опрос на симуляцию для нескольких подписчиков
+- Отправку только изменившихся метрик
+- Остановку опроса после ухода последнего подписчика
+- Продолжение опроса после временных ошибок
+- Немедленный опрос для подписчика, пришедшего во время опроса
+"""
+
+import asyncio
+import contextlib
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.exceptions import ConnectionError
+from src.simulation_client.metrics_watch import MetricsWatcher, metrics_fingerprint
+from src.simulation_client.models import Simulation, SimulationResponse
+from src.simulation_client.proto import simulator_pb2
+
+
+def all_metrics(oee: float, timestamp: str = "2024-01-01T00:00:00"):
+    return simulator_pb2.AllMetricsResponse(
+        factory=simulator_pb2.FactoryMetrics(oee=oee), timestamp=timestamp
+    )
+
+
+@pytest.fixture
+def client():
+    client = AsyncSimulationClient(enable_logging=False)
+    client.stub = AsyncMock()
+    client._metrics_watcher = MetricsWatcher(client, max_interval=0.05)
+    return client
+
+
+class TestMetricsFingerprint:
+    """Тесты metrics_fingerprint."""
+
+    def test_timestamp_is_ignored(self):
+        """Ответы, отличающиеся только timestamp, совпадают."""
+        first = all_metrics(0.5, "2024-01-01T00:00:00")
+        second = all_metrics(0.5, "2024-01-01T00:00:01")
+
+        assert metrics_fingerprint(first) == metrics_fingerprint(second)
+        assert metrics_fingerprint(first) != metrics_fingerprint(all_metrics(0.6))
+        assert first.timestamp == "2024-01-01T00:00:00"
+
+
+class TestWatchMetrics:
+    """Тесты watch_metrics."""
+
+    @pytest.mark.asyncio
+    async def test_only_changes_are_emitted(self, client):
+        """Неизменные ответы не отправляются подписчику."""
+        responses = [all_metrics(0.5), all_metrics(0.5), all_metrics(0.7)]
+
+        async def respond(func, request):
+            return responses.pop(0) if len(responses) > 1 else responses[0]
+
+        received = []
+        with patch.object(client, "_with_retry", AsyncMock(side_effect=respond)):
+            async for metrics in client.watch_metrics("sim-1", interval=0.01, step=1):
+                received.append(metrics.factory.oee)
+                if len(received) == 2:
+                    break
+
+        assert received == [0.5, 0.7]
+
+    @pytest.mark.asyncio
+    async def test_subscribers_share_poller(self, client):
+        """Подписчики одной симуляции используют один опрос."""
+        watcher = client._metrics_watcher
+        oee = iter(range(1, 1000))
+
+        async def respond(func, request):
+            return all_metrics(next(oee) / 1000)
+
+        async def consume(count: int):
+            received = []
+            stream = client.watch_metrics("sim-1", interval=0.01, step=1)
+            async with contextlib.aclosing(stream):
+                async for metrics in stream:
+                    received.append(metrics)
+                    if len(received) == count:
+                        return received
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(side_effect=respond)
+        ) as mock_retry:
+            first = asyncio.create_task(consume(3))
+            second = asyncio.create_task(consume(3))
+            await asyncio.sleep(0)
+            assert len(watcher) == 1
+            await asyncio.gather(first, second)
+
+        assert mock_retry.await_count < 6
+        assert len(watcher) == 0
+
+    @pytest.mark.asyncio
+    async def test_close_stops_subscribers(self, client):
+        """close завершает итераторы подписчиков."""
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=all_metrics(0.5))
+        ):
+            iterator = client.watch_metrics("sim-1", interval=0.01, step=1)
+            assert (await iterator.__anext__()).factory.oee == 0.5
+
+            await client._metrics_watcher.close()
+
+            with pytest.raises(StopAsyncIteration):
+                await iterator.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_raised(self, client):
+        """Ошибка опроса передается подписчику."""
+        with patch.object(
+            client, "_with_retry", AsyncMock(side_effect=RuntimeError("boom"))
+        ):
+            with pytest.raises(RuntimeError, match="boom"):
+                async for _ in client.watch_metrics("sim-1", step=1):
+                    pass
+
+        assert len(client._metrics_watcher) == 0
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, client):
+        """Временная ошибка не прерывает опрос."""
+        responses = [ConnectionError("blip"), ConnectionError("blip"), all_metrics(0.5)]
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(side_effect=responses)
+        ) as mock_retry:
+            async for metrics in client.watch_metrics("sim-1", interval=0.01, step=1):
+                break
+
+        assert metrics.factory.oee == 0.5
+        assert mock_retry.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_persistent_transient_errors_are_raised(self, client):
+        """После max_failures временных ошибок подряд ошибка передается."""
+        client._metrics_watcher = MetricsWatcher(
+            client, max_interval=0.01, max_failures=3
+        )
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(side_effect=ConnectionError("down"))
+        ) as mock_retry:
+            with pytest.raises(ConnectionError, match="down"):
+                async for _ in client.watch_metrics("sim-1", interval=0.01, step=1):
+                    pass
+
+        assert mock_retry.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_subscriber_during_poll_is_not_delayed(self, client):
+        """Подписчик с меньшим интервалом, пришедший во время опроса."""
+        client._metrics_watcher = MetricsWatcher(client, max_interval=60.0)
+        release = asyncio.Event()
+        calls = 0
+
+        async def respond(func, request):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                await release.wait()
+            return all_metrics(0.5 if calls <= 2 else 0.7)
+
+        async def consume(interval: float, count: int):
+            received = []
+            stream = client.watch_metrics("sim-1", interval=interval, step=1)
+            async with contextlib.aclosing(stream):
+                async for metrics in stream:
+                    received.append(metrics.factory.oee)
+                    if len(received) == count:
+                        return received
+
+        with patch.object(client, "_with_retry", AsyncMock(side_effect=respond)):
+            slow = asyncio.create_task(consume(60.0, 10))
+            await asyncio.sleep(0.01)
+            # Второй подписчик будит опрос; третий приходит, пока он идет
+            medium = asyncio.create_task(consume(30.0, 10))
+            await asyncio.sleep(0.01)
+            fast = asyncio.create_task(consume(0.01, 2))
+            await asyncio.sleep(0.01)
+            release.set()
+            received = await asyncio.wait_for(fast, timeout=1.0)
+            for task in (slow, medium):
+                task.cancel()
+            await asyncio.gather(slow, medium, return_exceptions=True)
+
+        assert received == [0.5, 0.7]
+
+    @pytest.mark.asyncio
+    async def test_current_step_from_mirror(self, client):
+        """Без step шаг берется из зеркала без get_simulation на каждый опрос."""
+        client._metrics_watcher = MetricsWatcher(client, max_interval=60.0)
+        client.state_mirror.ttl = 0.0
+        client.state_mirror.record(
+            Simulation(capital=1000, step=4, simulation_id="sim-1")
+        )
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=all_metrics(0.5))
+        ) as mock_retry, patch.object(client, "get_simulation") as get_simulation:
+            async for _ in client.watch_metrics("sim-1", interval=1.0):
+                break
+
+        get_simulation.assert_not_called()
+        assert mock_retry.call_args[0][1].step == 4
+
+    @pytest.mark.asyncio
+    async def test_stale_mirror_step_is_refreshed(self, client):
+        """Зеркало старше интервала опроса не задает шаг: шаг читается заново."""
+        client._metrics_watcher = MetricsWatcher(client, max_interval=60.0)
+        # Запись десятисекундной давности
+        recorded = time.monotonic() - 10
+        with patch(
+            "src.simulation_client.state_mirror.time.monotonic",
+            return_value=recorded,
+        ):
+            client.state_mirror.record(
+                Simulation(capital=1000, step=4, simulation_id="sim-1")
+            )
+        fresh = SimulationResponse(
+            simulations=Simulation(capital=1000, step=9, simulation_id="sim-1"),
+            timestamp="",
+        )
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=all_metrics(0.5))
+        ) as mock_retry, patch.object(
+            client, "get_simulation", AsyncMock(return_value=fresh)
+        ):
+            async for _ in client.watch_metrics("sim-1", interval=1.0):
+                break
+
+        assert mock_retry.call_args[0][1].step == 9
@@ -0,0 +1,289 @@
+"""
+Unit tests for SuccessiveHalvingOptimizer.
+
+Проверяем:
+- Канонический хэш конфигурации и декартово произведение вариантов
+- Раунды: отбор лучшей 1/eta части и рост числа прогонов
+- Учет ошибок прогонов
+- Checkpoint: продолжение без повторных прогонов
+- Экспорт таблицы лидеров в CSV и JSON
+"""
+
+import csv
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.simulation_client import AsyncUnifiedClient
+from src.simulation_client.exceptions import ValidationError
+from src.simulation_client.models import (
+    FactoryMetrics,
+    Simulation,
+    SimulationResponse,
+    SimulationResults,
+)
+from src.simulation_client.optimizer import (
+    SuccessiveHalvingOptimizer,
+    config_hash,
+    grid,
+)
+
+# Рентабельность по стратегии продаж
+PROFITABILITY = {"a": 0.1, "b": 0.4, "c": 0.2, "d": 0.3}
+
+
+def response(profitability: float) -> SimulationResponse:
+    return SimulationResponse(
+        simulations=Simulation(
+            capital=0,
+            step=1,
+            simulation_id="sim",
+            results=[
+                SimulationResults(
+                    step=1, profit=0, cost=0, profitability=profitability
+                )
+            ],
+        ),
+        timestamp="2024-01-01T00:00:00",
+    )
+
+
+def make_client(fail=()):
+    """Мок клиента: рентабельность определяется sales_strategy."""
+
+    async def run(config):
+        if config["sales_strategy"] in fail:
+            raise RuntimeError("boom")
+        return response(PROFITABILITY[config["sales_strategy"]])
+
+    client = MagicMock()
+    client.run_complete_scenario = AsyncMock(side_effect=run)
+    return client
+
+
+def candidates():
+    return grid({"sales_strategy": list(PROFITABILITY)})
+
+
+def runs_by_strategy(client):
+    counts = {}
+    for call in client.run_complete_scenario.await_args_list:
+        strategy = call.args[0]["sales_strategy"]
+        counts[strategy] = counts.get(strategy, 0) + 1
+    return counts
+
+
+class TestCanonicalHash:
+    """Тесты канонического хэша и пространства поиска."""
+
+    def test_order_and_empty_values_ignored(self):
+        """Порядок ключей и поставщиков, пустые значения не меняют хэш."""
+        first = {"supplier_ids": ["s2", "s1"], "sales_strategy": "a"}
+        second = {"sales_strategy": "a", "supplier_ids": ["s1", "s2"], "tender_ids": []}
+
+        assert config_hash(first) == config_hash(second)
+        assert config_hash(first) != config_hash({**first, "sales_strategy": "b"})
+
+    def test_grid(self):
+        """Все сочетания вариантов."""
+        configs = grid({"supplier_ids": [["s1"], ["s2"]], "sales_strategy": ["a", "b"]})
+
+        assert len(configs) == 4
+        assert {"supplier_ids": ["s2"], "sales_strategy": "a"} in configs
+
+
+class TestSuccessiveHalving:
+    """Тесты раундов."""
+
+    def test_validation(self):
+        """Некорректные параметры отклоняются."""
+        with pytest.raises(ValidationError):
+            SuccessiveHalvingOptimizer(make_client(), candidates(), metric="speed")
+        with pytest.raises(ValidationError):
+            SuccessiveHalvingOptimizer(make_client(), [])
+        with pytest.raises(ValidationError):
+            SuccessiveHalvingOptimizer(make_client(), candidates(), eta=1)
+
+    def test_rungs(self):
+        """Число прогонов растет в eta раз до max_replications."""
+        optimizer = SuccessiveHalvingOptimizer(
+            make_client(), candidates(), min_replications=1, max_replications=10
+        )
+
+        assert optimizer.rungs() == [1, 3, 9, 10]
+
+    @pytest.mark.asyncio
+    async def test_best_candidate_gets_most_replications(self):
+        """Слабые кандидаты отсеиваются, лучший получает полный бюджет."""
+        client = make_client()
+        optimizer = SuccessiveHalvingOptimizer(
+            client, candidates(), min_replications=1, max_replications=4, eta=2
+        )
+
+        best = await optimizer.run()
+
+        assert best.config == {"sales_strategy": "b"}
+        assert best.replications == 4
+        assert runs_by_strategy(client) == {"a": 1, "b": 4, "c": 1, "d": 2}
+        assert optimizer.stats["replications_run"] == 8
+        assert optimizer.stats["replications_cached"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fresh_run_has_no_cached_replications(self):
+        """Прогоны прошлых раундов не считаются взятыми из кэша."""
+        optimizer = SuccessiveHalvingOptimizer(
+            make_client(), candidates(), max_replications=9, eta=3
+        )
+
+        await optimizer.run()
+
+        assert optimizer.stats["replications_cached"] == 0
+
+    @pytest.mark.asyncio
+    async def test_minimized_metric(self):
+        """defect_rate минимизируется."""
+        defect_rate = {"a": 0.05, "b": 0.01, "c": 0.03}
+
+        async def run(config):
+            if config["sales_strategy"] not in defect_rate:
+                raise RuntimeError("boom")
+            result = response(0.0)
+            result.simulations.results[-1].factory_metrics = FactoryMetrics(
+                defect_rate=defect_rate[config["sales_strategy"]]
+            )
+            return result
+
+        client = MagicMock(run_complete_scenario=AsyncMock(side_effect=run))
+        optimizer = SuccessiveHalvingOptimizer(
+            client,
+            grid({"sales_strategy": ["a", "b", "c", "x"]}),
+            metric="defect_rate",
+            max_replications=1,
+        )
+
+        best = await optimizer.run()
+        leaderboard = optimizer.leaderboard()
+
+        assert not optimizer.maximize
+        assert best.config == {"sales_strategy": "b"}
+        assert [row.config["sales_strategy"] for row in leaderboard] == [
+            "b",
+            "c",
+            "a",
+            "x",
+        ]
+        assert leaderboard[-1].mean == float("inf")
+
+    @pytest.mark.asyncio
+    async def test_duplicates_evaluated_once(self):
+        """Одинаковые конфигурации оцениваются один раз."""
+        client = make_client()
+        configs = [{"sales_strategy": "a"}, {"sales_strategy": "a", "tender_ids": []}]
+        optimizer = SuccessiveHalvingOptimizer(client, configs, max_replications=1)
+
+        await optimizer.run()
+
+        assert client.run_complete_scenario.await_count == 1
+        assert optimizer.stats["replications_cached"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_candidate_ranked_last(self):
+        """Кандидат без успешных прогонов занимает последнее место."""
+        optimizer = SuccessiveHalvingOptimizer(
+            make_client(fail={"b"}), candidates(), max_replications=1
+        )
+
+        best = await optimizer.run()
+        leaderboard = optimizer.leaderboard()
+
+        assert best.config == {"sales_strategy": "d"}
+        assert leaderboard[-1].config == {"sales_strategy": "b"}
+        assert leaderboard[-1].failures == 1
+
+
+class TestCheckpoint:
+    """Тесты сохранения и экспорта."""
+
+    @pytest.mark.asyncio
+    async def test_resume_from_checkpoint(self, tmp_path):
+        """Повторный запуск берет оценки из checkpoint."""
+        path = tmp_path / "search.json"
+        kwargs = dict(max_replications=4, eta=2, checkpoint=path)
+        await SuccessiveHalvingOptimizer(make_client(), candidates(), **kwargs).run()
+
+        client = make_client()
+        optimizer = SuccessiveHalvingOptimizer(client, candidates(), **kwargs)
+        best = await optimizer.run()
+
+        client.run_complete_scenario.assert_not_called()
+        assert best.config == {"sales_strategy": "b"}
+        # Использованные результаты из checkpoint: a 1, b 4, c 1, d 2
+        assert optimizer.stats["replications_cached"] == 8
+        assert not (tmp_path / "search.json.tmp").exists()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_after_each_replication(self, tmp_path):
+        """Checkpoint сохраняется после каждого прогона, не только раунда."""
+        path = tmp_path / "search.json"
+        saved_before_call = []
+
+        async def run(config):
+            if path.exists():
+                state = json.loads(path.read_text())
+                saved_before_call.append(
+                    sum(len(saved["values"]) for saved in state["evaluations"].values())
+                )
+            else:
+                saved_before_call.append(0)
+            return response(PROFITABILITY[config["sales_strategy"]])
+
+        client = MagicMock(run_complete_scenario=AsyncMock(side_effect=run))
+        optimizer = SuccessiveHalvingOptimizer(
+            client,
+            candidates(),
+            max_replications=1,
+            max_concurrency=1,
+            checkpoint=path,
+            checkpoint_interval=0,
+        )
+
+        await optimizer.run()
+
+        assert saved_before_call == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_export_leaderboard(self, tmp_path):
+        """Таблица лидеров сохраняется в CSV и JSON."""
+        optimizer = SuccessiveHalvingOptimizer(
+            make_client(), candidates(), max_replications=1
+        )
+        await optimizer.run()
+
+        with optimizer.export_leaderboard(tmp_path / "board.csv").open() as file:
+            rows = list(csv.DictReader(file))
+        exported = json.loads(
+            optimizer.export_leaderboard(tmp_path / "board.json").read_text()
+        )
+
+        assert [json.loads(row["config"])["sales_strategy"] for row in rows] == [
+            "b",
+            "d",
+            "c",
+            "a",
+        ]
+        assert exported[0]["mean"] == pytest.approx(0.4)
+
+
+class TestUnifiedClientOptimizer:
+    """Создание оптимизатора из AsyncUnifiedClient."""
+
+    def test_factory(self):
+        """optimizer() передает параметры и сам клиент."""
+        client = AsyncUnifiedClient(enable_logging=False)
+
+        optimizer = client.optimizer(candidates(), eta=4, max_concurrency=2)
+
+        assert optimizer.client is client
+        assert optimizer.eta == 4
+        assert optimizer.max_concurrency == 2
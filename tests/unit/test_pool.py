@@ -0,0 +1,147 @@
+"""
+Unit tests for SimulationPool.
+
+Проверяем:
+- Фоновое заполнение пула до size
+- Выдачу из пула и холодное создание, метрики и событие simulation_lease
+- Пополнение после выдачи и продолжение после ошибок
+- create_simulation AsyncUnifiedClient через пул
+"""
+
+import asyncio
+import itertools
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.simulation_client import AsyncUnifiedClient
+from src.simulation_client.models import SimulationConfig
+from src.simulation_client.pool import SimulationPool
+
+
+def make_client(side_effect=None):
+    """Мок клиента, создающего симуляции sim-0, sim-1, ..."""
+    counter = itertools.count()
+    client = MagicMock()
+    client.create_simulation = AsyncMock(
+        side_effect=side_effect
+        or (lambda: SimulationConfig(simulation_id=f"sim-{next(counter)}"))
+    )
+    return client
+
+
+class TestSimulationPool:
+    """Тесты SimulationPool."""
+
+    def test_invalid_size(self):
+        """Размер пула должен быть положительным."""
+        with pytest.raises(ValueError):
+            SimulationPool(make_client(), size=0)
+
+    @pytest.mark.asyncio
+    async def test_fill_and_lease(self):
+        """Пул заполняется в фоне, выдача из пула считается попаданием."""
+        client = make_client()
+        pool = SimulationPool(client, size=3, refill_rate=1000)
+
+        async with pool:
+            await pool.start(wait=True)
+            assert pool.stats["ready"] == 3
+
+            lease = await pool.acquire()
+
+            assert lease.simulation_id == "sim-0"
+            assert lease.from_pool
+            await asyncio.sleep(0.01)
+            assert pool.stats["ready"] == 3
+
+        assert pool.stats["hits"] == 1
+        assert pool.stats["created"] == 4
+        client._emit.assert_called_once_with(
+            "simulation_lease", simulation_id="sim-0", from_pool=True, wait=lease.wait
+        )
+
+    @pytest.mark.asyncio
+    async def test_cold_create_when_empty(self):
+        """Пустой пул создает симуляцию на месте."""
+        pool = SimulationPool(make_client(), size=1, refill_rate=1000)
+
+        lease = await pool.acquire()
+
+        assert not lease.from_pool
+        assert pool.stats["cold_creates"] == 1
+        assert pool.stats["hit_rate"] == 0.0
+        assert [lease.simulation_id for lease in pool.leases] == ["sim-0"]
+
+    @pytest.mark.asyncio
+    async def test_refill_rate_is_bounded(self):
+        """Пополнение не быстрее refill_rate созданий в секунду."""
+        client = make_client()
+        pool = SimulationPool(client, size=50, refill_rate=10)
+
+        await pool.start()
+        await asyncio.sleep(0.25)
+        await pool.close()
+
+        # 10 токенов сразу и около 2 за 0.25 секунды
+        assert 10 <= client.create_simulation.await_count <= 14
+
+    @pytest.mark.asyncio
+    async def test_refill_continues_after_error(self):
+        """Ошибка создания учитывается, пополнение продолжается."""
+        configs = iter(
+            [RuntimeError("unavailable"), SimulationConfig(simulation_id="sim-1")]
+        )
+
+        def create():
+            item = next(configs)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        pool = SimulationPool(make_client(create), size=1, refill_rate=1000)
+
+        await pool.start(wait=True)
+        await pool.close()
+
+        assert pool.stats["refill_failures"] == 1
+        assert pool.stats["created"] == 1
+
+
+class TestUnifiedClientPool:
+    """create_simulation через пул."""
+
+    @pytest.mark.asyncio
+    async def test_create_simulation_uses_pool(self):
+        """После start() create_simulation берет симуляцию из пула."""
+        client = AsyncUnifiedClient(enable_logging=False)
+        create = AsyncMock(return_value=SimulationConfig(simulation_id="sim-1"))
+
+        with patch.object(client.sim_client, "create_simulation", create):
+            pool = client.simulation_pool(size=1, refill_rate=1000)
+            await pool.start(wait=True)
+
+            config = await client.create_simulation()
+            await client.close()
+
+        assert config.simulation_id == "sim-1"
+        assert pool.stats["hits"] == 1
+        assert not pool.running
+
+    @pytest.mark.asyncio
+    async def test_repeated_call_reuses_pool(self):
+        """Повторный simulation_pool() перенастраивает подключенный пул."""
+        client = AsyncUnifiedClient(enable_logging=False)
+        create = AsyncMock(return_value=SimulationConfig(simulation_id="sim-1"))
+
+        with patch.object(client.sim_client, "create_simulation", create):
+            pool = client.simulation_pool(size=1, refill_rate=1000)
+            await pool.start(wait=True)
+
+            assert client.simulation_pool(size=3, refill_rate=500) is pool
+            await pool.start(wait=True)
+            await client.close()
+
+        assert (pool.size, pool.refill_rate) == (3, 500)
+        assert pool.stats["created"] == 3
+        assert not pool.running
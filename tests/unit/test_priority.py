@@ -0,0 +1,196 @@
+"""
+Unit tests for priority lanes.
+
+Проверяем:
+- Класс вызова из call_priority() и значение по умолчанию
+- Интерактивные вызовы выходят из очереди раньше фоновых по весам
+- Фоновые вызовы не занимают больше batch_share слотов
+- Отмена ожидающего вызова не теряет слот
+- Токен лимитера клиента берется в порядке приоритетов
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.exceptions import ConnectionError
+from src.simulation_client.priority import PriorityScheduler, call_priority
+
+
+async def run_queued(scheduler, priorities, order):
+    """Поставить вызовы в очередь, пока единственный слот занят."""
+    holder_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def holder():
+        async with scheduler.slot("batch"):
+            holder_started.set()
+            await release.wait()
+
+    async def call(index, priority):
+        async with scheduler.slot(priority):
+            order.append((index, priority))
+
+    holder_task = asyncio.create_task(holder())
+    await holder_started.wait()
+    tasks = [
+        asyncio.create_task(call(index, priority))
+        for index, priority in enumerate(priorities)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder_task, *tasks)
+
+
+class TestCallPriority:
+    """Тесты call_priority и resolve."""
+
+    def test_context_variable(self):
+        """Класс берется из call_priority(), иначе - по умолчанию."""
+        scheduler = PriorityScheduler(default_priority="interactive")
+
+        with call_priority("batch"):
+            assert scheduler.resolve() == "batch"
+            assert scheduler.resolve("interactive") == "interactive"
+        assert scheduler.resolve() == "interactive"
+
+    def test_unknown_priority(self):
+        """Неизвестный класс отклоняется."""
+        with pytest.raises(ValueError):
+            with call_priority("urgent"):
+                pass
+
+
+class TestPriorityScheduler:
+    """Тесты PriorityScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_weighted_dispatch(self):
+        """Пока ждут обе очереди, интерактивные выходят по весам 4:1."""
+        scheduler = PriorityScheduler(max_in_flight=1)
+        order = []
+
+        await run_queued(scheduler, ["batch"] * 5 + ["interactive"] * 5, order)
+
+        first_five = [priority for _, priority in order[:5]]
+        assert first_five.count("interactive") == 4
+        # Внутри класса порядок FIFO
+        batch = [index for index, priority in order if priority == "batch"]
+        assert batch == sorted(batch)
+        assert scheduler.stats["interactive"]["dispatched"] == 5
+        assert scheduler.stats["batch"]["dispatched"] == 6
+
+    @pytest.mark.asyncio
+    async def test_batch_share_reserves_slots(self):
+        """Фоновые вызовы заняли свою долю - интерактивный проходит сразу."""
+        scheduler = PriorityScheduler(max_in_flight=4, batch_share=0.5)
+        release = asyncio.Event()
+        running = []
+
+        async def call(priority):
+            async with scheduler.slot(priority):
+                running.append(priority)
+                if priority == "batch":
+                    await release.wait()
+
+        batch = [asyncio.create_task(call("batch")) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        assert running == ["batch", "batch"]
+
+        await asyncio.wait_for(call("interactive"), timeout=1.0)
+        assert scheduler.stats["batch"]["queued"] == 2
+
+        release.set()
+        await asyncio.gather(*batch)
+        assert running.count("batch") == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_nothing(self):
+        """Отмененный в очереди вызов не занимает слот."""
+        scheduler = PriorityScheduler(max_in_flight=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot():
+                await release.wait()
+
+        async def waiter():
+            async with scheduler.slot():
+                pass
+
+        holder_task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter_task = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        waiter_task.cancel()
+        release.set()
+        await holder_task
+
+        await asyncio.wait_for(waiter(), timeout=1.0)
+        assert scheduler.stats["interactive"]["in_flight"] == 0
+
+
+class TestClientPriority:
+    """Планировщик в _with_retry."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_in_priority_order(self):
+        """Токен лимитера берется при выпуске из очереди, а не в _rate_limit."""
+        scheduler = PriorityScheduler(max_in_flight=1)
+        client = AsyncSimulationClient(
+            enable_logging=False, rate_limit=100, priority_scheduler=scheduler
+        )
+        client.rate_limiter = MagicMock(wait=AsyncMock())
+        stub = MagicMock()
+        stub.get_simulation = AsyncMock(return_value=MagicMock(ByteSize=lambda: 0))
+        client.stub = stub
+
+        await client._rate_limit()
+        client.rate_limiter.wait.assert_not_awaited()
+
+        with client.call_priority("batch"):
+            await client._with_retry(stub.get_simulation, "request")
+
+        client.rate_limiter.wait.assert_awaited_once()
+        assert scheduler.stats["batch"]["dispatched"] == 1
+        assert scheduler.stats["batch"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_released_during_backoff(self):
+        """Пауза между повторами не держит слот планировщика."""
+        scheduler = PriorityScheduler(max_in_flight=1)
+        client = AsyncSimulationClient(
+            enable_logging=False, max_retries=1, priority_scheduler=scheduler
+        )
+        stub = MagicMock()
+        stub.get_simulation = AsyncMock(
+            side_effect=[ConnectionError("down"), MagicMock(ByteSize=lambda: 0)]
+        )
+        in_flight_during_sleep = []
+
+        async def sleep(delay):
+            in_flight_during_sleep.append(scheduler.stats["interactive"]["in_flight"])
+
+        with patch("src.simulation_client.utils.asyncio.sleep", side_effect=sleep):
+            await client._with_retry(stub.get_simulation, "request")
+
+        assert in_flight_during_sleep == [0]
+        assert scheduler.stats["interactive"]["dispatched"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ping_goes_through_scheduler(self):
+        """ping берет слот и токен лимитера через планировщик."""
+        scheduler = PriorityScheduler(max_in_flight=1)
+        client = AsyncSimulationClient(
+            enable_logging=False, rate_limit=100, priority_scheduler=scheduler
+        )
+        client.rate_limiter = MagicMock(wait=AsyncMock())
+        client.stub = MagicMock(ping=AsyncMock(return_value=MagicMock()))
+
+        with patch.object(client, "_parse_ping_response", return_value=True):
+            assert await client.ping()
+
+        client.rate_limiter.wait.assert_awaited_once()
+        assert scheduler.stats["interactive"]["dispatched"] == 1
@@ -0,0 +1,322 @@
+"""
+Unit tests for process graph editing.
+
+Проверяем:
+- Индексированный граф и локальные правки
+- Отправку всех правок одним update_process_graph
+- Методы AsyncUnifiedClient, работающие через редактор
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.simulation_client import AsyncUnifiedClient
+from src.simulation_client.exceptions import ValidationError
+from src.simulation_client.models import (
+    ProcessGraph,
+    Route,
+    Simulation,
+    SimulationParameters,
+    SimulationResponse,
+    Workplace,
+    WorkshopPlanResponse,
+)
+from src.simulation_client.process_graph import (
+    IndexedProcessGraph,
+    ProcessGraphEditor,
+)
+
+
+def make_workplace(workplace_id: str, **fields) -> Workplace:
+    return Workplace(
+        workplace_id=workplace_id,
+        workplace_name=f"name-{workplace_id}",
+        required_speciality="welder",
+        required_qualification=3,
+        **fields,
+    )
+
+
+@pytest.fixture
+def graph():
+    """Граф из трех рабочих мест и одного маршрута."""
+    return ProcessGraph(
+        process_graph_id="graph-1",
+        workplaces=[
+            make_workplace("wp_1", next_workplace_ids=["wp_2"]),
+            make_workplace("wp_2"),
+            make_workplace("wp_3"),
+        ],
+        routes=[Route(length=2, from_workplace="wp_1", to_workplace="wp_2")],
+    )
+
+
+@pytest.fixture
+def client(graph):
+    """Мок AsyncSimulationClient."""
+    client = MagicMock()
+    client.get_workshop_plan = AsyncMock(
+        return_value=WorkshopPlanResponse(workshop_plan=graph)
+    )
+    client.update_process_graph = AsyncMock(return_value=MagicMock(spec=SimulationResponse))
+    return client
+
+
+class TestIndexedProcessGraph:
+    """Тесты индексированного графа."""
+
+    def test_round_trip(self, graph):
+        """to_model() возвращает исходный граф и не разделяет с ним объекты."""
+        indexed = IndexedProcessGraph.from_model(graph)
+
+        assert indexed.to_model() == graph
+        indexed.get_workplace("wp_1").is_start_node = True
+        assert graph.workplaces[0].is_start_node is False
+
+    def test_routes_keep_next_workplace_ids(self, graph):
+        """Маршруты синхронизируются с next_workplace_ids."""
+        indexed = IndexedProcessGraph.from_model(graph)
+
+        indexed.add_route("wp_2", "wp_3", 4)
+        assert indexed.get_workplace("wp_2").next_workplace_ids == ["wp_3"]
+
+        indexed.remove_route("wp_1", "wp_2")
+        assert indexed.get_workplace("wp_1").next_workplace_ids == []
+
+        with pytest.raises(ValidationError):
+            indexed.remove_route("wp_1", "wp_2")
+        with pytest.raises(ValidationError):
+            indexed.add_route("wp_1", "missing", 1)
+
+    def test_remove_workplace(self, graph):
+        """Удаление места удаляет его маршруты и ссылки на него."""
+        indexed = IndexedProcessGraph.from_model(graph)
+
+        indexed.remove_workplace("wp_2")
+
+        assert "wp_2" not in indexed
+        assert indexed.routes == {}
+        assert indexed.get_workplace("wp_1").next_workplace_ids == []
+
+
+class TestGraphTopology:
+    """Тесты индексов и топологических запросов."""
+
+    @pytest.fixture
+    def line(self):
+        """Граф wp_1 -> wp_2 -> wp_4 и wp_1 -> wp_3 -> wp_4 на сетке."""
+        graph = IndexedProcessGraph(
+            "graph-2",
+            [make_workplace(f"wp_{i}", x=i, y=0) for i in range(1, 5)],
+        )
+        graph.add_route("wp_1", "wp_2", 1)
+        graph.add_route("wp_1", "wp_3", 5)
+        graph.add_route("wp_2", "wp_4", 1)
+        graph.add_route("wp_3", "wp_4", 2)
+        return graph
+
+    def test_adjacency_and_grid(self, line):
+        """Смежность и клетки сетки доступны по индексам."""
+        assert line.successors("wp_1") == ["wp_2", "wp_3"]
+        assert line.predecessors("wp_4") == ["wp_2", "wp_3"]
+        assert line.cell(3, 0).workplace_id == "wp_3"
+        assert line.cell(0, 0) is None
+        assert len(line.free_cells()) == 7 * 7 - 4
+
+        line.upsert_workplace("wp_3", x=6, y=6)
+        assert line.cell(3, 0) is None
+        assert line.occupancy()[6][6] == "wp_3"
+
+        with pytest.raises(ValidationError):
+            line.upsert_workplace("wp_2", x=6, y=6)
+
+    def test_topological_order_and_critical_path(self, line):
+        """Топологический порядок и критический путь по длине маршрутов."""
+        assert line.topological_order() == ["wp_1", "wp_2", "wp_3", "wp_4"]
+        assert line.critical_path() == (7, ["wp_1", "wp_3", "wp_4"])
+        assert line.has_cycle() is False
+
+        line.add_route("wp_2", "wp_4", 10)
+        assert line.critical_path() == (11, ["wp_1", "wp_2", "wp_4"])
+
+    def test_cycle_detection(self, line):
+        """Цикл обнаруживается, а топологический порядок недоступен."""
+        line.add_route("wp_4", "wp_1", 1)
+
+        assert line.has_cycle()
+        cycle = line.find_cycle()
+        assert cycle[0] == cycle[-1]
+        assert set(cycle) <= {"wp_1", "wp_2", "wp_3", "wp_4"}
+        with pytest.raises(ValidationError):
+            line.topological_order()
+
+        line.remove_route("wp_4", "wp_1")
+        assert line.find_cycle() is None
+
+    def test_remove_workplace_updates_indexes(self, line):
+        """Удаление места обновляет смежность и сетку."""
+        line.remove_workplace("wp_3")
+
+        assert line.successors("wp_1") == ["wp_2"]
+        assert line.predecessors("wp_4") == ["wp_2"]
+        assert line.cell(3, 0) is None
+        assert line.critical_path() == (2, ["wp_1", "wp_2", "wp_4"])
+
+    def test_to_proto_round_trip(self, line):
+        """to_proto() и from_proto() сохраняют граф."""
+        line.upsert_workplace("wp_1", is_start_node=True)
+
+        proto = line.to_proto()
+        restored = IndexedProcessGraph.from_proto(proto)
+
+        assert proto.workplaces[0].is_start_node
+        assert proto.workplaces[0].HasField("x")
+        assert restored.to_model() == line.to_model()
+
+    def test_from_proto_keeps_default_scalars(self):
+        """Нулевые и пустые значения полей не теряются при чтении proto."""
+        graph = IndexedProcessGraph(
+            "graph-0",
+            [
+                Workplace(
+                    workplace_id="wp_0",
+                    workplace_name="",
+                    required_speciality="",
+                    required_qualification=0,
+                )
+            ],
+            [Route(length=0, from_workplace="wp_0", to_workplace="wp_0")],
+        )
+
+        restored = IndexedProcessGraph.from_proto(graph.to_proto())
+
+        assert restored.to_model() == graph.to_model()
+
+
+class TestProcessGraphEditor:
+    """Тесты транзакционного редактора."""
+
+    @pytest.mark.asyncio
+    async def test_commit_sends_one_update(self, client):
+        """Все правки отправляются одним update_process_graph."""
+        async with ProcessGraphEditor(client, "sim-1") as editor:
+            editor.set_start_node("wp_1")
+            editor.set_end_node("wp_3")
+            editor.add_route("wp_2", "wp_3", 5)
+            editor.delete_route("wp_1", "wp_2")
+            editor.configure_workplace(
+                "wp_4",
+                workplace_name="paint",
+                required_speciality="painter",
+                required_qualification=2,
+            )
+
+        client.get_workshop_plan.assert_awaited_once_with("sim-1")
+        client.update_process_graph.assert_awaited_once()
+        simulation_id, sent = client.update_process_graph.call_args.args
+        assert simulation_id == "sim-1"
+        assert [wp.workplace_id for wp in sent.workplaces] == [
+            "wp_1",
+            "wp_2",
+            "wp_3",
+            "wp_4",
+        ]
+        assert [(r.from_workplace, r.to_workplace) for r in sent.routes] == [
+            ("wp_2", "wp_3")
+        ]
+        assert sent.workplaces[0].is_start_node
+        assert sent.workplaces[2].is_end_node
+        assert editor.response is client.update_process_graph.return_value
+        assert editor.pending_edits == 0
+
+    @pytest.mark.asyncio
+    async def test_no_edits_no_update(self, client):
+        """Без правок update_process_graph не вызывается."""
+        async with ProcessGraphEditor(client, "sim-1"):
+            pass
+
+        client.update_process_graph.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_exception_discards_edits(self, client):
+        """При исключении правки не отправляются."""
+        with pytest.raises(RuntimeError):
+            async with ProcessGraphEditor(client, "sim-1") as editor:
+                editor.set_start_node("wp_1")
+                raise RuntimeError("abort")
+
+        client.update_process_graph.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_load_from_parameters(self, client, graph):
+        """Граф берется из последних параметров симуляции."""
+        client.get_simulation = AsyncMock(
+            return_value=SimulationResponse(
+                simulations=Simulation(
+                    capital=0,
+                    step=1,
+                    simulation_id="sim-1",
+                    parameters=[
+                        SimulationParameters(),
+                        SimulationParameters(processes=graph),
+                    ],
+                ),
+                timestamp="",
+            )
+        )
+
+        editor = ProcessGraphEditor(client, "sim-1", source="parameters")
+        indexed = await editor.load()
+
+        client.get_workshop_plan.assert_not_called()
+        assert indexed.process_graph_id == "graph-1"
+        assert len(indexed) == 3
+
+    @pytest.mark.asyncio
+    async def test_rollback(self, client):
+        """rollback() возвращает загруженный граф."""
+        editor = ProcessGraphEditor(client, "sim-1")
+        await editor.load()
+        editor.remove_workplace("wp_1")
+
+        editor.rollback()
+
+        assert "wp_1" in editor.graph
+        assert editor.pending_edits == 0
+
+
+class TestUnifiedGraphMethods:
+    """Тесты методов графа AsyncUnifiedClient."""
+
+    @pytest.fixture
+    def unified(self, client):
+        unified = AsyncUnifiedClient()
+        client.edit_process_graph = lambda simulation_id, source, graph: (
+            ProcessGraphEditor(client, simulation_id, source, graph)
+        )
+        unified.sim_client = client
+        return unified
+
+    @pytest.mark.asyncio
+    async def test_add_process_route(self, unified, client):
+        """add_process_route работает через update_process_graph."""
+        result = await unified.add_process_route("sim-1", 7, "wp_2", "wp_3")
+
+        sent = client.update_process_graph.call_args.args[1]
+        assert sent.routes[-1] == Route(
+            length=7, from_workplace="wp_2", to_workplace="wp_3"
+        )
+        assert result is client.update_process_graph.return_value
+
+    @pytest.mark.asyncio
+    async def test_configure_new_workplace(self, unified, client):
+        """Новое рабочее место создается с именем по типу."""
+        await unified.configure_workplace_in_graph(
+            "sim-1", "wp_9", "assembly", is_start_node=True
+        )
+
+        sent = client.update_process_graph.call_args.args[1]
+        created = sent.workplaces[-1]
+        assert created.workplace_id == "wp_9"
+        assert created.workplace_name == "assembly"
+        assert created.is_start_node
@@ -0,0 +1,188 @@
+"""
+Unit tests for the descriptor-compiled protobuf <-> dict converters.
+
+Проверяем:
+- Совместимость proto_to_dict с google.protobuf.json_format
+- Round-trip dict_to_proto(proto_to_dict(m)) == m на случайных сообщениях
+- enum, map, optional presence и вложенные сообщения
+- Кэширование планов
+"""
+
+import random
+
+import pytest
+from google.protobuf import json_format
+from google.protobuf.descriptor import FieldDescriptor
+
+from src.simulation_client import proto_convert
+from src.simulation_client.proto import simulator_pb2
+from src.simulation_client.utils import dict_to_proto, proto_to_dict
+
+ROOT_TYPES = [
+    simulator_pb2.SimulationResponse,
+    simulator_pb2.AllMetricsResponse,
+    simulator_pb2.SimulationParameters,
+    simulator_pb2.Workplace,
+]
+
+_INT_RANGES = {
+    FieldDescriptor.TYPE_INT32: (-(2**31), 2**31 - 1),
+    FieldDescriptor.TYPE_UINT32: (0, 2**32 - 1),
+    FieldDescriptor.TYPE_INT64: (-(2**63), 2**63 - 1),
+    FieldDescriptor.TYPE_UINT64: (0, 2**64 - 1),
+}
+
+
+def random_scalar(rng: random.Random, field: FieldDescriptor):
+    if field.type == FieldDescriptor.TYPE_STRING:
+        return rng.choice(["", "a", "steel", "Цех 1", "x" * rng.randint(1, 20)])
+    if field.type == FieldDescriptor.TYPE_BOOL:
+        return rng.random() < 0.5
+    if field.type == FieldDescriptor.TYPE_DOUBLE:
+        return rng.choice([0.0, rng.uniform(-1e6, 1e6), 0.1])
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        return rng.choice(field.enum_type.values).number
+    low, high = _INT_RANGES[field.type]
+    return rng.choice([0, low, high, rng.randint(low, high)])
+
+
+def fill_random(message, rng: random.Random, depth: int = 0):
+    """Заполнить сообщение случайными значениями по дескриптору."""
+    for field in message.DESCRIPTOR.fields:
+        if rng.random() < 0.3:
+            continue
+        target = getattr(message, field.name)
+        is_map = (
+            field.message_type is not None
+            and field.message_type.GetOptions().map_entry
+        )
+        if is_map:
+            key_field = field.message_type.fields_by_name["key"]
+            value_field = field.message_type.fields_by_name["value"]
+            for _ in range(rng.randint(0, 2)):
+                key = random_scalar(rng, key_field)
+                if value_field.message_type is not None:
+                    if depth < 3:
+                        fill_random(target[key], rng, depth + 1)
+                else:
+                    target[key] = random_scalar(rng, value_field)
+        elif field.message_type is not None:
+            if depth >= 3:
+                continue
+            if field.is_repeated:
+                for _ in range(rng.randint(0, 2)):
+                    fill_random(target.add(), rng, depth + 1)
+            else:
+                target.SetInParent()
+                fill_random(target, rng, depth + 1)
+        elif field.is_repeated:
+            target.extend(random_scalar(rng, field) for _ in range(rng.randint(0, 3)))
+        else:
+            setattr(message, field.name, random_scalar(rng, field))
+    return message
+
+
+def random_messages(count: int = 40):
+    rng = random.Random(20240101)
+    for index in range(count):
+        proto_class = ROOT_TYPES[index % len(ROOT_TYPES)]
+        yield fill_random(proto_class(), rng)
+
+
+class TestRoundTrip:
+    """Round-trip на случайных сообщениях."""
+
+    @pytest.mark.parametrize("message", list(random_messages()))
+    def test_round_trip(self, message):
+        """dict_to_proto(proto_to_dict(m)) восстанавливает сообщение."""
+        data = proto_to_dict(message)
+
+        assert dict_to_proto(data, type(message)) == message
+
+    @pytest.mark.parametrize("message", list(random_messages(12)))
+    def test_parsed_by_json_format(self, message):
+        """Словарь proto_to_dict разбирается json_format в то же сообщение."""
+        data = proto_to_dict(message)
+
+        assert json_format.ParseDict(data, type(message)()) == message
+
+    @pytest.mark.parametrize("message", list(random_messages(12)))
+    def test_accepts_json_format_output(self, message):
+        """dict_to_proto принимает MessageToDict (json-имена, int64 строками)."""
+        data = json_format.MessageToDict(message)
+
+        assert dict_to_proto(data, type(message)) == message
+
+    @pytest.mark.parametrize("message", list(random_messages(12)))
+    def test_matches_json_format_fields(self, message):
+        """Набор полей совпадает с MessageToDict с полями по умолчанию."""
+        expected = json_format.MessageToDict(
+            message,
+            always_print_fields_with_no_presence=True,
+            preserving_proto_field_name=True,
+        )
+
+        assert set(proto_to_dict(message)) == set(expected)
+
+
+class TestFieldKinds:
+    """Тесты отдельных видов полей."""
+
+    def test_optional_presence(self):
+        """Неустановленные optional поля не попадают в словарь."""
+        workplace = simulator_pb2.Workplace(workplace_id="wp-1")
+        assert "x" not in proto_to_dict(workplace)
+
+        workplace.x = 0
+        assert proto_to_dict(workplace)["x"] == 0
+
+    def test_default_scalars_present(self):
+        """Скаляры без presence выводятся и со значением по умолчанию."""
+        data = proto_to_dict(simulator_pb2.Workplace(workplace_id="wp-1"))
+
+        assert data["workplace_name"] == ""
+        assert data["required_qualification"] == 0
+        assert data["is_start_node"] is False
+        assert data["required_stages"] == []
+        assert "worker" not in data
+
+    def test_enum_names(self):
+        """enum конвертируется по имени и обратно."""
+        request_class = simulator_pb2.SetWarehouseInventoryWorkerRequest
+        message = request_class(warehouse_type=simulator_pb2.WAREHOUSE_TYPE_MATERIALS)
+
+        data = proto_to_dict(message)
+
+        assert data["warehouse_type"] == "WAREHOUSE_TYPE_MATERIALS"
+        assert dict_to_proto(data, request_class) == message
+
+    def test_nested_types_from_descriptor(self):
+        """Типы вложенных сообщений берутся из дескриптора, а не из имени ключа."""
+        message = dict_to_proto(
+            {
+                "simulations": {
+                    "simulation_id": "sim-1",
+                    "parameters": [{"step": 2, "suppliers": [{"supplier_id": "s1"}]}],
+                }
+            },
+            simulator_pb2.SimulationResponse,
+        )
+
+        parameters = message.simulations.parameters[0]
+        assert parameters.step == 2
+        assert parameters.suppliers[0].supplier_id == "s1"
+
+    def test_unknown_field(self):
+        """Неизвестный ключ - ValueError."""
+        with pytest.raises(ValueError, match="no field 'unknown'"):
+            dict_to_proto({"unknown": 1}, simulator_pb2.Workplace)
+
+    def test_plans_are_cached(self):
+        """План строится один раз для типа сообщения."""
+        proto_convert.clear_plans()
+        descriptor = simulator_pb2.Workplace.DESCRIPTOR
+
+        first = proto_convert.to_dict_plan(descriptor)
+        proto_to_dict(simulator_pb2.Workplace())
+
+        assert proto_convert.to_dict_plan(descriptor) is first
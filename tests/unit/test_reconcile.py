@@ -0,0 +1,319 @@
+"""
+Unit tests for SimulationReconciler (apply desired parameters).
+
+Проверяем:
+- Пустой план для совпадающих параметров
+- Удаления, добавления и смену роли поставщика
+- Настройки: логист, склады, политики, сертификации, улучшения
+- Порядок фаз и неприменимые изменения
+- Выполнение вызовов, декодирование последнего ответа и ошибки
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.exceptions import SimulationError
+from src.simulation_client.models import (
+    Certification,
+    Consumer,
+    LeanImprovement,
+    Logist,
+    ProcessGraph,
+    ProductionPlanRow,
+    ProductionSchedule,
+    Simulation,
+    SimulationParameters,
+    SimulationResponse,
+    Supplier,
+    Tender,
+    Warehouse,
+    WarehouseType,
+    Worker,
+)
+from src.simulation_client.reconcile import SimulationReconciler
+
+
+def supplier(supplier_id: str, **overrides) -> Supplier:
+    fields = dict(
+        supplier_id=supplier_id,
+        name=supplier_id,
+        product_name="steel",
+        material_type="steel",
+        delivery_period=5,
+        special_delivery_period=2,
+        reliability=0.9,
+        product_quality=0.9,
+        cost=100,
+        special_delivery_cost=150,
+    )
+    fields.update(overrides)
+    return Supplier(**fields)
+
+
+def tender(tender_id: str) -> Tender:
+    return Tender(
+        tender_id=tender_id,
+        consumer=Consumer(consumer_id="c1", name="Consumer", type="гос."),
+        cost=1000,
+        quantity_of_products=10,
+    )
+
+
+def warehouse(size: int, worker_id: str = None) -> Warehouse:
+    worker = None
+    if worker_id is not None:
+        worker = Worker(
+            worker_id=worker_id, name=worker_id, qualification=3, specialty="", salary=1
+        )
+    return Warehouse(warehouse_id="w", inventory_worker=worker, size=size, loading=0)
+
+
+def current_parameters() -> SimulationParameters:
+    return SimulationParameters(
+        suppliers=[supplier("s1"), supplier("s2")],
+        backup_suppliers=[supplier("b1")],
+        tenders=[tender("t1"), tender("t2")],
+        materials_warehouse=warehouse(100, "w1"),
+        sales_strategy="low_price",
+        certifications=[Certification(certificate_type="ISO", is_obtained=False)],
+        lean_improvements=[LeanImprovement(improvement_id="5S", name="5S")],
+    )
+
+
+def calls(result):
+    return [(action.method, action.target) for action in result.applied]
+
+
+class TestPlan:
+    """Тесты вычисления вызовов."""
+
+    def test_no_changes(self):
+        """Совпадающие параметры не дают вызовов."""
+        result = SimulationReconciler.plan(current_parameters(), current_parameters())
+
+        assert result.applied == []
+        assert result.skipped == []
+
+    def test_suppliers_and_tenders(self):
+        """Лишние удаляются, новые добавляются, смена роли - удаление и добавление."""
+        desired = current_parameters()
+        desired.suppliers = [supplier("s1"), supplier("b1"), supplier("s3")]
+        desired.backup_suppliers = [supplier("s2")]
+        desired.tenders = [tender("t2"), tender("t3")]
+
+        result = SimulationReconciler.plan(current_parameters(), desired)
+
+        assert set(calls(result)) == {
+            ("delete_supplier", "s2"),
+            ("delete_supplier", "b1"),
+            ("delete_tender", "t1"),
+            ("add_supplier", "b1"),
+            ("add_supplier", "s3"),
+            ("add_supplier", "s2"),
+            ("add_tender", "t3"),
+        }
+        added = {
+            action.target: action.kwargs["is_backup"]
+            for action in result.applied
+            if action.method == "add_supplier"
+        }
+        assert added == {"b1": False, "s3": False, "s2": True}
+        # Удаления выполняются раньше добавлений
+        phases = [action.phase for action in result.applied]
+        assert phases == sorted(phases)
+        assert result.applied[0].method.startswith("delete_")
+
+    def test_settings(self):
+        """Логист, склад, политики, сертификации и улучшения."""
+        desired = current_parameters()
+        desired.logist = Logist(
+            worker_id="l1",
+            name="L",
+            qualification=1,
+            specialty="",
+            salary=1,
+            speed=1,
+            vehicle_type="truck",
+        )
+        desired.materials_warehouse = warehouse(150, "w2")
+        desired.dealing_with_defects = "rework"
+        desired.sales_strategy = "low_price"
+        desired.certifications = [Certification(certificate_type="ISO", is_obtained=True)]
+        desired.lean_improvements = [
+            LeanImprovement(improvement_id="5S", name="5S"),
+            LeanImprovement(improvement_id="TPM", name="TPM", is_implemented=True),
+        ]
+        desired.suppliers[0] = supplier(
+            "s1", quality_inspection=True, delivery_period=3
+        )
+
+        result = SimulationReconciler.plan(current_parameters(), desired)
+
+        assert set(calls(result)) == {
+            ("set_logist", "l1"),
+            ("set_warehouse_worker", "materials_warehouse"),
+            ("increase_warehouse_size", "materials_warehouse"),
+            ("set_dealing_with_defects", "dealing_with_defects"),
+            ("set_certification_status", "ISO"),
+            ("set_lean_improvement_status", "TPM"),
+            ("set_quality_inspection", "s1"),
+            ("set_delivery_period", "s1"),
+        }
+        increase = next(
+            action
+            for action in result.applied
+            if action.method == "increase_warehouse_size"
+        )
+        assert increase.kwargs == {
+            "warehouse_type": WarehouseType.WAREHOUSE_TYPE_MATERIALS,
+            "size": 50,
+        }
+
+    def test_graph_and_plan_last(self):
+        """Граф и строки плана выполняются после тендеров; удаление строк невозможно."""
+        current = current_parameters()
+        current.production_schedule = ProductionSchedule(
+            rows=[ProductionPlanRow(tender_id="t1"), ProductionPlanRow(tender_id="t2")]
+        )
+        desired = current_parameters()
+        desired.tenders.append(tender("t3"))
+        desired.processes = ProcessGraph(process_graph_id="g1")
+        desired.production_schedule = ProductionSchedule(
+            rows=[
+                ProductionPlanRow(tender_id="t2"),
+                ProductionPlanRow(tender_id="t3", planned_quantity=5),
+            ]
+        )
+
+        result = SimulationReconciler.plan(current, desired)
+
+        assert calls(result) == [
+            ("add_tender", "t3"),
+            ("update_process_graph", "g1"),
+            ("set_production_plan_row", "t3"),
+        ]
+        assert result.skipped == ["production_schedule row t1: no RPC to delete it"]
+
+    def test_warehouse_cannot_shrink(self):
+        """Уменьшение склада сообщается как неприменимое."""
+        desired = current_parameters()
+        desired.materials_warehouse = warehouse(50, "w1")
+
+        result = SimulationReconciler.plan(current_parameters(), desired)
+
+        assert result.applied == []
+        assert result.skipped == ["materials_warehouse.size: cannot decrease 100 -> 50"]
+
+
+@pytest.fixture
+def client():
+    """Мок AsyncSimulationClient."""
+    client = MagicMock()
+    client._get_current_parameters = AsyncMock(return_value=current_parameters())
+    for method in ("delete_supplier", "add_supplier", "add_tender", "delete_tender"):
+        setattr(client, method, AsyncMock(return_value="raw"))
+    client._decode_simulation_response = AsyncMock(return_value=None)
+    return client
+
+
+class TestApply:
+    """Тесты выполнения вызовов."""
+
+    @pytest.mark.asyncio
+    async def test_apply_executes_calls(self, client):
+        """Вызовы выполняются с ID симуляции, последний ответ декодируется."""
+        desired = current_parameters()
+        desired.suppliers.append(supplier("s3"))
+        desired.tenders = [tender("t1")]
+
+        result = await SimulationReconciler(client, "sim-1").apply(desired)
+
+        client.add_supplier.assert_awaited_once_with(
+            "sim-1", supplier_id="s3", is_backup=False
+        )
+        client.delete_tender.assert_awaited_once_with("sim-1", tender_id="t2")
+        client._decode_simulation_response.assert_awaited_once_with("raw")
+        assert result.changed
+
+    @pytest.mark.asyncio
+    async def test_concurrent_last_phase_fetches_state(self, client):
+        """После параллельной последней фазы состояние загружается заново."""
+        client.get_simulation = AsyncMock(return_value="fetched")
+        desired = current_parameters()
+        desired.tenders.extend([tender("t3"), tender("t4")])
+
+        result = await SimulationReconciler(client, "sim-1").apply(desired)
+
+        assert client.add_tender.await_count == 2
+        client._decode_simulation_response.assert_not_called()
+        client.get_simulation.assert_awaited_once_with("sim-1")
+        assert result.response == "fetched"
+
+    @pytest.mark.asyncio
+    async def test_dry_run(self, client):
+        """dry_run не выполняет вызовы."""
+        desired = current_parameters()
+        desired.tenders = []
+
+        reconciler = SimulationReconciler(client, "sim-1")
+        result = await reconciler.apply(desired, dry_run=True)
+
+        assert len(result.applied) == 2
+        client.delete_tender.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_later_phases(self, client):
+        """Ошибка фазы удалений останавливает добавления."""
+        client.delete_tender = AsyncMock(side_effect=RuntimeError("boom"))
+        desired = current_parameters()
+        desired.tenders = [tender("t2"), tender("t3")]
+
+        with pytest.raises(SimulationError) as exc_info:
+            await SimulationReconciler(client, "sim-1").apply(desired)
+
+        assert exc_info.value.details["failed"] == {"delete_tender:t1": "boom"}
+        client.add_tender.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failure_forgets_mirror(self):
+        """После ошибки фазы повторный apply() планирует от свежего состояния."""
+        client = AsyncSimulationClient(enable_logging=False)
+        client.state_mirror.record(
+            Simulation(
+                capital=0,
+                step=1,
+                simulation_id="sim-1",
+                parameters=[current_parameters()],
+            )
+        )
+        desired = current_parameters()
+        desired.tenders = [tender("t2"), tender("t3")]
+        # Сервер уже удалил t1; добавление t3 упало
+        applied = current_parameters()
+        applied.tenders = [tender("t2")]
+        fresh = SimulationResponse(
+            simulations=Simulation(
+                capital=0, step=1, simulation_id="sim-1", parameters=[applied]
+            ),
+            timestamp="",
+        )
+
+        with patch.object(
+            client, "delete_tender", AsyncMock(return_value="raw")
+        ), patch.object(
+            client, "add_tender", AsyncMock(side_effect=RuntimeError("boom"))
+        ), patch.object(
+            client, "get_simulation", AsyncMock(return_value=fresh)
+        ) as get_simulation:
+            reconciler = SimulationReconciler(client, "sim-1")
+            with pytest.raises(SimulationError):
+                await reconciler.apply(desired)
+
+            assert "sim-1" not in client.state_mirror
+            retry = await reconciler.apply(desired, dry_run=True)
+
+        get_simulation.assert_awaited_once_with("sim-1")
+        assert [(action.method, action.target) for action in retry.applied] == [
+            ("add_tender", "t3")
+        ]
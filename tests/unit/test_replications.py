@@ -0,0 +1,258 @@
+"""
+Unit tests for the Monte Carlo replication runner.
+
+Проверяем:
+- Потоковую статистику Уэлфорда и квантили Стьюдента
+- Раннюю остановку по точности и остановку по max_replications
+- Учет ошибок прогонов
+- run_replications AsyncUnifiedClient
+"""
+
+import asyncio
+import random
+import statistics
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.simulation_client import AsyncUnifiedClient
+from src.simulation_client.exceptions import SimulationError, ValidationError
+from src.simulation_client.models import (
+    FactoryMetrics,
+    Simulation,
+    SimulationResponse,
+    SimulationResults,
+)
+from src.simulation_client.replications import (
+    ReplicationRunner,
+    RunningStats,
+    t_quantile,
+)
+
+
+def make_results(profit: float, oee: float = 0.8) -> SimulationResults:
+    return SimulationResults(
+        profit=int(profit),
+        cost=100,
+        profitability=profit / 100,
+        factory_metrics=FactoryMetrics(oee=oee, defect_rate=0.01),
+    )
+
+
+def noisy_replicate(noise: float, seed: int = 1):
+    """Прогон с прибылью 1000 +- noise."""
+    rng = random.Random(seed)
+
+    async def replicate(index: int) -> SimulationResults:
+        await asyncio.sleep(0)
+        return make_results(1000 + rng.uniform(-noise, noise))
+
+    return replicate
+
+
+class TestStatistics:
+    """Тесты RunningStats и t_quantile."""
+
+    def test_welford_matches_statistics(self):
+        """Среднее и дисперсия совпадают с модулем statistics."""
+        rng = random.Random(7)
+        values = [rng.gauss(50, 10) for _ in range(200)]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert (stats.min, stats.max) == (min(values), max(values))
+
+    def test_nan_skipped(self):
+        """NaN не учитываются."""
+        stats = RunningStats()
+        stats.add(float("nan"))
+
+        assert stats.count == 0
+        assert stats.half_width() == float("inf")
+
+    @pytest.mark.parametrize(
+        "df, expected",
+        [(1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (10, 2.228), (30, 2.042)],
+    )
+    def test_t_quantile(self, df, expected):
+        """Квантили t-распределения для 95% интервала, включая малые df."""
+        assert t_quantile(0.975, df) == pytest.approx(expected, rel=1e-3)
+        assert t_quantile(0.025, df) == pytest.approx(-expected, rel=1e-3)
+
+    def test_t_quantile_large_df(self):
+        """При больших df приближение непрерывно продолжает точные значения."""
+        assert t_quantile(0.975, 31) == pytest.approx(2.040, rel=1e-3)
+        assert t_quantile(0.995, 120) == pytest.approx(2.617, rel=1e-3)
+
+
+class TestReplicationRunner:
+    """Тесты ReplicationRunner."""
+
+    def test_unknown_metric(self):
+        """Неизвестная метрика отклоняется."""
+        with pytest.raises(ValidationError):
+            ReplicationRunner(noisy_replicate(1), metrics=["revenue"])
+
+    @pytest.mark.asyncio
+    async def test_early_stop(self):
+        """Малый разброс - остановка сразу после min_replications."""
+        runner = ReplicationRunner(
+            noisy_replicate(1),
+            min_replications=5,
+            max_replications=100,
+            max_concurrency=2,
+            relative_precision=0.01,
+        )
+
+        summary = await runner.run()
+
+        assert summary.converged
+        # Одновременно завершившиеся прогоны тоже учитываются
+        assert 5 <= summary.replications <= 6
+        assert summary.metrics["profit"].mean == pytest.approx(1000, abs=2)
+        assert summary.metrics["profit"].half_width < 10
+        assert summary.metrics["oee"].mean == pytest.approx(0.8)
+
+    @pytest.mark.asyncio
+    async def test_stops_at_max_replications(self):
+        """Большой разброс - прогоны до max_replications."""
+        runner = ReplicationRunner(
+            noisy_replicate(900),
+            min_replications=3,
+            max_replications=10,
+            relative_precision=0.001,
+        )
+
+        summary = await runner.run()
+
+        assert not summary.converged
+        assert summary.replications == 10
+
+    @pytest.mark.asyncio
+    async def test_absolute_precision(self):
+        """Абсолютная цель по метрике заменяет относительную."""
+        runner = ReplicationRunner(
+            noisy_replicate(100),
+            metrics=["profit"],
+            min_replications=3,
+            max_replications=500,
+            relative_precision=None,
+            precision={"profit": 20},
+        )
+
+        summary = await runner.run()
+
+        assert summary.converged
+        assert summary.metrics["profit"].half_width <= 20
+        assert set(summary.metrics) == {"profit"}
+
+    @pytest.mark.asyncio
+    async def test_failures(self):
+        """Ошибки учитываются; если упали все прогоны - SimulationError."""
+        async def flaky(index: int) -> SimulationResults:
+            if index % 2:
+                raise RuntimeError("simulator unavailable")
+            return make_results(1000)
+
+        # Без цели точности выполняются все max_replications прогонов
+        runner = ReplicationRunner(
+            flaky, min_replications=2, max_replications=6, relative_precision=None
+        )
+        summary = await runner.run()
+        assert not summary.converged
+        assert summary.failed == 3
+        assert summary.replications == 3
+
+        async def broken(index: int) -> SimulationResults:
+            raise RuntimeError("simulator unavailable")
+
+        with pytest.raises(SimulationError) as exc_info:
+            await ReplicationRunner(broken, max_replications=5).run()
+        assert len(exc_info.value.details["failed"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_cancel_cancels_pending(self):
+        """Отмена run() отменяет незавершенные прогоны."""
+        started = []
+        cancelled = []
+
+        async def hang(index: int) -> SimulationResults:
+            started.append(index)
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+
+        task = asyncio.ensure_future(
+            ReplicationRunner(hang, max_concurrency=3).run()
+        )
+        while len(started) < 3:
+            await asyncio.sleep(0)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert sorted(cancelled) == [0, 1, 2]
+
+
+class TestUnifiedClientReplications:
+    """run_replications через run_complete_scenario."""
+
+    @pytest.mark.asyncio
+    async def test_run_replications(self):
+        """Каждый прогон выполняет сценарий, результаты берутся с последнего шага."""
+        client = AsyncUnifiedClient(enable_logging=False)
+        response = SimulationResponse(
+            simulations=Simulation(
+                capital=0,
+                step=1,
+                simulation_id="sim-1",
+                results=[make_results(500), make_results(1000)],
+            ),
+            timestamp="2024-01-01T00:00:00",
+        )
+        scenario = AsyncMock(return_value=response)
+
+        with patch.object(client, "run_complete_scenario", scenario):
+            summary = await client.run_replications(
+                {"tender_ids": ["t1"]}, min_replications=3, max_concurrency=1
+            )
+
+        assert summary.replications == 3
+        assert summary.metrics["profit"].mean == 1000
+        scenario.assert_awaited_with({"tender_ids": ["t1"]})
+
+    @pytest.mark.asyncio
+    async def test_defaults_converge_on_realistic_noise(self):
+        """С параметрами по умолчанию точность достигается задолго до max."""
+        client = AsyncUnifiedClient(enable_logging=False)
+        rng = random.Random(3)
+
+        async def scenario(config):
+            profit = rng.gauss(100000, 5000)
+            results = SimulationResults(
+                profit=int(profit),
+                cost=700000,
+                profitability=profit / 700000,
+                factory_metrics=FactoryMetrics(
+                    oee=rng.gauss(0.75, 0.03),
+                    defect_rate=max(rng.gauss(0.01, 0.003), 0.0),
+                ),
+            )
+            return SimulationResponse(
+                simulations=Simulation(
+                    capital=0, step=1, simulation_id="sim-1", results=[results]
+                ),
+                timestamp="",
+            )
+
+        with patch.object(client, "run_complete_scenario", side_effect=scenario):
+            summary = await client.run_replications({"tender_ids": ["t1"]})
+
+        assert summary.converged
+        assert summary.replications < 40
+        assert summary.metrics["defect_rate"].half_width <= 0.002
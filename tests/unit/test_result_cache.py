@@ -0,0 +1,139 @@
+"""
+Unit tests for the immutable-result cache.
+
+Проверяем:
+- LRU в памяти и сохранение в SQLite между экземплярами
+- Инвалидацию по simulation_id
+- Кэширование метрик только завершенных шагов в AsyncSimulationClient
+"""
+
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.models import Simulation
+from src.simulation_client.proto import simulator_pb2
+from src.simulation_client.result_cache import ResultCache
+
+
+class TestResultCache:
+    """Тесты ResultCache."""
+
+    def test_memory_lru(self):
+        """Старые записи вытесняются из памяти."""
+        cache = ResultCache(max_memory_entries=2)
+        cache.put("sim-1", 1, "factory_metrics", b"1")
+        cache.put("sim-1", 2, "factory_metrics", b"2")
+        assert cache.get("sim-1", 1, "factory_metrics") == b"1"
+        cache.put("sim-1", 3, "factory_metrics", b"3")
+
+        assert cache.get("sim-1", 2, "factory_metrics") is None
+        assert cache.get("sim-1", 1, "factory_metrics") == b"1"
+        assert cache.stats["hits"] == 2
+        assert cache.stats["misses"] == 1
+
+    def test_sqlite_persistence(self, tmp_path):
+        """Записи доступны новому экземпляру с тем же файлом."""
+        path = str(tmp_path / "cache" / "results.sqlite")
+        cache = ResultCache(path)
+        cache.put("sim-1", 1, "all_metrics", b"\x00payload")
+        cache.close()
+
+        reopened = ResultCache(path)
+        assert reopened.get("sim-1", 1, "all_metrics") == b"\x00payload"
+        assert reopened.stats["disk_hits"] == 1
+        assert len(reopened) == 1
+        reopened.close()
+
+    def test_invalidate(self, tmp_path):
+        """invalidate удаляет записи симуляции из памяти и с диска."""
+        cache = ResultCache(str(tmp_path / "results.sqlite"))
+        cache.put("sim-1", 1, "factory_metrics", b"1")
+        cache.put("sim-2", 1, "factory_metrics", b"2")
+
+        cache.invalidate("sim-1")
+
+        assert cache.get("sim-1", 1, "factory_metrics") is None
+        assert cache.get("sim-2", 1, "factory_metrics") == b"2"
+        assert len(cache) == 1
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_async_disk_io_off_loop(self, tmp_path):
+        """aget/aput работают с SQLite не в потоке event loop."""
+        path = str(tmp_path / "results.sqlite")
+        cache = ResultCache(path, max_memory_entries=1)
+        threads = []
+        disk_put = cache._disk_put
+
+        def record_thread(*args):
+            threads.append(threading.get_ident())
+            return disk_put(*args)
+
+        with patch.object(cache, "_disk_put", side_effect=record_thread):
+            await cache.aput("sim-1", 1, "all_metrics", b"1")
+            await cache.aput("sim-1", 2, "all_metrics", b"2")
+
+        assert threads and threading.get_ident() not in threads
+        assert await cache.aget("sim-1", 1, "all_metrics") == b"1"
+        assert await cache.aget("sim-1", 3, "all_metrics") is None
+        assert cache.stats["disk_hits"] == 1
+        assert cache.stats["misses"] == 1
+
+        await cache.ainvalidate("sim-1")
+        assert len(cache) == 0
+        cache.close()
+
+
+class TestClientResultCache:
+    """Тесты кэша метрик в AsyncSimulationClient."""
+
+    @pytest.fixture
+    def client(self):
+        client = AsyncSimulationClient(enable_logging=False, result_cache=ResultCache())
+        client.stub = AsyncMock()
+        return client
+
+    @staticmethod
+    def metrics_response():
+        return simulator_pb2.FactoryMetricsResponse(
+            metrics=simulator_pb2.FactoryMetrics(profitability=0.25, oee=0.8),
+            timestamp="2024-01-01T00:00:00",
+        )
+
+    @pytest.mark.asyncio
+    async def test_final_step_is_cached(self, client):
+        """Метрики завершенного шага запрашиваются у сервера один раз."""
+        client.state_mirror.record(
+            Simulation(capital=1000, step=3, simulation_id="sim-1")
+        )
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=self.metrics_response())
+        ) as mock_retry:
+            first = await client.get_factory_metrics("sim-1", step=2)
+            second = await client.get_factory_metrics("sim-1", step=2)
+
+        mock_retry.assert_awaited_once()
+        assert mock_retry.call_args[0][0] == client.stub.get_factory_metrics
+        assert first == second
+        assert second.metrics.profitability == 0.25
+
+    @pytest.mark.asyncio
+    async def test_current_step_is_not_cached(self, client):
+        """Метрики текущего шага и шагов неизвестной симуляции не кэшируются."""
+        client.state_mirror.record(
+            Simulation(capital=1000, step=3, simulation_id="sim-1")
+        )
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=self.metrics_response())
+        ) as mock_retry:
+            await client.get_factory_metrics("sim-1", step=3)
+            await client.get_factory_metrics("sim-1", step=3)
+            await client.get_factory_metrics("sim-2", step=1)
+
+        assert mock_retry.await_count == 3
+        assert len(client.result_cache) == 0
@@ -0,0 +1,146 @@
+"""
+Unit tests for ProductionScheduleSync.
+
+Проверяем:
+- Сравнение планов по tender_id
+- Отправку только изменившихся строк без декодирования ответов
+- Ограничение параллелизма и обработку ошибок
+- Итоговое состояние: get_simulation после параллельной отправки
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.simulation_client.exceptions import SimulationError
+from src.simulation_client.models import (
+    ProductionPlanRow,
+    ProductionSchedule,
+    ProductionScheduleResponse,
+)
+from src.simulation_client.schedule_sync import ProductionScheduleSync
+
+
+def make_schedule(*quantities) -> ProductionSchedule:
+    return ProductionSchedule(
+        rows=[
+            ProductionPlanRow(tender_id=f"t{i}", planned_quantity=quantity)
+            for i, quantity in enumerate(quantities)
+        ]
+    )
+
+
+@pytest.fixture
+def client():
+    """Мок AsyncSimulationClient."""
+    client = MagicMock()
+    client.get_production_schedule = AsyncMock(
+        return_value=ProductionScheduleResponse(schedule=make_schedule(1, 2, 3))
+    )
+    client.set_production_plan_row = AsyncMock(return_value="raw")
+    client._decode_simulation_response = AsyncMock(return_value="decoded")
+    client.get_simulation = AsyncMock(return_value="fetched")
+    return client
+
+
+class TestProductionScheduleSync:
+    """Тесты синхронизации производственного плана."""
+
+    def test_diff(self):
+        """Изменившиеся и новые строки отправляются, лишние сообщаются."""
+        current = make_schedule(1, 2, 3)
+        desired = ProductionSchedule(
+            rows=[
+                ProductionPlanRow(tender_id="t0", planned_quantity=1),
+                ProductionPlanRow(tender_id="t1", planned_quantity=20),
+                ProductionPlanRow(tender_id="t9", planned_quantity=5),
+            ]
+        )
+
+        changed, unchanged, not_in_desired = ProductionScheduleSync.diff(
+            current, desired
+        )
+
+        assert [row.tender_id for row in changed] == ["t1", "t9"]
+        assert unchanged == ["t0"]
+        assert not_in_desired == ["t2"]
+
+    @pytest.mark.asyncio
+    async def test_sync_sends_only_changes(self, client):
+        """Отправляются только изменения без декодирования ответов."""
+        sync = ProductionScheduleSync(client, "sim-1")
+
+        result = await sync.sync(make_schedule(1, 20, 30))
+
+        client.get_production_schedule.assert_awaited_once_with("sim-1")
+        assert client.set_production_plan_row.await_count == 2
+        for call in client.set_production_plan_row.call_args_list:
+            assert call.kwargs == {"decode": False}
+        client._decode_simulation_response.assert_not_called()
+        assert result.updated == ["t1", "t2"]
+        assert result.unchanged == ["t0"]
+        # Последний ответ на клиенте не обязательно последний на сервере
+        client.get_simulation.assert_awaited_once_with("sim-1")
+        assert result.response == "fetched"
+
+    @pytest.mark.asyncio
+    async def test_sequential_decodes_last_response(self, client):
+        """При отправке по одному декодируется последний ответ."""
+        sync = ProductionScheduleSync(client, "sim-1", max_concurrency=1)
+
+        result = await sync.sync(make_schedule(1, 20, 30))
+
+        client._decode_simulation_response.assert_awaited_once_with("raw")
+        client.get_simulation.assert_not_called()
+        assert result.response == "decoded"
+
+    @pytest.mark.asyncio
+    async def test_no_changes(self, client):
+        """Без изменений запросы на запись не отправляются."""
+        result = await ProductionScheduleSync(client, "sim-1").sync(
+            make_schedule(1, 2, 3)
+        )
+
+        client.set_production_plan_row.assert_not_called()
+        assert result.response is None
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self, client):
+        """Одновременно выполняется не больше max_concurrency запросов."""
+        active = 0
+        peak = 0
+
+        async def slow_set(simulation_id, row, decode):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return "raw"
+
+        client.set_production_plan_row = AsyncMock(side_effect=slow_set)
+        sync = ProductionScheduleSync(client, "sim-1", max_concurrency=2)
+
+        await sync.sync(make_schedule(*range(10, 20)), current=ProductionSchedule())
+
+        client.get_production_schedule.assert_not_called()
+        assert client.set_production_plan_row.await_count == 10
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_partial_failure(self, client):
+        """Ошибки отдельных строк собираются в SimulationError.details."""
+
+        async def flaky_set(simulation_id, row, decode):
+            if row.tender_id == "t1":
+                raise RuntimeError("boom")
+            return "raw"
+
+        client.set_production_plan_row = AsyncMock(side_effect=flaky_set)
+
+        with pytest.raises(SimulationError) as exc_info:
+            await ProductionScheduleSync(client, "sim-1").sync(make_schedule(5, 6, 7))
+
+        assert exc_info.value.details["failed"] == {"t1": "boom"}
+        assert exc_info.value.details["updated"] == ["t0", "t2"]
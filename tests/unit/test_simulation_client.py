@@ -23,6 +23,13 @@ from src.simulation_client.models import (
     ProductionScheduleResponse,
     ValidationResponse,
     MaterialTypesResponse,
+    AllMetricsResponse,
+    FactoryMetrics,
+    ProductionMetrics,
+    QualityMetrics,
+    EngineeringMetrics,
+    CommercialMetrics,
+    ProcurementMetrics,
 )
 from src.simulation_client.proto import simulator_pb2
 
@@ -373,6 +380,21 @@ class TestAsyncSimulationClient:
                 assert isinstance(result, ValidationResponse)
                 assert result.is_valid is True
 
+    @pytest.mark.asyncio
+    async def test_validate_configuration_local_errors(
+        self, client, mock_stub, mock_internal_methods
+    ):
+        """При ошибках локальной проверки сервер не вызывается."""
+        with patch.object(client, "stub", mock_stub, create=True):
+            result = await client.validate_configuration(
+                "test-sim-id", parameters=SimulationParameters()
+            )
+
+        mock_internal_methods["retry"].assert_not_called()
+        assert isinstance(result, ValidationResponse)
+        assert result.is_valid is False
+        assert result.errors
+
     @pytest.mark.asyncio
     async def test_get_material_types(self, client, mock_stub, mock_internal_methods):
         """Тест получения типов материалов."""
@@ -413,3 +435,29 @@ class TestAsyncSimulationClient:
 
                 # Проверяем, что _with_retry был вызван
                 mock_internal_methods["retry"].assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_simulation_results_by_steps(self, client):
+        """Тест получения результатов по шагам через get_all_metrics."""
+
+        async def fake_get_all_metrics(simulation_id, step):
+            return AllMetricsResponse(
+                factory=FactoryMetrics(profitability=step / 10),
+                production=ProductionMetrics(),
+                quality=QualityMetrics(),
+                engineering=EngineeringMetrics(),
+                commercial=CommercialMetrics(),
+                procurement=ProcurementMetrics(),
+            )
+
+        with patch.object(
+            client, "get_all_metrics", side_effect=fake_get_all_metrics
+        ) as mock_metrics:
+            results = await client.get_simulation_results_by_steps(
+                "test-sim-id", [1, 2, 3]
+            )
+
+        assert mock_metrics.call_count == 3
+        assert [r.step for r in results] == [1, 2, 3]
+        assert [r.profitability for r in results] == [0.1, 0.2, 0.3]
+        assert isinstance(results[0], SimulationResults)
@@ -0,0 +1,263 @@
+"""
+Unit tests for worker-to-workplace assignment.
+
+Проверяем:
+- Венгерский алгоритм против полного перебора (квадратные и прямоугольные)
+- Допустимость пар по специальности и квалификации
+- Выбор дешевых работников и места без подходящего работника
+- Снятие конфликтующих назначений до новых
+- staff_workplaces: вызовы без декодирования, порядок фаз
+"""
+
+import itertools
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.models import (
+    ProcessGraph,
+    SimulationParameters,
+    Worker,
+    Workplace,
+)
+from src.simulation_client.staffing import (
+    StaffingPlan,
+    assignment_costs,
+    linear_sum_assignment,
+    solve_staffing,
+    staffing_actions,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def worker(worker_id: str, specialty="welder", qualification=3, salary=100) -> Worker:
+    return Worker(
+        worker_id=worker_id,
+        name=worker_id,
+        qualification=qualification,
+        specialty=specialty,
+        salary=salary,
+    )
+
+
+def workplace(
+    workplace_id: str, speciality="welder", qualification=3, current=None
+) -> Workplace:
+    return Workplace(
+        workplace_id=workplace_id,
+        workplace_name=workplace_id,
+        required_speciality=speciality,
+        required_qualification=qualification,
+        worker=current,
+    )
+
+
+def brute_force(cost) -> float:
+    n, m = cost.shape
+    if n <= m:
+        return min(
+            cost[range(n), list(columns)].sum()
+            for columns in itertools.permutations(range(m), n)
+        )
+    return brute_force(cost.T)
+
+
+class TestLinearSumAssignment:
+    """Тесты венгерского алгоритма."""
+
+    @pytest.mark.parametrize("shape", [(1, 1), (4, 4), (3, 5), (5, 3), (6, 6)])
+    def test_matches_brute_force(self, shape):
+        """Стоимость совпадает с полным перебором."""
+        rng = np.random.default_rng(sum(shape))
+        for _ in range(5):
+            cost = rng.integers(0, 20, size=shape).astype(float)
+
+            rows, columns = linear_sum_assignment(cost)
+
+            assert len(rows) == min(shape)
+            assert len(set(columns.tolist())) == len(columns)
+            assert list(rows) == sorted(rows)
+            assert cost[rows, columns].sum() == pytest.approx(brute_force(cost))
+
+    def test_empty(self):
+        rows, columns = linear_sum_assignment(np.zeros((0, 3)))
+
+        assert rows.tolist() == [] and columns.tolist() == []
+
+
+class TestSolveStaffing:
+    """Тесты подбора."""
+
+    def test_feasibility(self):
+        """Специальность должна совпадать, квалификация - не ниже требуемой."""
+        workers = [
+            worker("w1"),
+            worker("w2", specialty="painter"),
+            worker("w3", qualification=2),
+        ]
+        workplaces = [
+            workplace("p1"),
+            workplace("p2", speciality="", qualification=1),
+        ]
+
+        _, feasible = assignment_costs(workers, workplaces)
+
+        assert feasible.tolist() == [[True, True], [False, True], [False, True]]
+
+    def test_cheapest_qualified_workers(self):
+        """Места заполняются максимально, среди вариантов - дешевле."""
+        workers = [
+            worker("expensive", salary=300),
+            worker("cheap", salary=100),
+            worker("painter", specialty="painter", salary=50),
+        ]
+        workplaces = [
+            workplace("weld"),
+            workplace("paint", speciality="painter"),
+            workplace("inspect", speciality="inspector"),
+        ]
+
+        plan = solve_staffing(workers, workplaces)
+
+        assert plan.assignments == {"weld": "cheap", "paint": "painter"}
+        assert plan.unassigned == ["inspect"]
+
+    @pytest.mark.parametrize("salary_weight", [1.0, 1e7])
+    def test_maximizes_staffed_workplaces(self, salary_weight):
+        """Дешевый работник не занимает место, куда подходит только он."""
+        workers = [
+            worker("senior", qualification=5, salary=100),
+            worker("junior", qualification=2, salary=200),
+        ]
+        workplaces = [
+            workplace("hard", qualification=5),
+            workplace("easy", qualification=2),
+        ]
+
+        plan = solve_staffing(workers, workplaces, salary_weight=salary_weight)
+
+        assert plan.assignments == {"hard": "senior", "easy": "junior"}
+
+    def test_infeasible_cost_scales_with_weights(self):
+        """Недопустимая пара дороже любого набора допустимых."""
+        workers = [worker(f"w{i}", salary=100 * (i + 1)) for i in range(4)]
+        workplaces = [workplace("p1"), workplace("p2", speciality="painter")]
+
+        cost, feasible = assignment_costs(workers, workplaces, salary_weight=1e9)
+
+        assert cost[~feasible].min() > len(workers) * cost[feasible].max()
+
+
+class TestStaffingActions:
+    """Тесты вызовов применения."""
+
+    def test_conflicts_unset_first(self):
+        """Конфликтующие назначения снимаются, совпадающие не трогаются."""
+        workplaces = [
+            workplace("p1", current=worker("w1")),
+            workplace("p2", current=worker("w2")),
+            workplace("p3", current=worker("w3")),
+            workplace("p4"),
+        ]
+        plan = StaffingPlan(assignments={"p1": "w1", "p2": "w4", "p4": "w3"})
+
+        result = staffing_actions(plan, workplaces)
+
+        assert [(action.method, action.target) for action in result.applied] == [
+            ("unset_worker_on_workplace", "w2"),
+            ("unset_worker_on_workplace", "w3"),
+            ("set_worker_on_workplace", "p2"),
+            ("set_worker_on_workplace", "p4"),
+        ]
+        assert result.applied[0].phase < result.applied[2].phase
+
+    def test_current_from_whole_graph(self):
+        """Работник снимается с места вне плана, если план ставит его в другое."""
+        graph = [
+            workplace("p1"),
+            workplace("other", current=worker("w1")),
+            workplace("kept", current=worker("w2")),
+        ]
+        plan = StaffingPlan(assignments={"p1": "w1"})
+
+        result = staffing_actions(plan, graph[:1], graph)
+
+        assert [(action.method, action.target) for action in result.applied] == [
+            ("unset_worker_on_workplace", "w1"),
+            ("set_worker_on_workplace", "p1"),
+        ]
+
+
+class TestStaffWorkplaces:
+    """Тесты AsyncSimulationClient.staff_workplaces."""
+
+    @pytest.mark.asyncio
+    async def test_applies_without_decoding(self):
+        """Вызовы идут с decode=False, декодируется только последний ответ."""
+        client = AsyncSimulationClient(enable_logging=False)
+        parameters = SimulationParameters(
+            processes=ProcessGraph(
+                process_graph_id="g",
+                workplaces=[
+                    workplace("p1", current=worker("w2")),
+                    workplace("p2", speciality="painter"),
+                ],
+            )
+        )
+        order = []
+
+        async def set_worker(simulation_id, **kwargs):
+            order.append(("set", kwargs))
+            return "raw"
+
+        async def unset_worker(simulation_id, **kwargs):
+            order.append(("unset", kwargs))
+            return "raw"
+
+        with patch.object(
+            client, "_get_current_parameters", AsyncMock(return_value=parameters)
+        ), patch.object(
+            client, "set_worker_on_workplace", AsyncMock(side_effect=set_worker)
+        ), patch.object(
+            client, "unset_worker_on_workplace", AsyncMock(side_effect=unset_worker)
+        ), patch.object(
+            client, "_decode_simulation_response", AsyncMock(return_value=None)
+        ) as decode:
+            result = await client.staff_workplaces(
+                "sim-1", [worker("w1", salary=50), worker("w2", salary=200)]
+            )
+
+        assert order == [
+            ("unset", {"worker_id": "w2", "decode": False}),
+            ("set", {"worker_id": "w1", "workplace_id": "p1", "decode": False}),
+        ]
+        decode.assert_awaited_once_with("raw")
+        assert result.skipped == ["workplace p2: no qualified worker"]
+
+    @pytest.mark.asyncio
+    async def test_subset_uses_graph_assignments(self):
+        """Для переданного подмножества мест назначения берутся из графа."""
+        client = AsyncSimulationClient(enable_logging=False)
+        parameters = SimulationParameters(
+            processes=ProcessGraph(
+                process_graph_id="g",
+                workplaces=[
+                    workplace("p1"),
+                    workplace("p2", current=worker("w1")),
+                ],
+            )
+        )
+
+        with patch.object(
+            client, "_get_current_parameters", AsyncMock(return_value=parameters)
+        ):
+            result = await client.staff_workplaces(
+                "sim-1", [worker("w1")], workplaces=[workplace("p1")], dry_run=True
+            )
+
+        assert [(action.method, action.target) for action in result.applied] == [
+            ("unset_worker_on_workplace", "w1"),
+            ("set_worker_on_workplace", "p1"),
+        ]
@@ -0,0 +1,116 @@
+"""
+Unit tests for the simulation state mirror.
+
+Проверяем:
+- Версионирование и свежесть записей
+- Запись состояния из ответов AsyncSimulationClient
+- Чтение текущего шага без повторного get_simulation
+- Сброс записи после изменяющих вызовов с decode=False
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.simulation_client import AsyncSimulationClient
+from src.simulation_client.models import Simulation
+from src.simulation_client.proto import simulator_pb2
+from src.simulation_client.state_mirror import SimulationStateMirror
+
+
+def make_simulation(step: int, simulation_id: str = "sim-1") -> Simulation:
+    return Simulation(capital=1000, step=step, simulation_id=simulation_id)
+
+
+class TestSimulationStateMirror:
+    """Тесты SimulationStateMirror."""
+
+    def test_older_version_is_ignored(self):
+        """Ответ со старой версией не откатывает состояние."""
+        mirror = SimulationStateMirror()
+
+        assert mirror.record(make_simulation(2), "2024-01-01T00:00:02")
+        assert not mirror.record(make_simulation(1), "2024-01-01T00:00:03")
+        assert not mirror.record(make_simulation(2), "2024-01-01T00:00:01")
+
+        assert mirror.get("sim-1").step == 2
+        assert mirror.version("sim-1") == (2, "2024-01-01T00:00:02")
+
+    def test_freshness(self):
+        """Устаревшая запись не возвращается."""
+        mirror = SimulationStateMirror(ttl=5.0)
+        mirror.record(make_simulation(1))
+
+        with patch("src.simulation_client.state_mirror.time.monotonic") as now:
+            now.return_value = 10**9
+            assert mirror.get("sim-1") is None
+            assert mirror.get("sim-1", max_age=float("inf")) is not None
+
+        assert mirror.stats["misses"] == 1
+
+    def test_lru_limit(self):
+        """Число записей ограничено."""
+        mirror = SimulationStateMirror(max_entries=2)
+        for simulation_id in ("a", "b", "c"):
+            mirror.record(make_simulation(1, simulation_id))
+
+        assert "a" not in mirror
+        assert len(mirror) == 2
+
+
+class TestClientStateMirror:
+    """Тесты зеркала в AsyncSimulationClient."""
+
+    @pytest.fixture
+    def client(self):
+        return AsyncSimulationClient(enable_logging=False)
+
+    @staticmethod
+    def proto_response(step: int):
+        return simulator_pb2.SimulationResponse(
+            simulations=simulator_pb2.Simulation(
+                simulation_id="sim-1",
+                capital=1000,
+                parameters=[simulator_pb2.SimulationParameters(step=step)],
+            ),
+            timestamp="2024-01-01T00:00:00",
+        )
+
+    @pytest.mark.asyncio
+    async def test_step_from_mirror(self, client):
+        """Шаг берется из последнего ответа без get_simulation."""
+        client._proto_to_simulation_response(self.proto_response(step=3))
+
+        with patch.object(client, "get_simulation", AsyncMock()) as mock_get:
+            assert await client._get_step_from_simulation("sim-1") == 3
+
+        mock_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fallback_to_server(self, client):
+        """Без свежего состояния выполняется get_simulation."""
+        response = client._proto_to_simulation_response(self.proto_response(step=4))
+        client.state_mirror.forget()
+
+        with patch.object(
+            client, "get_simulation", AsyncMock(return_value=response)
+        ) as mock_get:
+            assert await client.get_current_step("sim-1") == 4
+            assert await client.get_current_suppliers("sim-1") == []
+
+        mock_get.assert_awaited_once_with("sim-1")
+
+    @pytest.mark.asyncio
+    async def test_raw_setter_forgets_state(self, client):
+        """Сеттер с decode=False сбрасывает запись: следующее чтение идет на сервер."""
+        response = client._proto_to_simulation_response(self.proto_response(step=2))
+        client.stub = AsyncMock()
+
+        with patch.object(
+            client, "_with_retry", AsyncMock(return_value=self.proto_response(step=2))
+        ), patch.object(
+            client, "get_simulation", AsyncMock(return_value=response)
+        ) as mock_get:
+            await client.set_worker_on_workplace("sim-1", "w1", "p1", decode=False)
+            await client.get_current_simulation("sim-1")
+
+        mock_get.assert_awaited_once_with("sim-1")
@@ -0,0 +1,239 @@
+"""
+Unit tests for SupplierIndex.
+
+Проверяем:
+- Разбиение по материалам и Парето-фронты
+- Инкрементальные изменения: добавление, замена, удаление члена фронта
+- top-k по взвешенной оценке против полного перебора
+- Выбор основных и запасных поставщиков
+- Обновление индекса AsyncUnifiedClient при create/update/delete_supplier
+"""
+
+import random
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.simulation_client import AsyncUnifiedClient
+from src.simulation_client.exceptions import ValidationError
+from src.simulation_client.models import (
+    DeleteSupplierRequest,
+    SuccessResponse,
+    Supplier,
+)
+from src.simulation_client.supplier_index import (
+    SupplierIndex,
+    dominates,
+    pareto_front,
+)
+
+
+def supplier(
+    supplier_id: str,
+    material="steel",
+    cost=100,
+    reliability=0.9,
+    quality=0.9,
+    delivery=5,
+) -> Supplier:
+    return Supplier(
+        supplier_id=supplier_id,
+        name=supplier_id,
+        product_name=material,
+        material_type=material,
+        delivery_period=delivery,
+        special_delivery_period=1,
+        reliability=reliability,
+        product_quality=quality,
+        cost=cost,
+        special_delivery_cost=cost,
+    )
+
+
+def ids(suppliers):
+    return sorted(s.supplier_id for s in suppliers)
+
+
+def random_suppliers(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [
+        supplier(
+            f"s{i}",
+            material=rng.choice(["steel", "plastic"]),
+            cost=rng.randint(50, 150),
+            reliability=round(rng.uniform(0.5, 1.0), 2),
+            quality=round(rng.uniform(0.5, 1.0), 2),
+            delivery=rng.randint(1, 10),
+        )
+        for i in range(count)
+    ]
+
+
+class TestParetoFront:
+    """Тесты Парето-фронтов."""
+
+    def test_dominates(self):
+        cheap = supplier("a", cost=50)
+
+        assert dominates(cheap, supplier("b"))
+        assert not dominates(supplier("b"), cheap)
+        assert not dominates(cheap, cheap)
+
+    def test_front_per_material(self):
+        """Доминируемые поставщики не входят во фронт своего материала."""
+        index = SupplierIndex(
+            [
+                supplier("cheap", cost=50, reliability=0.7),
+                supplier("reliable", cost=120, reliability=0.99),
+                supplier("dominated", cost=130, reliability=0.6),
+                supplier("plastic", material="plastic", cost=500),
+            ]
+        )
+
+        assert index.materials() == ["plastic", "steel"]
+        assert ids(index.pareto_front("steel")) == ["cheap", "reliable"]
+        assert ids(index.pareto_front("plastic")) == ["plastic"]
+        assert index.pareto_front("glass") == []
+
+    def test_incremental_front_matches_rebuild(self):
+        """После изменений фронт совпадает с построенным заново."""
+        suppliers = random_suppliers(60)
+        index = SupplierIndex(suppliers)
+        rng = random.Random(2)
+        for victim in rng.sample(suppliers, 20):
+            index.remove(victim.supplier_id)
+        for changed in rng.sample([s for s in suppliers if s.supplier_id in index], 10):
+            index.add(changed.model_copy(update={"cost": 10, "material_type": "steel"}))
+
+        for material in index.materials():
+            assert ids(index.pareto_front(material)) == ids(
+                pareto_front(index.suppliers(material))
+            )
+
+    def test_remove_front_member_restores_dominated(self):
+        """Удаление члена фронта возвращает во фронт доминируемых им."""
+        index = SupplierIndex([supplier("best", cost=50), supplier("second")])
+
+        assert index.remove("best")
+        assert not index.remove("best")
+        assert ids(index.pareto_front("steel")) == ["second"]
+
+
+class TestTopK:
+    """Тесты запросов top-k."""
+
+    def test_matches_full_scan(self):
+        """Результат совпадает с сортировкой всех поставщиков материала."""
+        index = SupplierIndex(random_suppliers(80))
+        weights = {"cost": 2.0, "reliability": 1.0, "delivery_period": 0.5}
+
+        result = index.top_k("steel", k=5, weights=weights)
+
+        expected = sorted(
+            index.suppliers("steel"),
+            key=lambda s: index.score(s, weights),
+            reverse=True,
+        )[:5]
+        assert [s.supplier_id for s in result] == [s.supplier_id for s in expected]
+
+    def test_best_is_on_front(self):
+        """Лучший по положительным весам поставщик лежит на фронте."""
+        index = SupplierIndex(random_suppliers(80))
+
+        (best,) = index.top_k("plastic")
+
+        assert best.supplier_id in ids(index.pareto_front("plastic"))
+        assert index.top_k("plastic", pareto_only=True)[0] == best
+
+    def test_weights_and_exclude(self):
+        """Вес критерия определяет выбор; исключенные не выбираются."""
+        index = SupplierIndex(
+            [
+                supplier("cheap", cost=50, reliability=0.7),
+                supplier("reliable", cost=120, reliability=0.99),
+            ]
+        )
+
+        assert index.top_k("steel", weights={"cost": 1})[0].supplier_id == "cheap"
+        assert (
+            index.top_k("steel", weights={"reliability": 1})[0].supplier_id
+            == "reliable"
+        )
+        assert ids(index.top_k("steel", k=5, exclude=["cheap"])) == ["reliable"]
+
+    def test_invalid_weights(self):
+        index = SupplierIndex([supplier("a")])
+
+        with pytest.raises(ValidationError):
+            index.top_k("steel", weights={"speed": 1})
+        with pytest.raises(ValidationError):
+            index.top_k("steel", weights={"cost": -1})
+
+    def test_select(self):
+        """Основной и запасные по материалам; материалы без поставщиков."""
+        index = SupplierIndex(
+            [
+                supplier("s1", cost=50),
+                supplier("s2", cost=60),
+                supplier("s3", cost=70),
+                supplier("p1", material="plastic"),
+            ]
+        )
+
+        selection = index.select(["steel", "plastic", "glass"], backups=1)
+
+        assert selection.config() == {
+            "supplier_ids": ["s1", "p1"],
+            "backup_supplier_ids": ["s2"],
+        }
+        assert selection.missing == ["glass"]
+
+
+class TestUnifiedClientSupplierIndex:
+    """Индекс в AsyncUnifiedClient."""
+
+    @pytest.mark.asyncio
+    async def test_index_follows_catalog_changes(self):
+        """create/update/delete_supplier обновляют построенный индекс."""
+        client = AsyncUnifiedClient(enable_logging=False)
+        db = client.db_client
+
+        with patch.object(
+            client, "get_all_suppliers_simple", AsyncMock(return_value=[supplier("s1")])
+        ), patch.object(
+            db, "create_supplier", AsyncMock(return_value=supplier("s2", cost=10))
+        ), patch.object(
+            db,
+            "update_supplier",
+            AsyncMock(return_value=supplier("s1", material="plastic")),
+        ), patch.object(
+            db,
+            "delete_supplier",
+            AsyncMock(
+                return_value=SuccessResponse(success=True, message="", timestamp="")
+            ),
+        ):
+            index = await client.supplier_index()
+            await client.create_supplier(None)
+            await client.update_supplier(None)
+            await client.delete_supplier(
+                DeleteSupplierRequest(simulation_id="", supplier_id="s2")
+            )
+
+            assert await client.supplier_index() is index
+
+        assert "s2" not in index
+        assert index.get("s1").material_type == "plastic"
+        assert index.materials() == ["plastic"]
+
+    @pytest.mark.asyncio
+    async def test_add_selected_suppliers(self):
+        """Выбор добавляется через add_supplier с is_backup."""
+        client = AsyncUnifiedClient(enable_logging=False)
+        index = SupplierIndex([supplier("s1", cost=50), supplier("s2")])
+
+        with patch.object(client, "add_supplier", AsyncMock(return_value="ok")) as add:
+            await client.add_selected_suppliers("sim-1", index.select(["steel"]))
+
+        add.assert_any_await("sim-1", "s1", False)
+        add.assert_any_await("sim-1", "s2", True)
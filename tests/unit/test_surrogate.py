@@ -0,0 +1,286 @@
+"""
+Unit tests for the surrogate pre-screen.
+
+Проверяем:
+- Кодирование конфигураций в признаки
+- Предсказания гребневой регрессии и k ближайших соседей
+- Отсев по верхней границе предсказания и аудит
+- Загрузку известных пар из checkpoint оптимизатора
+- Отсев в SuccessiveHalvingOptimizer: сэкономленные прогоны и ошибка аудита
+"""
+
+import itertools
+import json
+import math
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.simulation_client.exceptions import ValidationError
+from src.simulation_client.models import (
+    Simulation,
+    SimulationResponse,
+    SimulationResults,
+)
+from src.simulation_client.optimizer import SuccessiveHalvingOptimizer
+from src.simulation_client.surrogate import (
+    ConfigEncoder,
+    SurrogateModel,
+    SurrogateScreen,
+)
+
+np = pytest.importorskip("numpy")
+
+# Вклад поставщиков и стратегии продаж в рентабельность
+SUPPLIER_EFFECT = {"s1": 0.3, "s2": 0.1, "s3": -0.2, "s4": 0.0}
+STRATEGY_EFFECT = {"a": 0.0, "b": 0.1}
+
+
+def profitability(config) -> float:
+    return sum(SUPPLIER_EFFECT[s] for s in config["supplier_ids"]) + (
+        STRATEGY_EFFECT[config["sales_strategy"]]
+    )
+
+
+def all_configs():
+    return [
+        {"supplier_ids": list(suppliers), "sales_strategy": strategy}
+        for suppliers in itertools.combinations(SUPPLIER_EFFECT, 2)
+        for strategy in STRATEGY_EFFECT
+    ]
+
+
+def make_client():
+    """Мок клиента с детерминированной рентабельностью."""
+
+    async def run(config):
+        return SimulationResponse(
+            simulations=Simulation(
+                capital=0,
+                step=1,
+                simulation_id="sim",
+                results=[
+                    SimulationResults(
+                        step=1, profit=0, cost=0, profitability=profitability(config)
+                    )
+                ],
+            ),
+            timestamp="2024-01-01T00:00:00",
+        )
+
+    client = MagicMock()
+    client.run_complete_scenario = AsyncMock(side_effect=run)
+    return client
+
+
+class TestConfigEncoder:
+    """Тесты кодирования конфигураций."""
+
+    def test_transform(self):
+        """Списки и строки - индикаторы, числа - как есть, новые значения - нет."""
+        encoder = ConfigEncoder().fit(
+            [{"supplier_ids": ["s1", "s2"], "sales_strategy": "a", "quantity": 3}]
+        )
+
+        matrix = encoder.transform(
+            [{"supplier_ids": ["s2", "s9"], "sales_strategy": "b", "quantity": 5}]
+        )
+
+        assert encoder.features == [
+            ("supplier_ids", "s1"),
+            ("supplier_ids", "s2"),
+            ("sales_strategy", "a"),
+            ("quantity", None),
+        ]
+        assert matrix.tolist() == [[0.0, 1.0, 0.0, 5.0]]
+
+
+class TestSurrogateModel:
+    """Тесты предсказаний."""
+
+    def test_unknown_method(self):
+        with pytest.raises(ValidationError):
+            SurrogateModel("forest")
+
+    def test_ridge_fits_additive_effects(self):
+        """Гребневая регрессия восстанавливает аддитивные эффекты."""
+        configs = all_configs()
+        model = SurrogateModel("ridge", alpha=1e-6).fit(
+            configs, [profitability(config) for config in configs]
+        )
+
+        predicted, std = model.predict(
+            [{"supplier_ids": ["s1", "s2"], "sales_strategy": "b"}]
+        )
+
+        assert predicted[0] == pytest.approx(0.5, abs=1e-4)
+        assert std[0] == pytest.approx(0.0, abs=1e-4)
+
+    def test_knn_nearest_neighbour(self):
+        """При k=1 известная конфигурация предсказывается своим значением."""
+        configs = all_configs()
+        values = [profitability(config) for config in configs]
+        model = SurrogateModel("knn", k=1).fit(configs, values)
+
+        predicted, std = model.predict(configs[:3])
+
+        assert predicted.tolist() == pytest.approx(values[:3])
+        # Разброс одного соседа нулевой, но не ниже leave-one-out ошибки
+        assert std.min() > 0
+        assert std.tolist() == pytest.approx([std[0]] * 3)
+
+    def test_single_sample_unbounded(self):
+        """По одной паре разброс не оценить."""
+        model = SurrogateModel("ridge").fit([{"supplier_ids": ["s1"]}], [0.1])
+
+        _, std = model.predict([{"supplier_ids": ["s2"]}])
+
+        assert std.tolist() == [math.inf]
+
+
+class TestSurrogateScreen:
+    """Тесты отсева."""
+
+    def fitted_screen(self, **kwargs) -> SurrogateScreen:
+        screen = SurrogateScreen(alpha=1e-6, min_samples=4, **kwargs)
+        for config in all_configs():
+            screen.observe(config, profitability(config))
+        return screen
+
+    def test_no_screening_before_min_samples(self):
+        """Пока пар мало, решений нет."""
+        screen = SurrogateScreen(min_samples=4)
+        screen.observe(all_configs()[0], 0.1)
+
+        assert screen.screen(all_configs()[:2]) == [None, None]
+
+    def test_skip_below_best(self):
+        """Кандидаты с верхней границей ниже лучшего пропускаются."""
+        screen = self.fitted_screen(audit_rate=0.0)
+        weak = {"supplier_ids": ["s3", "s4"], "sales_strategy": "a"}
+        strong = {"supplier_ids": ["s1", "s2"], "sales_strategy": "b"}
+
+        decisions = screen.screen([weak, strong])
+
+        assert [decision.skip for decision in decisions] == [True, False]
+        assert screen.best == pytest.approx(0.5)
+        assert screen.stats["skipped"] == 1
+
+    @pytest.mark.parametrize(
+        "method, observed, candidate",
+        [
+            # Признаков больше, чем пар: остатки на выборке почти нулевые
+            (
+                "ridge",
+                (1, 2, 5, 10),
+                {"supplier_ids": ["s1", "s2"], "sales_strategy": "a"},
+            ),
+            # Один сосед: его разброс нулевой
+            (
+                "knn",
+                (0, 3, 6, 9),
+                {"supplier_ids": ["s1", "s4"], "sales_strategy": "b"},
+            ),
+        ],
+    )
+    def test_near_best_not_skipped(self, method, observed, candidate):
+        """При малой выборке кандидат рядом с лучшим не пропускается."""
+        screen = SurrogateScreen(method=method, k=1, min_samples=4, audit_rate=0.0)
+        for index in observed:
+            config = all_configs()[index]
+            screen.observe(config, profitability(config))
+
+        (decision,) = screen.screen([candidate])
+
+        assert profitability(candidate) >= screen.best - 0.1
+        assert not decision.skip
+        assert decision.upper_bound >= profitability(candidate)
+
+    def test_audit_runs_skipped_candidates(self):
+        """При audit_rate=1 пропускаемые кандидаты прогоняются для аудита."""
+        screen = self.fitted_screen(audit_rate=1.0)
+        weak = {"supplier_ids": ["s3", "s4"], "sales_strategy": "a"}
+
+        (decision,) = screen.screen([weak])
+        screen.record_audit(decision.predicted, -0.1)
+
+        assert decision.audit and not decision.skip
+        assert screen.stats["audited"] == 1
+        assert screen.stats["audit_mae"] == pytest.approx(
+            abs(-0.1 - decision.predicted)
+        )
+
+    def test_observe_replaces_same_config(self):
+        """Повторное наблюдение конфигурации заменяет значение."""
+        screen = SurrogateScreen()
+        screen.observe({"supplier_ids": ["s1", "s2"]}, 0.1)
+        screen.observe({"supplier_ids": ["s2", "s1"]}, 0.2)
+        screen.observe({"supplier_ids": ["s3"]}, math.nan)
+
+        assert screen.samples == 1
+        assert screen.best == 0.2
+
+    def test_load_checkpoint(self, tmp_path):
+        """Пары загружаются из checkpoint со средним прогонов."""
+        path = tmp_path / "search.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "metric": "profitability",
+                    "evaluations": {
+                        "h1": {"config": {"a": 1}, "values": [0.1, 0.3], "failures": 0},
+                        "h2": {"config": {"a": 2}, "values": [], "failures": 1},
+                    },
+                }
+            )
+        )
+        screen = SurrogateScreen()
+
+        assert screen.load_checkpoint(path) == 1
+        assert screen.best == pytest.approx(0.2)
+        with pytest.raises(ValidationError):
+            screen.load_checkpoint(path, metric="profit")
+
+
+class TestOptimizerScreening:
+    """Отсев в SuccessiveHalvingOptimizer."""
+
+    @pytest.mark.asyncio
+    async def test_weak_candidates_not_simulated(self):
+        """Отсеянные кандидаты не прогоняются и попадают в конец таблицы."""
+        screen = SurrogateScreen(alpha=1e-6, min_samples=4, audit_rate=0.0)
+        for config in all_configs():
+            screen.observe(config, profitability(config))
+        client = make_client()
+        weak = {"supplier_ids": ["s3", "s4"], "sales_strategy": "a"}
+        strong = {"supplier_ids": ["s1", "s2"], "sales_strategy": "b"}
+
+        optimizer = SuccessiveHalvingOptimizer(
+            client, [weak, strong], max_replications=2, eta=2, surrogate=screen
+        )
+        best = await optimizer.run()
+
+        assert best.config == strong
+        assert client.run_complete_scenario.await_count == 1
+        assert optimizer.leaderboard()[-1].screened
+        assert screen.stats["saved_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_audit_error_reported(self):
+        """Аудируемые кандидаты прогоняются, ошибка предсказания учитывается."""
+        screen = SurrogateScreen(alpha=1e-6, min_samples=4, audit_rate=1.0)
+        for config in all_configs():
+            screen.observe(config, profitability(config))
+        client = make_client()
+        weak = {"supplier_ids": ["s3", "s4"], "sales_strategy": "a"}
+
+        optimizer = SuccessiveHalvingOptimizer(
+            client, [weak], max_replications=1, surrogate=screen
+        )
+        await optimizer.run()
+
+        assert client.run_complete_scenario.await_count == 1
+        assert screen.stats["audited"] == 1
+        assert screen.stats["audit_mae"] < 1e-3
+        assert screen.stats["saved_calls"] == 0
@@ -22,6 +22,43 @@ from src.simulation_client.models import (
 )
 
 
+class TestSharedChannel:
+    """Тесты общего канала для двух сервисов."""
+
+    def test_share_channel_defaults(self):
+        """Канал общий только при совпадающих адресах."""
+        assert not AsyncUnifiedClient().share_channel
+        assert AsyncUnifiedClient(
+            sim_host="unix:/run/simulator.sock", db_host="unix:/run/simulator.sock"
+        ).share_channel
+
+        with pytest.raises(ValueError):
+            AsyncUnifiedClient(share_channel=True)
+
+    @pytest.mark.asyncio
+    async def test_connect_with_shared_channel(self):
+        """Оба клиента подключаются через один канал, закрываемый один раз."""
+        client = AsyncUnifiedClient(
+            sim_host="unix:/run/simulator.sock",
+            db_host="unix:/run/simulator.sock",
+            enable_logging=False,
+        )
+        channel = MagicMock()
+        channel.close = AsyncMock()
+
+        with patch("grpc.aio.insecure_channel", return_value=channel) as mock_create, \
+                patch.object(client.sim_client, "ping", AsyncMock(return_value=True)), \
+                patch.object(client.db_client, "ping", AsyncMock(return_value=True)):
+            await client.connect()
+            assert client.sim_client.channel is channel
+            assert client.db_client.channel is channel
+            await client.close()
+
+        mock_create.assert_called_once()
+        channel.close.assert_awaited_once()
+        assert client.sim_client.owns_channel and client.db_client.owns_channel
+
+
 class TestAsyncUnifiedClient:
     """Тесты для AsyncUnifiedClient."""
 
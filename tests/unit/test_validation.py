@@ -0,0 +1,161 @@
+"""
+Unit tests for local configuration validation.
+
+Проверяем, что локальная проверка находит типичные ошибки конфигурации
+и возвращает результат в формате ValidationResponse.
+"""
+
+import pytest
+
+from src.simulation_client.models import (
+    ProcessGraph,
+    RequiredMaterial,
+    Route,
+    SimulationParameters,
+    Supplier,
+    ValidationResponse,
+    Warehouse,
+    Worker,
+    Workplace,
+)
+from src.simulation_client.validation import (
+    validate_materials,
+    validate_parameters,
+    validate_process_graph,
+)
+
+
+def make_worker(qualification: int = 5, specialty: str = "welder") -> Worker:
+    return Worker(
+        worker_id=f"worker-{specialty}-{qualification}",
+        name="Иван",
+        qualification=qualification,
+        specialty=specialty,
+        salary=50000,
+    )
+
+
+def make_workplace(workplace_id: str, **fields) -> Workplace:
+    fields.setdefault("worker", make_worker())
+    return Workplace(
+        workplace_id=workplace_id,
+        workplace_name=workplace_id,
+        required_speciality="welder",
+        required_qualification=3,
+        **fields,
+    )
+
+
+def make_supplier(material_type: str) -> Supplier:
+    return Supplier(
+        supplier_id=f"supplier-{material_type}",
+        name="ООО Поставщик",
+        product_name=material_type,
+        material_type=material_type,
+        delivery_period=5,
+        special_delivery_period=2,
+        reliability=0.9,
+        product_quality=0.9,
+        cost=100,
+        special_delivery_cost=200,
+    )
+
+
+@pytest.fixture
+def graph():
+    """Корректный граф: wp_1 -> wp_2 -> wp_3."""
+    return ProcessGraph(
+        process_graph_id="graph-1",
+        workplaces=[
+            make_workplace("wp_1", is_start_node=True),
+            make_workplace("wp_2"),
+            make_workplace("wp_3", is_end_node=True),
+        ],
+        routes=[
+            Route(length=1, from_workplace="wp_1", to_workplace="wp_2"),
+            Route(length=1, from_workplace="wp_2", to_workplace="wp_3"),
+        ],
+    )
+
+
+class TestValidateProcessGraph:
+    """Тесты проверки графа процесса."""
+
+    def test_valid_graph(self, graph):
+        """Корректный граф проходит проверку."""
+        assert validate_process_graph(graph) == ([], [])
+
+    def test_missing_start_and_end(self, graph):
+        """Отсутствие начального и конечного узлов - ошибка."""
+        graph.workplaces[0].is_start_node = False
+        graph.workplaces[2].is_end_node = False
+
+        errors, _ = validate_process_graph(graph)
+
+        assert "Process graph has no start node" in errors
+        assert "Process graph has no end node" in errors
+
+    def test_unknown_and_unreachable_workplaces(self, graph):
+        """Маршрут к неизвестному месту и недостижимое место - ошибки."""
+        graph.routes.append(
+            Route(length=1, from_workplace="wp_3", to_workplace="wp_9")
+        )
+        graph.workplaces.append(make_workplace("wp_4"))
+
+        errors, _ = validate_process_graph(graph)
+
+        assert any("unknown workplace wp_9" in e for e in errors)
+        assert "Workplace wp_4 is unreachable from start nodes" in errors
+
+    def test_worker_requirements(self, graph):
+        """Квалификация и специальность работника проверяются."""
+        graph.workplaces[1].worker = make_worker(qualification=1, specialty="painter")
+        graph.workplaces[2].worker = None
+
+        errors, warnings = validate_process_graph(graph)
+
+        assert len(errors) == 2
+        assert "qualification 1" in errors[0]
+        assert "speciality 'painter'" in errors[1]
+        assert warnings == ["Workplace wp_3 has no worker"]
+
+
+class TestValidateParameters:
+    """Тесты проверки параметров симуляции."""
+
+    def test_materials_without_supplier(self):
+        """Материал без поставщика - ошибка."""
+        materials = [
+            RequiredMaterial(material_id="steel", name="steel"),
+            RequiredMaterial(material_id="paint", name="paint"),
+            RequiredMaterial(
+                material_id="glue", name="glue", has_contracted_supplier=True
+            ),
+        ]
+
+        errors = validate_materials(materials, [make_supplier("steel")])
+
+        assert errors == ["No supplier for required material paint"]
+
+    def test_parameters(self, graph):
+        """Перегруженный склад делает конфигурацию невалидной."""
+        parameters = SimulationParameters(
+            processes=graph,
+            suppliers=[make_supplier("steel")],
+            materials_warehouse=Warehouse(
+                warehouse_id="wh-1", size=100, loading=10, materials={"steel": 150}
+            ),
+        )
+
+        result = validate_parameters(
+            parameters, [RequiredMaterial(material_id="steel", name="steel")]
+        )
+
+        assert isinstance(result, ValidationResponse)
+        assert result.is_valid is False
+        assert result.errors == [
+            "Materials warehouse wh-1 is over capacity: 150 > 100"
+        ]
+
+        parameters.materials_warehouse.materials = {"steel": 50}
+        assert validate_parameters(parameters).is_valid is True